@@ -1,23 +1,29 @@
 from django.contrib import admin
 from blog import models
+from blog import search
+from utils.changelist import CachedRelatedFieldListFilter, EstimatedCountPaginator
+from utils.uploads import DirectUploadAdminMixin
 
 
 @admin.register(models.Group)
-class GroupAdmin(admin.ModelAdmin):
+class GroupAdmin(DirectUploadAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'icon')
     search_fields = ('name',)
+    direct_upload_fields = ('icon',)
     
 
 @admin.register(models.Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(DirectUploadAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'icon')
     search_fields = ('name',)
+    direct_upload_fields = ('icon',)
     
 
 @admin.register(models.Link)
-class LinkAdmin(admin.ModelAdmin):
+class LinkAdmin(DirectUploadAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'icon', 'url')
     search_fields = ('name', 'url')
+    direct_upload_fields = ('icon',)
 
 
 @admin.register(models.Duration)
@@ -27,12 +33,24 @@ class DurationAdmin(admin.ModelAdmin):
 
 
 @admin.register(models.Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(DirectUploadAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'group', 'category', 'created_at', 'image')
     search_fields = ('title', 'text')
     search_help_text = 'Buscar por título o texto'
-    list_filter = ('group', 'category', 'duration', 'created_at', 'updated_at')
+    list_filter = (
+        ('group', CachedRelatedFieldListFilter),
+        ('category', CachedRelatedFieldListFilter),
+        ('duration', CachedRelatedFieldListFilter),
+        'created_at',
+        'updated_at',
+    )
+    list_select_related = ('group', 'category')
+    
+    # Skip the count of all the posts (large tables)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     readonly_fields = ('created_at', 'updated_at')
+    direct_upload_fields = ('image',)
     fieldsets = (
         (
             "General", {
@@ -55,4 +73,13 @@ class PostAdmin(admin.ModelAdmin):
                 )
             }
         ),
-    )
\ No newline at end of file
+    )
+    
+    def get_search_results(self, request, queryset, search_term):
+        """ Search in the posts search index (all the results, sorted by
+        the changelist ordering)
+        """
+        
+        if not search_term:
+            return queryset, False
+        return search.filter_posts(queryset, search_term), False
\ No newline at end of file
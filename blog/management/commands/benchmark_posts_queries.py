@@ -0,0 +1,77 @@
+from statistics import median
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from blog import models
+
+
+class Command(BaseCommand):
+    help = 'Show the query plan and time of the posts feed queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Posts to create before the benchmark (generate_posts)',
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=20,
+            help='Times to run each query',
+        )
+
+    def handle(self, *args, **kwargs):
+
+        if kwargs['seed']:
+            call_command(
+                'generate_posts',
+                posts=kwargs['seed'],
+                skip_search_index=True,
+                stdout=self.stdout,
+            )
+
+        # Filters of the posts feed (PostViewSet)
+        post = models.Post.objects.order_by('-id').first()
+        if not post:
+            self.stderr.write('There are no posts, use --seed to create them')
+            return
+
+        access_patterns = {
+            'feed': {},
+            'group': {'group_id': post.group_id},
+            'category': {'category_id': post.category_id},
+            'duration': {'duration_id__in': [post.duration_id]},
+            'post_type': {'post_type': post.post_type},
+            'group and category': {
+                'group_id': post.group_id,
+                'category_id': post.category_id,
+            },
+        }
+
+        indexes = [index.name for index in models.Post._meta.indexes]
+        self.stdout.write(f"Posts: {models.Post.objects.count()}")
+        for name, filters in access_patterns.items():
+            queryset = models.Post.objects.filter(**filters)
+            queryset = queryset.order_by('-created_at', '-id')[:settings.PAGE_SIZE]
+
+            # Get query plan and used indexes
+            plan = queryset.explain()
+            used_indexes = [index for index in indexes if index in plan] or ['-']
+
+            # Measure query time
+            times = []
+            for _ in range(kwargs['runs']):
+                start = perf_counter()
+                list(queryset.all())
+                times.append((perf_counter() - start) * 1000)
+
+            self.stdout.write(
+                f"\n{name}: {median(times):.2f} ms (median), "
+                f"indexes: {', '.join(used_indexes)}"
+            )
+            self.stdout.write(plan)
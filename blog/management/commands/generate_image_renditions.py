@@ -0,0 +1,31 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from blog import models
+
+
+class Command(BaseCommand):
+    help = 'Queue the creation of the missing renditions of the images and ' \
+        'icons (for example, of the fixtures or the images uploaded before)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Create the renditions again, even if they exist',
+        )
+
+    def handle(self, *args, **kwargs):
+        start = perf_counter()
+
+        for model in [models.Group, models.Category, models.Link, models.Post]:
+            queued = 0
+            for instance in model.objects.iterator():
+                queued += instance.queue_renditions(force=kwargs['force'])
+            self.stdout.write(f"{model._meta.label}: {queued} queued")
+
+        self.stdout.write(
+            f"Renditions queued in {perf_counter() - start:.2f} seconds, "
+            "run the jobs with 'run_jobs'"
+        )
@@ -0,0 +1,205 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from blog import models
+from blog import random_posts
+from blog import search
+from utils.cache import clear_api_namespaces
+from utils.changelist import clear_filter_choices
+
+
+@contextmanager
+def manual_dates(model):
+    """ Allow to set the auto dates of the model (auto_now and auto_now_add) """
+
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    auto_dates = {field: (field.auto_now, field.auto_now_add) for field in fields}
+    try:
+        for field in fields:
+            field.auto_now = False
+            field.auto_now_add = False
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in auto_dates.items():
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Create synthetic groups, categories, links, durations and posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--groups', type=int, default=20)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--links', type=int, default=50)
+        parser.add_argument('--durations', type=int, default=10)
+        parser.add_argument(
+            '--max-links',
+            type=int,
+            default=5,
+            help='Max links of each post',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365 * 3,
+            help='Days to distribute the posts creation dates',
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--skip-search-index',
+            action='store_true',
+            help='Don\'t rebuild the search index after creating the posts',
+        )
+
+    def handle(self, *args, **kwargs):
+        start = perf_counter()
+        batch_size = kwargs['batch_size']
+        icon = 'icons/icon-a.png'
+
+        groups = self.bulk_create(models.Group, [
+            models.Group(name=f'Grupo {index}', icon=icon)
+            for index in range(kwargs['groups'])
+        ], batch_size)
+        categories = self.bulk_create(models.Category, [
+            models.Category(name=f'Categoría {index}', icon=icon)
+            for index in range(kwargs['categories'])
+        ], batch_size)
+        links = self.bulk_create(models.Link, [
+            models.Link(
+                name=f'Link {index}',
+                icon=icon,
+                url=f'https://www.example.com/{index}',
+            )
+            for index in range(kwargs['links'])
+        ], batch_size)
+        durations = self.bulk_create(models.Duration, [
+            models.Duration(value=(index + 1) * 5)
+            for index in range(kwargs['durations'])
+        ], batch_size)
+
+        groups_ids = [group.id for group in groups]
+        categories_ids = [category.id for category in categories]
+        links_ids = [link.id for link in links]
+        durations_ids = [duration.id for duration in durations]
+
+        created = 0
+        total = kwargs['posts']
+        while created < total:
+            amount = min(batch_size, total - created)
+            with transaction.atomic():
+                posts = self.create_posts(
+                    created, amount, kwargs['days'],
+                    groups_ids, categories_ids, durations_ids
+                )
+                self.create_posts_links(posts, links_ids, kwargs['max_links'])
+            created += amount
+            self.stdout.write(f"Posts created: {created}/{total}")
+
+        # Bulk create doesn't send signals
+        if not kwargs['skip_search_index']:
+            search.rebuild_index(batch_size)
+        random_posts.clear_posts_ids()
+        clear_api_namespaces()
+        clear_filter_choices()
+
+        self.stdout.write(
+            f"Data created in {perf_counter() - start:.2f} seconds"
+        )
+
+    def bulk_create(self, model, objects: list, batch_size: int) -> list:
+        """ Create the objects and return them with their ids
+
+        Args:
+            model (Model): model class
+            objects (list): objects to create
+            batch_size (int): objects created in each query
+
+        Returns:
+            list: created objects
+        """
+
+        created = model.objects.bulk_create(objects, batch_size=batch_size)
+        if created and created[0].id is None:
+            # Databases that don't return the ids (mysql): get the last rows
+            created = list(model.objects.order_by('-id')[:len(created)])[::-1]
+        return created
+
+    def create_posts(
+        self,
+        start: int,
+        amount: int,
+        days: int,
+        groups_ids: list[int],
+        categories_ids: list[int],
+        durations_ids: list[int],
+    ) -> list[models.Post]:
+        """ Create posts with random relations, media and dates
+
+        Args:
+            start (int): number of the first post (used in the title)
+            amount (int): posts to create
+            days (int): days to distribute the creation dates
+            groups_ids (list[int]): ids to choose the posts groups
+            categories_ids (list[int]): ids to choose the posts categories
+            durations_ids (list[int]): ids to choose the posts durations
+
+        Returns:
+            list[models.Post]: created posts
+        """
+
+        now = timezone.now()
+        posts = []
+        for index in range(start, start + amount):
+            created_at = now - timedelta(seconds=random.randint(0, days * 86400))
+            media = random.random()
+            posts.append(models.Post(
+                title=f'Post {index}',
+                text=f'Texto del post {index}. ' * random.randint(1, 20),
+                group_id=random.choice(groups_ids),
+                category_id=random.choice(categories_ids),
+                duration_id=random.choice(durations_ids),
+                video_link=f'https://www.example.com/{index}.mp4' if media < 0.3 else None,
+                audio_link=f'https://www.example.com/{index}.mp3' if media < 0.6 else None,
+                created_at=created_at,
+                updated_at=created_at,
+            ))
+
+        with manual_dates(models.Post):
+            return self.bulk_create(models.Post, posts, len(posts))
+
+    def create_posts_links(
+        self,
+        posts: list[models.Post],
+        links_ids: list[int],
+        max_links: int
+    ):
+        """ Add random links to the posts and update their types
+
+        Args:
+            posts (list[models.Post]): posts to add links
+            links_ids (list[int]): ids to choose the posts links
+            max_links (int): max links of each post
+        """
+
+        PostLink = models.Post.links.through
+        posts_links = []
+        for post in posts:
+            amount = random.randint(0, min(max_links, len(links_ids)))
+            for link_id in random.sample(links_ids, amount):
+                posts_links.append(PostLink(post_id=post.id, link_id=link_id))
+        PostLink.objects.bulk_create(posts_links)
+
+        models.Post.objects.filter(id__in=[post.id for post in posts]).update(
+            post_type=models.Post.get_post_type_expression()
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = 'Index all the posts again in the search index'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Posts indexed in each query',
+        )
+    
+    def handle(self, *args, **kwargs):
+        total = search.rebuild_index(kwargs['batch_size'])
+        self.stdout.write(f"Posts indexed: {total}")
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_remove_post_audio_post_audio_link'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-created_at', '-id'], name='post_created_at_id_idx'),
+        ),
+    ]
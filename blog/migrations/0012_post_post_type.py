@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:15
+
+from django.db import migrations, models
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
+
+
+def backfill_post_type(apps, schema_editor):
+    """ Calculate the type of the existing posts """
+    
+    Post = apps.get_model('blog', 'Post')
+    has_links = Exists(
+        Post.links.through.objects.filter(post_id=OuterRef('id'))
+    )
+    Post.objects.update(post_type=Case(
+        When(~Q(video_link=None) & ~Q(video_link=''), then=Value('video')),
+        When(~Q(audio_link=None) & ~Q(audio_link=''), then=Value('audio')),
+        When(has_links, then=Value('social')),
+        default=Value(''),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='post_type',
+            field=models.CharField(blank=True, choices=[('video', 'Video'), ('audio', 'Audio'), ('social', 'Redes sociales'), ('', 'Texto')], default='', editable=False, max_length=10, verbose_name='Tipo de post'),
+        ),
+        migrations.RunPython(backfill_post_type, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['post_type', '-created_at', '-id'], name='post_type_created_at_idx'),
+        ),
+    ]
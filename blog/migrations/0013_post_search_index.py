@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    """ Create and fill the search index of the posts
+    (sqlite: fts5 virtual table, postgresql: tsvector with gin index)
+    """
+    
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE blog_post_search USING fts5("
+            "title, text, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            "INSERT INTO blog_post_search (rowid, title, text) "
+            "SELECT id, title, COALESCE(text, '') FROM blog_post"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE TABLE blog_post_search ("
+            "post_id integer PRIMARY KEY "
+            "REFERENCES blog_post (id) ON DELETE CASCADE, "
+            "document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX blog_post_search_document_idx "
+            "ON blog_post_search USING GIN (document)"
+        )
+        schema_editor.execute(
+            "INSERT INTO blog_post_search (post_id, document) "
+            "SELECT id, "
+            "setweight(to_tsvector(%s::regconfig, title), 'A') || "
+            "setweight(to_tsvector(%s::regconfig, COALESCE(text, '')), 'B') "
+            "FROM blog_post",
+            [settings.SEARCH_CONFIG, settings.SEARCH_CONFIG]
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    """ Drop the search index of the posts """
+    
+    if schema_editor.connection.vendor in ['sqlite', 'postgresql']:
+        schema_editor.execute("DROP TABLE IF EXISTS blog_post_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_post_type'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['group', '-created_at', '-id'], name='post_group_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['category', '-created_at', '-id'], name='post_category_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['duration', '-created_at', '-id'], name='post_duration_created_at_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_post_filters_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='icon_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Versiones del ícono'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='icon_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Versiones del ícono'),
+        ),
+        migrations.AddField(
+            model_name='link',
+            name='icon_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Versiones del ícono'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Versiones de la imagen'),
+        ),
+    ]
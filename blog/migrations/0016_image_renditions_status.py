@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_image_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='icon_renditions_status',
+            field=models.CharField(blank=True, choices=[('', 'Sin imagen'), ('pending', 'Pendiente'), ('done', 'Listo'), ('failed', 'Fallido')], default='', editable=False, max_length=10, verbose_name='Estado de las versiones del ícono'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='icon_renditions_status',
+            field=models.CharField(blank=True, choices=[('', 'Sin imagen'), ('pending', 'Pendiente'), ('done', 'Listo'), ('failed', 'Fallido')], default='', editable=False, max_length=10, verbose_name='Estado de las versiones del ícono'),
+        ),
+        migrations.AddField(
+            model_name='link',
+            name='icon_renditions_status',
+            field=models.CharField(blank=True, choices=[('', 'Sin imagen'), ('pending', 'Pendiente'), ('done', 'Listo'), ('failed', 'Fallido')], default='', editable=False, max_length=10, verbose_name='Estado de las versiones del ícono'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_renditions_status',
+            field=models.CharField(blank=True, choices=[('', 'Sin imagen'), ('pending', 'Pendiente'), ('done', 'Listo'), ('failed', 'Fallido')], default='', editable=False, max_length=10, verbose_name='Estado de las versiones de la imagen'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_image_renditions_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización'),
+        ),
+        migrations.AddField(
+            model_name='duration',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización'),
+        ),
+        migrations.AddField(
+            model_name='link',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización'),
+        ),
+    ]
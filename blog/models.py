@@ -1,9 +1,13 @@
 from django.db import models
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
 
 from blog import validators
+from utils.images import RENDITIONS_STATUSES, ImageRenditionsMixin
 
 
-class Group(models.Model):
+class Group(ImageRenditionsMixin, models.Model):
+    renditions_fields = {'icon': 'icon_renditions'}
+    
     id = models.AutoField(primary_key=True)
     name = models.CharField(
         max_length=100,
@@ -13,6 +17,24 @@ class Group(models.Model):
         upload_to='icons/',
         verbose_name='Ícono',
     )
+    icon_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Versiones del ícono',
+    )
+    icon_renditions_status = models.CharField(
+        max_length=10,
+        choices=RENDITIONS_STATUSES,
+        default='',
+        blank=True,
+        editable=False,
+        verbose_name='Estado de las versiones del ícono',
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Fecha de actualización',
+    )
     
     def __str__(self):
         return self.name
@@ -23,7 +45,9 @@ class Group(models.Model):
         ordering = ['name']
         
         
-class Category(models.Model):
+class Category(ImageRenditionsMixin, models.Model):
+    renditions_fields = {'icon': 'icon_renditions'}
+    
     id = models.AutoField(primary_key=True)
     name = models.CharField(
         max_length=100,
@@ -33,6 +57,24 @@ class Category(models.Model):
         upload_to='icons/',
         verbose_name='Ícono',
     )
+    icon_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Versiones del ícono',
+    )
+    icon_renditions_status = models.CharField(
+        max_length=10,
+        choices=RENDITIONS_STATUSES,
+        default='',
+        blank=True,
+        editable=False,
+        verbose_name='Estado de las versiones del ícono',
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Fecha de actualización',
+    )
     
     def __str__(self):
         return self.name
@@ -42,7 +84,9 @@ class Category(models.Model):
         verbose_name_plural = 'Categorías'
         
 
-class Link(models.Model):
+class Link(ImageRenditionsMixin, models.Model):
+    renditions_fields = {'icon': 'icon_renditions'}
+    
     id = models.AutoField(primary_key=True)
     name = models.CharField(
         max_length=100,
@@ -52,9 +96,27 @@ class Link(models.Model):
         upload_to='icons/',
         verbose_name='Ícono',
     )
+    icon_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Versiones del ícono',
+    )
+    icon_renditions_status = models.CharField(
+        max_length=10,
+        choices=RENDITIONS_STATUSES,
+        default='',
+        blank=True,
+        editable=False,
+        verbose_name='Estado de las versiones del ícono',
+    )
     url = models.URLField(
         verbose_name='URL'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Fecha de actualización',
+    )
     
     def __str__(self):
         return self.name
@@ -69,6 +131,10 @@ class Duration(models.Model):
     value = models.IntegerField(
         verbose_name='Duración (en minutos)'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Fecha de actualización',
+    )
     
     def __str__(self):
         return f"{self.value} min"
@@ -78,7 +144,15 @@ class Duration(models.Model):
         verbose_name_plural = 'Duraciones'
 
 
-class Post(models.Model):
+class Post(ImageRenditionsMixin, models.Model):
+    POST_TYPES = (
+        ('video', 'Video'),
+        ('audio', 'Audio'),
+        ('social', 'Redes sociales'),
+        ('', 'Texto'),
+    )
+    renditions_fields = {'image': 'image_renditions'}
+    
     id = models.AutoField(primary_key=True)
     title = models.CharField(
         max_length=100,
@@ -115,6 +189,20 @@ class Post(models.Model):
         null=True,
         blank=True,
     )
+    image_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Versiones de la imagen',
+    )
+    image_renditions_status = models.CharField(
+        max_length=10,
+        choices=RENDITIONS_STATUSES,
+        default='',
+        blank=True,
+        editable=False,
+        verbose_name='Estado de las versiones de la imagen',
+    )
     audio_link = models.URLField(
         verbose_name='Audio',
         null=True,
@@ -125,6 +213,14 @@ class Post(models.Model):
         null=True,
         blank=True,
     )
+    post_type = models.CharField(
+        max_length=10,
+        choices=POST_TYPES,
+        default='',
+        blank=True,
+        editable=False,
+        verbose_name='Tipo de post',
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Fecha de creación',
@@ -139,6 +235,69 @@ class Post(models.Model):
     def __str__(self):
         return self.title
     
+    def save(self, *args, **kwargs):
+        self.post_type = self.get_post_type()
+        super().save(*args, **kwargs)
+    
+    def get_post_type(self) -> str:
+        """ Get the post type from its media and links
+        
+        Returns:
+            str: video, audio, social or empty string
+        """
+        
+        if self.video_link:
+            return "video"
+        if self.audio_link:
+            return "audio"
+        if self.id and self.links.exists():
+            return "social"
+        return ""
+    
+    @staticmethod
+    def get_post_type_expression() -> Case:
+        """ Get the post type in the database, to update many posts
+        in a single query (same logic as get_post_type)
+        
+        Returns:
+            Case: post type expression
+        """
+        
+        has_links = Exists(
+            Post.links.through.objects.filter(post_id=OuterRef('id'))
+        )
+        return Case(
+            When(~Q(video_link=None) & ~Q(video_link=''), then=Value('video')),
+            When(~Q(audio_link=None) & ~Q(audio_link=''), then=Value('audio')),
+            When(has_links, then=Value('social')),
+            default=Value(''),
+        )
+    
     class Meta:
         verbose_name = 'Post'
-        verbose_name_plural = 'Posts'
\ No newline at end of file
+        verbose_name_plural = 'Posts'
+        indexes = [
+            # Keyset pagination of the posts feed
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='post_created_at_id_idx'
+            ),
+            # Posts feed filtered by type
+            models.Index(
+                fields=['post_type', '-created_at', '-id'],
+                name='post_type_created_at_idx'
+            ),
+            # Posts feed filtered by group, category or duration
+            models.Index(
+                fields=['group', '-created_at', '-id'],
+                name='post_group_created_at_idx'
+            ),
+            models.Index(
+                fields=['category', '-created_at', '-id'],
+                name='post_category_created_at_idx'
+            ),
+            models.Index(
+                fields=['duration', '-created_at', '-id'],
+                name='post_duration_created_at_idx'
+            ),
+        ]
\ No newline at end of file
@@ -0,0 +1,109 @@
+import random
+from time import monotonic
+
+from django.conf import settings
+from django.core.cache import cache
+
+from blog import models
+from utils.cache import new_version
+
+CACHE_VERSION_KEY = "blog:random_posts_ids:version"
+
+# Max filters combinations stored in the process (the total of stored ids
+# is limited by RANDOM_POSTS_MAX_STORED_IDS)
+MAX_STORED_FILTERS = 100
+
+# Posts ids stored in the process memory (reading them from the cache
+# backend would unpickle the whole list in each request).
+# The version is kept in the default cache (shared by the workers with the
+# file or redis CACHE_BACKEND), to invalidate all the processes
+posts_ids_store = {
+    "version": None,
+    "posts_ids": {},
+}
+
+
+def get_posts_ids(filters: dict) -> list[int]:
+    """ Get the ids of the posts that match the filters.
+    The ids are stored in memory and refreshed every
+    RANDOM_POSTS_IDS_TIMEOUT seconds, or when the posts change
+
+    Args:
+        filters (dict): queryset filters (lookup: value)
+
+    Returns:
+        list[int]: posts ids
+    """
+
+    # Discard the ids stored before the posts changed
+    version = cache.get_or_set(CACHE_VERSION_KEY, new_version, None)
+    if posts_ids_store["version"] != version:
+        posts_ids_store["version"] = version
+        posts_ids_store["posts_ids"] = {}
+    stored_posts_ids = posts_ids_store["posts_ids"]
+
+    params = "&".join(f"{lookup}={value}" for lookup, value in sorted(filters.items()))
+    expiration, posts_ids = stored_posts_ids.get(params, (0, None))
+    if posts_ids is None or expiration < monotonic():
+        posts_ids = list(
+            models.Post.objects.filter(**filters).values_list("id", flat=True)
+        )
+        store_posts_ids(params, posts_ids)
+
+    return posts_ids
+
+
+def store_posts_ids(params: str, posts_ids: list[int]):
+    """ Store the posts ids of a filters combination, discarding the
+    expired ids and the oldest ones above the limits. Above
+    RANDOM_POSTS_MAX_STORED_IDS, a random sample of the ids is stored
+    (a new sample is taken when it expires)
+
+    Args:
+        params (str): filters combination
+        posts_ids (list[int]): posts ids
+    """
+
+    stored_posts_ids = posts_ids_store["posts_ids"]
+    now = monotonic()
+    stored_posts_ids.pop(params, None)
+    for key, (expiration, _) in list(stored_posts_ids.items()):
+        if expiration < now:
+            del stored_posts_ids[key]
+
+    # Too many ids to keep in memory
+    max_ids = settings.RANDOM_POSTS_MAX_STORED_IDS
+    if len(posts_ids) > max_ids:
+        posts_ids = random.sample(posts_ids, max_ids)
+
+    total_ids = len(posts_ids) + sum(
+        len(ids) for _, ids in stored_posts_ids.values()
+    )
+    while stored_posts_ids and (
+        total_ids > max_ids or len(stored_posts_ids) >= MAX_STORED_FILTERS
+    ):
+        oldest = next(iter(stored_posts_ids))
+        total_ids -= len(stored_posts_ids.pop(oldest)[1])
+
+    stored_posts_ids[params] = (now + settings.RANDOM_POSTS_IDS_TIMEOUT, posts_ids)
+
+
+def get_random_posts_ids(filters: dict, amount: int = 1) -> list[int]:
+    """ Get distinct random posts ids, without sorting the posts table
+
+    Args:
+        filters (dict): queryset filters (lookup: value)
+        amount (int): number of posts ids to return
+
+    Returns:
+        list[int]: random posts ids (less than amount if there are not
+        enough posts)
+    """
+
+    posts_ids = get_posts_ids(filters)
+    return random.sample(posts_ids, min(amount, len(posts_ids)))
+
+
+def clear_posts_ids():
+    """ Invalidate the posts ids stored in all the processes """
+    cache.set(CACHE_VERSION_KEY, new_version(), None)
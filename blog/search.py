@@ -0,0 +1,226 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, Q, QuerySet, When
+from django.db.models.expressions import RawSQL
+
+from blog import models
+
+# Shadow table with the search index of the posts, created in the
+# migrations (sqlite: fts5 virtual table, postgresql: tsvector with gin index).
+# Other databases search with icontains
+SEARCH_TABLE = "blog_post_search"
+
+
+def is_index_available() -> bool:
+    """ Check if the database has a search index """
+    return connection.vendor in ["sqlite", "postgresql"]
+
+
+def index_posts(posts: list):
+    """ Add or update the posts in the search index
+
+    Args:
+        posts (list[Post]): posts to index (only id, title and text are used)
+    """
+
+    if not is_index_available() or not posts:
+        return
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.executemany(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+                [[post.id] for post in posts]
+            )
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, title, text) "
+                "VALUES (%s, %s, %s)",
+                [[post.id, post.title, post.text or ""] for post in posts]
+            )
+        else:
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (post_id, document) VALUES (%s, "
+                "setweight(to_tsvector(%s::regconfig, %s), 'A') || "
+                "setweight(to_tsvector(%s::regconfig, %s), 'B')) "
+                "ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document",
+                [
+                    [
+                        post.id,
+                        settings.SEARCH_CONFIG, post.title,
+                        settings.SEARCH_CONFIG, post.text or "",
+                    ]
+                    for post in posts
+                ]
+            )
+
+
+def remove_post(post_id: int):
+    """ Remove a post from the search index
+
+    Args:
+        post_id (int): id of the deleted post
+    """
+
+    if connection.vendor != "sqlite":
+        # Postgres rows are removed in cascade
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [post_id])
+
+
+def rebuild_index(batch_size: int = 1000) -> int:
+    """ Index all the posts again (for example, after a bulk create)
+
+    Args:
+        batch_size (int): posts indexed in each query
+
+    Returns:
+        int: number of posts indexed
+    """
+
+    if not is_index_available():
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+    posts = models.Post.objects.only("id", "title", "text").order_by("id")
+    total = 0
+    batch = []
+    for post in posts.iterator(chunk_size=batch_size):
+        batch.append(post)
+        if len(batch) == batch_size:
+            index_posts(batch)
+            total += len(batch)
+            batch = []
+    index_posts(batch)
+    total += len(batch)
+
+    return total
+
+
+def get_fts5_query(query: str) -> str:
+    """ Convert the user search into a safe fts5 query:
+    all the words are required, and the last one can be a prefix
+
+    Args:
+        query (str): user search
+
+    Returns:
+        str: fts5 query
+    """
+
+    words = re.findall(r"\w+", query)
+    terms = [f'"{word}"' for word in words]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_posts_ids(query: str, queryset: QuerySet = None) -> list[int]:
+    """ Get the ids of the posts that match the search, best first
+
+    Args:
+        query (str): user search
+        queryset (QuerySet): filtered posts to search in, applied before
+            the SEARCH_MAX_RESULTS limit (optional)
+
+    Returns:
+        list[int]: posts ids (up to SEARCH_MAX_RESULTS)
+    """
+
+    # Filters of the posts, as a subquery of ids (before the limit)
+    filter_sql, filter_params = "", []
+    if queryset is not None and queryset.query.where:
+        ids_sql, filter_params = queryset.order_by().values("id").query.sql_with_params()
+        filter_sql = f"IN ({ids_sql}) "
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            fts5_query = get_fts5_query(query)
+            if not fts5_query:
+                return []
+
+            # bm25 is lower for better results, titles weight double
+            cursor.execute(
+                f"SELECT rowid FROM {SEARCH_TABLE} "
+                f"WHERE {SEARCH_TABLE} MATCH %s "
+                + (f"AND rowid {filter_sql}" if filter_sql else "") +
+                f"ORDER BY bm25({SEARCH_TABLE}, 2.0, 1.0) LIMIT %s",
+                [fts5_query, *filter_params, settings.SEARCH_MAX_RESULTS]
+            )
+        else:
+            cursor.execute(
+                "SELECT post_id FROM "
+                f"{SEARCH_TABLE}, websearch_to_tsquery(%s::regconfig, %s) query "
+                "WHERE document @@ query "
+                + (f"AND post_id {filter_sql}" if filter_sql else "") +
+                "ORDER BY ts_rank(document, query) DESC LIMIT %s",
+                [
+                    settings.SEARCH_CONFIG, query,
+                    *filter_params, settings.SEARCH_MAX_RESULTS
+                ]
+            )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_posts(queryset: QuerySet, query: str) -> QuerySet:
+    """ Filter the posts by the search, sorted by relevance
+
+    Args:
+        queryset (QuerySet): posts queryset
+        query (str): user search
+
+    Returns:
+        QuerySet: posts that match the search
+    """
+
+    # Databases without index search in title and text, without rank
+    if not is_index_available():
+        return queryset.filter(Q(title__icontains=query) | Q(text__icontains=query))
+
+    posts_ids = search_posts_ids(query, queryset)
+    if not posts_ids:
+        return queryset.none()
+
+    rank_order = Case(*[
+        When(id=post_id, then=position)
+        for position, post_id in enumerate(posts_ids)
+    ])
+    return queryset.filter(id__in=posts_ids).order_by(rank_order, "-id")
+
+
+def filter_posts(queryset: QuerySet, query: str) -> QuerySet:
+    """ Filter the posts by the search with a subquery of the index,
+    without rank nor SEARCH_MAX_RESULTS limit (used by the admin, that
+    sorts the results by its own ordering)
+
+    Args:
+        queryset (QuerySet): posts queryset
+        query (str): user search
+
+    Returns:
+        QuerySet: all the posts that match the search
+    """
+
+    if not is_index_available():
+        return queryset.filter(Q(title__icontains=query) | Q(text__icontains=query))
+
+    if connection.vendor == "sqlite":
+        fts5_query = get_fts5_query(query)
+        if not fts5_query:
+            return queryset.none()
+        posts_ids = RawSQL(
+            f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s",
+            [fts5_query]
+        )
+    else:
+        posts_ids = RawSQL(
+            f"SELECT post_id FROM {SEARCH_TABLE} "
+            "WHERE document @@ websearch_to_tsquery(%s::regconfig, %s)",
+            [settings.SEARCH_CONFIG, query]
+        )
+    return queryset.filter(id__in=posts_ids)
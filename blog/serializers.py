@@ -1,24 +1,57 @@
 from rest_framework import serializers
 
 from blog import models
+from utils.images import get_srcset
+from utils.media import get_absolute_media_url, get_storage_url
+
+
+class MediaUrlField(serializers.ImageField):
+    """ Image url, memoized by file name and storage (see utils.media) """
+    
+    def to_representation(self, value):
+        if not value:
+            return None
+        url = get_storage_url(value.name, value.storage)
+        return get_absolute_media_url(url, self.context.get("request"))
+
+
+class SrcsetField(serializers.ReadOnlyField):
+    """ Srcset of each format of the image renditions """
+    
+    def to_representation(self, value):
+        request = self.context.get("request")
+        
+        def get_url(name):
+            return get_absolute_media_url(get_storage_url(name), request)
+        
+        return get_srcset(value or {}, get_url)
 
 
 class GroupSerializer(serializers.ModelSerializer):
+    icon = MediaUrlField(read_only=True)
+    icon_renditions = SrcsetField()
+    
     class Meta:
         model = models.Group
-        fields = "__all__"
+        exclude = ["icon_renditions_status"]
 
 
 class CategorySerializer(serializers.ModelSerializer):
+    icon = MediaUrlField(read_only=True)
+    icon_renditions = SrcsetField()
+    
     class Meta:
         model = models.Category
-        fields = "__all__"
+        exclude = ["icon_renditions_status"]
 
 
 class LinkSerializer(serializers.ModelSerializer):
+    icon = MediaUrlField(read_only=True)
+    icon_renditions = SrcsetField()
+    
     class Meta:
         model = models.Link
-        fields = "__all__"
+        exclude = ["icon_renditions_status"]
 
 
 class DurationSerializer(serializers.Serializer):
@@ -32,27 +65,15 @@ class PostSerializer(serializers.ModelSerializer):
     links = LinkSerializer(many=True)
     group = GroupSerializer()
     category = CategorySerializer()
+    image = MediaUrlField(read_only=True)
+    image_renditions = SrcsetField()
 
     class Meta:
         model = models.Post
-        fields = "__all__"
+        exclude = ["image_renditions_status"]
 
 
 class PostSerializerSummary(serializers.ModelSerializer):
-    post_type = serializers.SerializerMethodField()
-
     class Meta:
         model = models.Post
         fields = ['id', 'title', 'post_type']
-        
-    def get_post_type(self, obj):
-        
-        post_type = ""
-        if obj.video_link:
-            post_type = "video"
-        elif obj.audio_link:
-            post_type = "audio"
-        elif obj.links:
-            post_type = "social"
-                        
-        return post_type
\ No newline at end of file
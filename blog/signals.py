@@ -0,0 +1,111 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from blog import models
+from blog import random_posts
+from blog import search
+from utils.cache import clear_namespace
+from utils.changelist import clear_filter_choices
+
+# Cached api data that depends on each model
+CACHE_NAMESPACES = {
+    models.Group: ["groups", "posts"],
+    models.Category: ["categories", "posts"],
+    models.Link: ["posts"],
+    models.Duration: ["durations", "posts"],
+    models.Post: ["posts"],
+}
+
+# Models with cached choices in the posts admin filters
+FILTER_MODELS = [models.Group, models.Category, models.Duration]
+
+
+@receiver(post_save, sender=models.Post)
+@receiver(post_delete, sender=models.Post)
+def clear_random_posts_ids(sender, **kwargs):
+    """ Refresh the posts ids used to get random posts """
+    random_posts.clear_posts_ids()
+
+
+@receiver(post_save, sender=models.Post)
+def index_post(sender, instance, **kwargs):
+    """ Update the post in the search index """
+    search.index_posts([instance])
+
+
+@receiver(post_delete, sender=models.Post)
+def remove_post_index(sender, instance, **kwargs):
+    """ Remove the post from the search index """
+    search.remove_post(instance.id)
+
+
+def clear_api_cache(sender, **kwargs):
+    """ Invalidate the cached api data of the updated model """
+    for namespace in CACHE_NAMESPACES[sender]:
+        clear_namespace(namespace)
+
+
+for model in CACHE_NAMESPACES:
+    post_save.connect(clear_api_cache, sender=model)
+    post_delete.connect(clear_api_cache, sender=model)
+
+
+def clear_admin_filter_choices(sender, **kwargs):
+    """ Invalidate the cached choices of the posts admin filters """
+    clear_filter_choices()
+
+
+for model in FILTER_MODELS:
+    post_save.connect(clear_admin_filter_choices, sender=model)
+    post_delete.connect(clear_admin_filter_choices, sender=model)
+
+
+@receiver(m2m_changed, sender=models.Post.links.through)
+def clear_api_cache_links(sender, action, **kwargs):
+    """ Invalidate the cached posts when their links change """
+    if action in ["post_add", "post_remove", "post_clear"]:
+        clear_namespace("posts")
+
+
+def update_posts_links(posts_ids: list[int]):
+    """ Update the type and modification date of the posts
+    after their links change
+    """
+    models.Post.objects.filter(id__in=posts_ids).update(
+        post_type=models.Post.get_post_type_expression(),
+        updated_at=timezone.now(),
+    )
+    random_posts.clear_posts_ids()
+
+
+@receiver(m2m_changed, sender=models.Post.links.through)
+def update_posts_links_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """ Update the posts when their links are added or removed """
+    
+    if not reverse:
+        if action in ["post_add", "post_remove", "post_clear"]:
+            update_posts_links([instance.id])
+    elif action == "pre_clear":
+        # Save the link posts before they are removed
+        instance.cleared_posts_ids = list(
+            instance.post_set.values_list("id", flat=True)
+        )
+    elif action == "post_clear":
+        update_posts_links(instance.cleared_posts_ids)
+    elif action in ["post_add", "post_remove"]:
+        update_posts_links(pk_set)
+
+
+@receiver(pre_delete, sender=models.Link)
+def save_link_posts(sender, instance, **kwargs):
+    """ Save the link posts before the link is removed from them """
+    instance.deleted_posts_ids = list(
+        instance.post_set.values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=models.Link)
+def update_link_posts(sender, instance, **kwargs):
+    """ Update the posts of the deleted link """
+    update_posts_links(instance.deleted_posts_ids)
@@ -0,0 +1,128 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from blog import models
+from utils.changelist import (
+    CACHE_CHOICES_VERSION_KEY,
+    EstimatedCountPaginator,
+    clear_filter_choices,
+)
+
+
+class PostChangeListTestCase(TestCase):
+    
+    @classmethod
+    def setUpTestData(cls):
+        """ Load data only once """
+        
+        call_command("apps_loaddata", stdout=StringIO())
+    
+    def setUp(self):
+        # Discard choices of previous tests
+        clear_filter_choices()
+        
+        self.user = User.objects.create_superuser(username="admin", password="admin")
+        self.client.force_login(self.user)
+    
+    def create_posts(self, amount: int):
+        """ Create posts in all the groups and categories """
+        
+        groups = list(models.Group.objects.all())
+        categories = list(models.Category.objects.all())
+        duration = models.Duration.objects.first()
+        models.Post.objects.bulk_create([
+            models.Post(
+                title=f"Post {index}",
+                group=groups[index % len(groups)],
+                category=categories[index % len(categories)],
+                duration=duration,
+            )
+            for index in range(amount)
+        ])
+    
+    def test_query_count(self):
+        """ Test that the changelist queries don't depend on the posts """
+        
+        self.create_posts(2)
+        self.client.get("/admin/blog/post/")
+        
+        # session, user, estimated posts, posts count, posts page
+        with self.assertNumQueries(5):
+            response = self.client.get("/admin/blog/post/")
+        self.assertEqual(response.status_code, 200)
+        
+        self.create_posts(20)
+        with self.assertNumQueries(5):
+            response = self.client.get("/admin/blog/post/")
+        self.assertContains(response, "Post 19")
+    
+    def test_filter_choices_changed(self):
+        """ Test that the filters show the new groups """
+        
+        self.client.get("/admin/blog/post/")
+        models.Group.objects.create(name="New group")
+        
+        response = self.client.get("/admin/blog/post/")
+        self.assertContains(response, "New group")
+    
+    def test_filter_choices_culled_version(self):
+        """ Test that the old choices are not valid again when the
+        version is removed from the cache """
+        
+        self.client.get("/admin/blog/post/")
+        models.Group.objects.create(name="New group")
+        cache.delete(CACHE_CHOICES_VERSION_KEY)
+        
+        response = self.client.get("/admin/blog/post/")
+        self.assertContains(response, "New group")
+    
+    def test_estimated_count(self):
+        """ Test that the count of the large tables is estimated """
+        
+        self.create_posts(10)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE blog_post")
+        self.create_posts(5)
+        
+        queryset = models.Post.objects.order_by("id")
+        with override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=10):
+            self.assertEqual(EstimatedCountPaginator(queryset, 5).count, 10)
+            
+            # Validate exact count of filtered posts
+            group = models.Group.objects.first()
+            filtered = queryset.filter(group=group)
+            self.assertEqual(
+                EstimatedCountPaginator(filtered, 10).count, filtered.count()
+            )
+        
+        # Validate exact count of small tables
+        with override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=100):
+            self.assertEqual(EstimatedCountPaginator(queryset, 10).count, 15)
+    
+    def test_estimated_count_last_pages(self):
+        """ Test that the pages after a low estimate can be reached """
+        
+        self.create_posts(10)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE blog_post")
+        self.create_posts(5)
+        
+        queryset = models.Post.objects.order_by("id")
+        with override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=10):
+            # Validate exact count in the last estimated page
+            paginator = EstimatedCountPaginator(queryset, 5)
+            self.assertEqual(len(paginator.page(1)), 5)
+            self.assertEqual(paginator.count, 10)
+            self.assertEqual(len(paginator.page(2)), 5)
+            self.assertEqual(paginator.count, 15)
+            self.assertEqual(paginator.num_pages, 3)
+            
+            # Validate pages beyond the estimate
+            paginator = EstimatedCountPaginator(queryset, 5)
+            self.assertEqual(len(paginator.page(3)), 5)
+            self.assertEqual(paginator.count, 15)
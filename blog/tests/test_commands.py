@@ -0,0 +1,102 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from blog import models
+from blog import search
+from core.test_base.test_views import TemporaryMediaMixin
+from utils.cache import get_api_cache, get_namespace_version
+from utils.changelist import get_choices_version
+
+
+class GenerateDataTestCase(TestCase):
+    
+    def setUp(self):
+        # Generate data
+        call_command(
+            "generate_posts",
+            posts=30,
+            groups=2,
+            categories=3,
+            links=4,
+            durations=2,
+            max_links=3,
+            batch_size=7,
+            stdout=StringIO(),
+        )
+    
+    def test_generated_data(self):
+        """ Test that the data is created with the requested amounts """
+        
+        self.assertEqual(models.Post.objects.count(), 30)
+        self.assertEqual(models.Group.objects.count(), 2)
+        self.assertEqual(models.Category.objects.count(), 3)
+        self.assertEqual(models.Link.objects.count(), 4)
+        self.assertEqual(models.Duration.objects.count(), 2)
+        
+    def test_posts_links(self):
+        """ Test that the posts links are limited by max links """
+        
+        for post in models.Post.objects.prefetch_related("links"):
+            self.assertLessEqual(len(post.links.all()), 3)
+            
+    def test_posts_types(self):
+        """ Test that the posts types match their media and links """
+        
+        for post in models.Post.objects.all():
+            self.assertEqual(post.post_type, post.get_post_type())
+            
+    def test_posts_dates(self):
+        """ Test that the posts dates are distributed """
+        
+        dates = models.Post.objects.values_list("created_at", flat=True)
+        self.assertGreater(len(set(dates)), 1)
+        
+    def test_search_index(self):
+        """ Test that the generated posts are added to the search index """
+        
+        post = models.Post.objects.first()
+        self.assertIn(post.id, search.search_posts_ids(post.title))
+        
+    def test_clear_filter_choices(self):
+        """ Test that the cached admin filters choices are invalidated """
+        
+        version = get_choices_version()
+        call_command("generate_posts", posts=1, stdout=StringIO())
+        self.assertNotEqual(get_choices_version(), version)
+        
+    def test_clear_api_cache(self):
+        """ Test that only the api namespaces are invalidated """
+        
+        version = get_namespace_version("posts")
+        get_api_cache().set("other", 1)
+        call_command("generate_posts", posts=1, stdout=StringIO())
+        self.assertNotEqual(get_namespace_version("posts"), version)
+        self.assertEqual(get_api_cache().get("other"), 1)
+
+
+class GenerateImageRenditionsTestCase(TemporaryMediaMixin, TestCase):
+    
+    def test_fixtures_renditions(self):
+        """ Test that the renditions of the objects without them are created """
+        
+        call_command("apps_loaddata", stdout=StringIO())
+        self.assertEqual(models.Group.objects.first().icon_renditions, {})
+        
+        stdout = StringIO()
+        call_command("generate_image_renditions", stdout=stdout)
+        self.assertIn("blog.Group:", stdout.getvalue())
+        for group in models.Group.objects.all():
+            self.assertEqual(group.icon_renditions_status, "pending")
+        
+        # Validate that the worker creates the renditions
+        call_command("run_jobs", once=True, stdout=StringIO())
+        for group in models.Group.objects.all():
+            self.assertEqual(group.icon_renditions["source"], group.icon.name)
+            self.assertEqual(group.icon_renditions_status, "done")
+        
+        # Validate that existing renditions are skipped
+        stdout = StringIO()
+        call_command("generate_image_renditions", stdout=stdout)
+        self.assertIn("blog.Group: 0 queued", stdout.getvalue())
@@ -1,7 +1,21 @@
+from io import StringIO
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models.signals import post_save
+from django.test import override_settings
 from rest_framework import status
+from rest_framework.test import APIRequestFactory
 
 from blog import models
+from blog import random_posts
+from blog import views
+from core.authentication import revoked_users_store
 from core.test_base.test_views import BlogTestCase
+from utils.cache import get_api_cache, get_namespace_version
+from utils.pagination import KeysetPagination, OptionalCountPagination
 
 
 class GroupViewSetTestCase(BlogTestCase):
@@ -296,6 +310,30 @@ class PostViewSetTestCase(BlogTestCase):
         # Validate duration
         self.assertEqual(result["duration"], duration_1.value)
         
+    def test_filter_duration_without_posts(self):
+        """ Test durations without posts or invalid """
+        
+        for duration in ["999", "abc"]:
+            response = self.client.get(f"{self.endpoint}?duration={duration}")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json()["count"], 0)
+            
+    def test_filters_indexes(self):
+        """ Test that the feed queries use the composite indexes """
+        
+        post = self.post_1
+        filters_indexes = {
+            "post_created_at_id_idx": {},
+            "post_group_created_at_idx": {"group_id": post.group_id},
+            "post_category_created_at_idx": {"category_id": post.category_id},
+            "post_duration_created_at_idx": {"duration_id__in": [post.duration_id]},
+            "post_type_created_at_idx": {"post_type": post.post_type},
+        }
+        for index, filters in filters_indexes.items():
+            queryset = models.Post.objects.filter(**filters)
+            plan = queryset.order_by("-created_at", "-id")[:10].explain()
+            self.assertIn(index, plan)
+        
     def test_get_summary(self):
         """ Test that authenticated users can access the endpoint
         and use the summary parameter to get a summary of the posts
@@ -324,6 +362,547 @@ class PostViewSetTestCase(BlogTestCase):
             self.assertEqual(post.title, result["title"])
             self.assertEqual(result["post_type"], post_types[post_index])
         
+    def test_post_type(self):
+        """ Test that the post type is updated with the media and links """
+        
+        # Validate video and audio
+        self.assertEqual(self.post_1.post_type, "video")
+        self.post_1.video_link = None
+        self.post_1.save()
+        self.assertEqual(self.post_1.post_type, "audio")
+        
+        # Validate social
+        self.post_1.audio_link = None
+        self.post_1.save()
+        self.assertEqual(self.post_1.post_type, "social")
+        
+        # Validate without links
+        self.post_1.links.clear()
+        self.post_1.refresh_from_db()
+        self.assertEqual(self.post_1.post_type, "")
+        
+        # Validate added links
+        self.post_1.links.add(models.Link.objects.first())
+        self.post_1.refresh_from_db()
+        self.assertEqual(self.post_1.post_type, "social")
+        
+    def test_image_renditions(self):
+        """ Test that the image renditions are created and returned as srcset """
+        
+        # Validate that the renditions are queued
+        self.assertEqual(self.post_1.image_renditions_status, "pending")
+        self.assertEqual(
+            self.post_1.image_renditions, {"source": self.post_1.image.name}
+        )
+        
+        # Validate renditions (only widths smaller than the image)
+        call_command("run_jobs", once=True, stdout=StringIO())
+        self.post_1.refresh_from_db()
+        self.assertEqual(self.post_1.image_renditions_status, "done")
+        renditions = self.post_1.image_renditions
+        self.assertEqual(renditions["source"], self.post_1.image.name)
+        self.assertEqual(list(renditions["webp"].keys()), ["320", "640"])
+        for name in renditions["webp"].values():
+            self.assertTrue(self.post_1.image.storage.exists(name))
+        
+        # Validate srcset
+        response = self.client.get(f"{self.endpoint}{self.post_1.id}/")
+        srcset = response.json()["image_renditions"]["webp"].split(", ")
+        self.assertEqual(len(srcset), 2)
+        self.assertTrue(srcset[0].startswith("http://testserver/media/"))
+        self.assertTrue(srcset[0].endswith(".webp 320w"))
+        
+        # Validate that the status is not public
+        self.assertNotIn("image_renditions_status", response.json())
+        
+    def test_image_renditions_single_save(self):
+        """ Test that saving a new image sends a single post_save signal """
+        
+        saves = []
+        
+        def count_saves(sender, instance, **kwargs):
+            saves.append(instance.pk)
+        
+        post_save.connect(count_saves, sender=models.Post)
+        try:
+            self.post_1.image = self.post_2.image.name
+            self.post_1.save()
+        finally:
+            post_save.disconnect(count_saves, sender=models.Post)
+        
+        self.assertEqual(saves, [self.post_1.pk])
+        self.post_1.refresh_from_db()
+        self.assertEqual(self.post_1.image_renditions_status, "pending")
+        
+    def test_image_renditions_replaced(self):
+        """ Test that the old renditions files are deleted """
+        
+        call_command("run_jobs", once=True, stdout=StringIO())
+        self.post_1.refresh_from_db()
+        storage = self.post_1.image.storage
+        names = list(self.post_1.image_renditions["webp"].values())
+        
+        # Validate that forced renditions keep the same names
+        self.post_1.queue_renditions(force=True)
+        call_command("run_jobs", once=True, stdout=StringIO())
+        self.post_1.refresh_from_db()
+        self.assertEqual(list(self.post_1.image_renditions["webp"].values()), names)
+        
+        # Validate that the renditions of a replaced image are deleted
+        self.post_1.image = self.post_2.image.name
+        self.post_1.save()
+        for name in names:
+            self.assertFalse(storage.exists(name))
+        
+    @override_settings(MEDIA_CDN_DOMAIN="cdn.example.com")
+    def test_cdn_media_urls(self):
+        """ Test that the images urls use the cdn domain """
+        
+        response = self.client.get(f"{self.endpoint}{self.post_1.id}/")
+        result = response.json()
+        self.assertEqual(
+            result["image"], f"https://cdn.example.com/media/{self.post_1.image.name}"
+        )
+        self.assertTrue(result["group"]["icon"].startswith("https://cdn.example.com/"))
+        
+    def test_post_type_deleted_link(self):
+        """ Test that the post type is updated when its links are deleted """
+        
+        self.post_1.video_link = None
+        self.post_1.audio_link = None
+        self.post_1.save()
+        
+        models.Link.objects.all().delete()
+        self.post_1.refresh_from_db()
+        self.assertEqual(self.post_1.post_type, "")
+        
+    def test_filter_post_type(self):
+        """ Test that the post type filter works """
+        
+        # Update first post
+        self.post_1.video_link = None
+        self.post_1.save()
+        
+        # Validate response
+        response = self.client.get(f"{self.endpoint}?post_type=audio")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        json_data = response.json()
+        self.assertEqual(json_data["count"], 1)
+        self.assertEqual(json_data["results"][0]["id"], self.post_1.id)
+        self.assertEqual(json_data["results"][0]["post_type"], "audio")
+        
+    def test_search(self):
+        """ Test that the search returns the matching posts,
+        with title matches first
+        """
+        
+        # Update posts
+        self.post_1.title = "Respiración"
+        self.post_1.text = "Ejercicio de meditación guiada"
+        self.post_1.save()
+        self.post_2.title = "Meditación para dormir"
+        self.post_2.save()
+        
+        # Validate response
+        response = self.client.get(f"{self.endpoint}?q=meditacion")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        json_data = response.json()
+        self.assertEqual(json_data["count"], 2)
+        results_ids = [result["id"] for result in json_data["results"]]
+        self.assertEqual(results_ids, [self.post_2.id, self.post_1.id])
+        
+        # Validate prefix and multiple words
+        response = self.client.get(f"{self.endpoint}?q=meditación dorm")
+        json_data = response.json()
+        self.assertEqual(json_data["count"], 1)
+        self.assertEqual(json_data["results"][0]["id"], self.post_2.id)
+        
+    def test_search_without_results(self):
+        """ Test searches without results and with special characters """
+        
+        for query in ["nothing", '"', "*", "title:post OR"]:
+            response = self.client.get(f"{self.endpoint}?q={query}")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json()["count"], 0)
+            
+    def test_search_deleted_post(self):
+        """ Test that deleted posts are removed from the search index """
+        
+        self.post_1.delete()
+        response = self.client.get(f"{self.endpoint}?q=post")
+        json_data = response.json()
+        self.assertEqual(json_data["count"], 1)
+        self.assertEqual(json_data["results"][0]["id"], self.post_2.id)
+        
+    def test_search_filters(self):
+        """ Test that the search works with the filters """
+        
+        # Update first post
+        group_2 = models.Group.objects.get(id=2)
+        self.post_1.group = group_2
+        self.post_1.save()
+        
+        response = self.client.get(f"{self.endpoint}?q=post&group=2")
+        json_data = response.json()
+        self.assertEqual(json_data["count"], 1)
+        self.assertEqual(json_data["results"][0]["id"], self.post_1.id)
+        
+    def test_search_filters_max_results(self):
+        """ Test that the filters are applied before the SEARCH_MAX_RESULTS
+        limit (each group finds its post, whatever its rank)
+        """
+        
+        # Update first post
+        group_2 = models.Group.objects.get(id=2)
+        self.post_1.group = group_2
+        self.post_1.save()
+        
+        with override_settings(SEARCH_MAX_RESULTS=1):
+            for group, post in [(2, self.post_1), (1, self.post_2)]:
+                response = self.client.get(f"{self.endpoint}?q=post&group={group}")
+                json_data = response.json()
+                self.assertEqual(json_data["count"], 1)
+                self.assertEqual(json_data["results"][0]["id"], post.id)
+        
+    def test_admin_search(self):
+        """ Test that the admin search returns all the results
+        (without the SEARCH_MAX_RESULTS limit of the api)
+        """
+        
+        user = User.objects.create_superuser(username="search-admin", password="admin")
+        self.client.force_login(user)
+        with override_settings(SEARCH_MAX_RESULTS=1):
+            response = self.client.get("/admin/blog/post/?q=post")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, "Post 1")
+        self.assertContains(response, "Post 2")
+        
+        response = self.client.get("/admin/blog/post/?q=nothing")
+        self.assertNotContains(response, "Post 1")
+        
+    def test_query_count_list(self):
+        """ Test that the list doesn't run extra queries per post
+        (validators, count, posts and links)
+        """
+        
+        self.validate_query_count(self.endpoint, 4)
+        
+        # Validate the same queries with more posts
+        self.create_post(
+            title="Post 3",
+            text="Post 3 text",
+            image_name="sample.webp",
+            audio_link="https://www.test.com/sample.mp3",
+            video_link="https://www.test.com/sample.mp4",
+        )
+        self.validate_query_count(self.endpoint, 4)
+        
+    def test_query_count_summary(self):
+        """ Test that the summary list doesn't load relations
+        (validators, count and posts)
+        """
+        
+        self.validate_query_count(f"{self.endpoint}?summary=true", 3)
+        
+    def test_query_count_detail(self):
+        """ Test the queries of the post detail
+        (validators, post and links)
+        """
+        
+        self.validate_query_count(f"{self.endpoint}{self.post_1.id}/", 3)
+        
+    def test_cached_response(self):
+        """ Test that the second request is returned from the cache,
+        without queries """
+        
+        self.client.get(self.endpoint)
+        self.validate_query_count(self.endpoint, 0)
+        
+    def test_cached_response_params(self):
+        """ Test that the responses are cached by get params """
+        
+        # Update first post
+        group_2 = models.Group.objects.get(id=2)
+        self.post_1.group = group_2
+        self.post_1.save()
+        
+        # Validate each filter is cached apart
+        response = self.client.get(f"{self.endpoint}?group=1")
+        self.assertEqual(response.json()["count"], 1)
+        response = self.client.get(f"{self.endpoint}?group=2")
+        self.assertEqual(response.json()["count"], 1)
+        response = self.client.get(self.endpoint)
+        self.assertEqual(response.json()["count"], 2)
+        
+    def test_cache_invalidation_post(self):
+        """ Test that the cached responses are updated when a post changes """
+        
+        self.client.get(self.endpoint)
+        
+        # Update post and validate response
+        self.post_1.title = "Post 1 updated"
+        self.post_1.save()
+        response = self.client.get(self.endpoint)
+        result = list(filter(
+            lambda result: result["id"] == self.post_1.id,
+            response.json()["results"]
+        ))[0]
+        self.assertEqual(result["title"], "Post 1 updated")
+        
+    def test_cache_invalidation_links(self):
+        """ Test that the cached responses are updated when the links
+        of a post change
+        """
+        
+        self.client.get(f"{self.endpoint}{self.post_1.id}/")
+        
+        # Remove links and validate response
+        self.post_1.links.clear()
+        response = self.client.get(f"{self.endpoint}{self.post_1.id}/")
+        self.assertEqual(response.json()["links"], [])
+        
+    def test_cache_invalidation_group(self):
+        """ Test that the cached posts are updated when a group changes """
+        
+        self.client.get(self.endpoint)
+        
+        # Update group and validate response
+        group = self.post_1.group
+        group.name = "Group updated"
+        group.save()
+        response = self.client.get(self.endpoint)
+        for result in response.json()["results"]:
+            self.assertEqual(result["group"]["name"], "Group updated")
+        
+    def test_conditional_list(self):
+        """ Test that the list returns 304 when the posts didn't change """
+        
+        response = self.client.get(self.endpoint)
+        etag = response["ETag"]
+        self.assertTrue(response["Last-Modified"])
+        
+        # Validate not modified response (without queries)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.endpoint, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        
+        # Validate modified response
+        self.post_1.title = "Post 1 updated"
+        self.post_1.save()
+        response = self.client.get(self.endpoint, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        
+    def test_conditional_list_related_update(self):
+        """ Test that the list etag changes when a related model changes,
+        without updating the posts
+        """
+        
+        response = self.client.get(self.endpoint)
+        etag = response["ETag"]
+        updated_at = models.Post.objects.get(id=self.post_1.id).updated_at
+        
+        group = self.post_1.group
+        group.name = "Group updated"
+        group.save()
+        self.assertEqual(
+            models.Post.objects.get(id=self.post_1.id).updated_at, updated_at
+        )
+        
+        response = self.client.get(self.endpoint, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        
+    def test_conditional_list_params(self):
+        """ Test that the etag of a page or representation is not valid
+        for the others
+        """
+        
+        response = self.client.get(self.endpoint)
+        etag = response["ETag"]
+        
+        for params in ["page=1", "summary=true", "count=false", "q=post"]:
+            response = self.client.get(
+                f"{self.endpoint}?{params}", HTTP_IF_NONE_MATCH=etag
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response["ETag"], etag)
+        
+        # Validate same params in other order
+        etag = self.client.get(f"{self.endpoint}?summary=true&count=false")["ETag"]
+        response = self.client.get(
+            f"{self.endpoint}?count=false&summary=true", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+    def test_conditional_list_deleted_post(self):
+        """ Test that the list etag changes when a post is deleted """
+        
+        response = self.client.get(self.endpoint)
+        etag = response["ETag"]
+        
+        self.post_1.delete()
+        response = self.client.get(self.endpoint, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 1)
+        
+    def test_conditional_list_modified_since(self):
+        """ Test the list with the If-Modified-Since header """
+        
+        response = self.client.get(self.endpoint)
+        last_modified = response["Last-Modified"]
+        
+        response = self.client.get(
+            self.endpoint,
+            HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+    def test_conditional_detail(self):
+        """ Test that the detail returns 304 when the post didn't change,
+        including its links
+        """
+        
+        endpoint = f"{self.endpoint}{self.post_1.id}/"
+        response = self.client.get(endpoint)
+        etag = response["ETag"]
+        
+        # Validate not modified response
+        response = self.client.get(endpoint, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        # Validate modified links
+        self.post_1.links.remove(models.Link.objects.first())
+        response = self.client.get(endpoint, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["links"]), 1)
+        
+    def test_conditional_detail_related_update(self):
+        """ Test that the detail etag changes when a related model changes """
+        
+        endpoint = f"{self.endpoint}{self.post_1.id}/"
+        response = self.client.get(endpoint)
+        etag = response["ETag"]
+        
+        # Update category
+        category = self.post_1.category
+        category.name = "Category updated"
+        category.save()
+        
+        response = self.client.get(endpoint, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["category"]["name"], "Category updated")
+        
+    def test_conditional_detail_not_found(self):
+        """ Test that missing posts return not found """
+        
+        response = self.client.get(f"{self.endpoint}999/", HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+    def test_skip_count(self):
+        """ Test that the count query is skipped with the count param
+        (validators, posts and links)
+        """
+        
+        response = self.validate_query_count(f"{self.endpoint}?count=false", 3)
+        
+        # Validate extra content
+        json_data = response.json()
+        self.assertNotIn("count", json_data)
+        self.assertIsNone(json_data["next"])
+        self.assertIsNone(json_data["previous"])
+        self.assertEqual(len(json_data["results"]), 2)
+        
+    def test_skip_count_pages(self):
+        """ Test the next and previous pages without count """
+        
+        with patch.object(OptionalCountPagination, "page_size", 1):
+            
+            # Validate first page
+            response = self.client.get(f"{self.endpoint}?count=false")
+            json_data = response.json()
+            self.assertEqual(json_data["results"][0]["id"], self.post_2.id)
+            self.assertIsNone(json_data["previous"])
+            
+            # Validate last page
+            response = self.client.get(json_data["next"])
+            json_data = response.json()
+            self.assertEqual(json_data["results"][0]["id"], self.post_1.id)
+            self.assertIsNone(json_data["next"])
+            self.assertIsNotNone(json_data["previous"])
+        
+    def test_cursor_pagination(self):
+        """ Test the next and previous pages with keyset pagination """
+        
+        with patch.object(KeysetPagination, "page_size", 1):
+            
+            # Validate first page
+            response = self.client.get(f"{self.endpoint}?pagination=cursor")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            json_data = response.json()
+            self.assertNotIn("count", json_data)
+            self.assertIsNone(json_data["previous"])
+            self.assertEqual(len(json_data["results"]), 1)
+            self.assertEqual(json_data["results"][0]["id"], self.post_2.id)
+            
+            # Validate last page
+            response = self.client.get(json_data["next"])
+            json_data = response.json()
+            self.assertIsNone(json_data["next"])
+            self.assertEqual(len(json_data["results"]), 1)
+            self.assertEqual(json_data["results"][0]["id"], self.post_1.id)
+            
+            # Validate previous page
+            response = self.client.get(json_data["previous"])
+            json_data = response.json()
+            self.assertIsNone(json_data["previous"])
+            self.assertIsNotNone(json_data["next"])
+            self.assertEqual(json_data["results"][0]["id"], self.post_2.id)
+            
+    def test_cursor_pagination_filters(self):
+        """ Test that the filters are kept in the keyset pagination """
+        
+        # Update first post
+        group_2 = models.Group.objects.get(id=2)
+        self.post_1.group = group_2
+        self.post_1.save()
+        
+        response = self.client.get(f"{self.endpoint}?pagination=cursor&group=1")
+        json_data = response.json()
+        self.assertIsNone(json_data["next"])
+        self.assertEqual(len(json_data["results"]), 1)
+        self.assertEqual(json_data["results"][0]["id"], self.post_2.id)
+            
+    def test_cursor_query_count(self):
+        """ Test that the keyset pagination doesn't count the posts
+        (validators, posts and links)
+        """
+        
+        self.validate_query_count(f"{self.endpoint}?pagination=cursor", 3)
+        
+    def test_cursor_summary_query_count(self):
+        """ Test that the cursor links of the summary don't load the
+        ordering fields of each row (validators and posts)
+        """
+        
+        with patch.object(KeysetPagination, "page_size", 1):
+            response = self.validate_query_count(
+                f"{self.endpoint}?pagination=cursor&summary=true", 2
+            )
+            next_link = response.json()["next"]
+            self.assertTrue(next_link)
+            
+            # Validate page with next and previous links (cached validators)
+            response = self.validate_query_count(next_link, 1)
+            self.assertTrue(response.json()["previous"])
+        
+    def test_invalid_cursor(self):
+        """ Test that invalid cursors return not found """
+        
+        response = self.client.get(f"{self.endpoint}?pagination=cursor&cursor=abc")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
         
 class RandomPostViewSetTestCase(BlogTestCase):
 
@@ -393,6 +972,137 @@ class RandomPostViewSetTestCase(BlogTestCase):
         self.assertIn(post.image.url, result["image"])
         self.assertEqual(post.audio_link, result["audio_link"])
         self.assertEqual(post.video_link, result["video_link"])
+        
+    def test_query_count(self):
+        """ Test the queries of the random post (posts ids, post and links) """
+        
+        self.validate_query_count(self.endpoint, 3)
+        
+    def test_query_count_cached(self):
+        """ Test that the cached random posts are not queried """
+        
+        # Cache posts ids and posts
+        self.client.get(f"{self.endpoint}?amount=2")
+        
+        self.validate_query_count(self.endpoint, 0)
+        
+    def test_cache_invalidation(self):
+        """ Test that the cached random posts are updated when they change """
+        
+        self.client.get(f"{self.endpoint}?amount=2")
+        
+        # Update posts and validate response
+        models.Post.objects.update(title="Post updated")
+        for post in models.Post.objects.all():
+            post.save()
+        response = self.client.get(self.endpoint)
+        self.assertEqual(response.json()["results"][0]["title"], "Post updated")
+        
+    def test_amount(self):
+        """ Test that the amount param returns distinct random posts """
+        
+        response = self.client.get(f"{self.endpoint}?amount=2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        # Validate distinct posts in a single page
+        json_data = response.json()
+        self.assertEqual(json_data["count"], 2)
+        self.assertIsNone(json_data["next"])
+        results_ids = [result["id"] for result in json_data["results"]]
+        self.assertEqual(
+            sorted(results_ids),
+            sorted([self.post_1.id, self.post_2.id])
+        )
+        
+    def test_amount_bigger_than_posts(self):
+        """ Test that the amount is limited to the available posts """
+        
+        response = self.client.get(f"{self.endpoint}?amount=5")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 2)
+        
+    def test_filter_group(self):
+        """ Test that the group filter works """
+        
+        # Update first post
+        group_2 = models.Group.objects.get(id=2)
+        self.post_1.group = group_2
+        self.post_1.save()
+        
+        # Validate only the post in the group is returned
+        for _ in range(5):
+            response = self.client.get(f"{self.endpoint}?group=1")
+            json_data = response.json()
+            self.assertEqual(json_data["count"], 1)
+            self.assertEqual(json_data["results"][0]["id"], self.post_2.id)
+            
+    def test_invalid_filters(self):
+        """ Test that the filters with invalid ids return bad request """
+        
+        for params in ["group=abc", "category=1.5", "group=1&category=x"]:
+            response = self.client.get(f"{self.endpoint}?{params}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            
+            response = self.client.get(f"/api/posts/?{params}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        response = self.client.get(f"{self.endpoint}?group=abc")
+        self.assertIn("group", response.json()["data"])
+        
+    def test_filter_without_posts(self):
+        """ Test that an empty page is returned when no posts match the filters """
+        
+        response = self.client.get(f"{self.endpoint}?group=3")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 0)
+        
+    def test_deleted_post(self):
+        """ Test that deleted posts are removed from the cached posts ids """
+        
+        # Cache posts ids
+        self.client.get(self.endpoint)
+        
+        # Validate deleted post is not returned
+        self.post_1.delete()
+        for _ in range(5):
+            response = self.client.get(self.endpoint)
+            json_data = response.json()
+            self.assertEqual(json_data["results"][0]["id"], self.post_2.id)
+    
+    def test_stored_ids_limit(self):
+        """ Test that the stored posts ids are limited by their total """
+        
+        random_posts.clear_posts_ids()
+        with override_settings(RANDOM_POSTS_MAX_STORED_IDS=2):
+            self.client.get(self.endpoint)
+            self.client.get(f"{self.endpoint}?group=1")
+            
+            # Validate that the oldest ids are discarded
+            stored_posts_ids = random_posts.posts_ids_store["posts_ids"]
+            self.assertEqual(len(stored_posts_ids), 1)
+            self.assertEqual(len(list(stored_posts_ids.values())[0][1]), 2)
+        
+        # Validate that a sample of the ids above the limit is stored
+        random_posts.clear_posts_ids()
+        with override_settings(RANDOM_POSTS_MAX_STORED_IDS=1):
+            response = self.client.get(self.endpoint)
+            self.assertEqual(response.json()["count"], 1)
+            stored_posts_ids = random_posts.posts_ids_store["posts_ids"]
+            self.assertEqual(len(list(stored_posts_ids.values())[0][1]), 1)
+            
+            # Validate that the next requests don't query the ids
+            with self.assertNumQueries(0):
+                random_posts.get_posts_ids({})
+    
+    def test_page_param(self):
+        """ Test that the page param is ignored (each page is random) """
+        
+        response = self.client.get(f"{self.endpoint}?page=2&amount=2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        json_data = response.json()
+        self.assertEqual(len(json_data["results"]), 2)
+        self.assertIsNone(json_data["next"])
+        self.assertIsNone(json_data["previous"])
     
     def test_authenticated_user_post(self):
         """ Test that authenticated users can not post to the endpoint """
@@ -410,4 +1120,186 @@ class RandomPostViewSetTestCase(BlogTestCase):
         
         # add id to endpoint
         self.endpoint = f"{self.endpoint}1/"
-        self.validate_invalid_method("patch")
\ No newline at end of file
+        self.validate_invalid_method("patch")
+
+
+class AsyncViewSetsTestCase(BlogTestCase):
+    """ Validate that the async viewsets return the same data as the sync ones """
+
+    def setUp(self):
+        # Set endpoint
+        super().setUp(endpoint="/api/posts/")
+        
+        # Create posts
+        self.post_1 = self.create_post(
+            title="Post 1",
+            text="Post 1 text",
+            image_name="sample.webp",
+            audio_link="https://www.test.com/sample.mp3",
+            video_link="https://www.test.com/sample.mp4",
+        )
+        self.factory = APIRequestFactory()
+        
+    def get_async_response(self, viewset, action: str, path: str, **kwargs):
+        """ Render the response of an async viewset (without cache)
+
+        Args:
+            viewset (class): async viewset
+            action (str): viewset action (list or retrieve)
+            path (str): request path
+
+        Returns:
+            Response: rendered response
+        """
+        
+        view = viewset.as_view({"get": action})
+        self.assertTrue(iscoroutinefunction(view))
+        
+        get_api_cache().clear()
+        request = self.factory.get(path, HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        response = async_to_sync(view)(request, **kwargs)
+        response.render()
+        return response
+        
+    def test_groups(self):
+        """ Test the groups list and detail """
+        
+        response = self.get_async_response(
+            views.AsyncGroupViewSet, "list", "/api/groups/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, self.client.get("/api/groups/").data)
+        
+        group = models.Group.objects.first()
+        response = self.get_async_response(
+            views.AsyncGroupViewSet, "retrieve", f"/api/groups/{group.id}/",
+            pk=group.id
+        )
+        self.assertEqual(response.data["name"], group.name)
+        
+    def test_posts(self):
+        """ Test the posts list and detail """
+        
+        response = self.get_async_response(
+            views.AsyncPostViewSet, "list", self.endpoint
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, self.client.get(self.endpoint).data)
+        self.assertTrue(response["ETag"])
+        
+        response = self.get_async_response(
+            views.AsyncPostViewSet, "retrieve", f"{self.endpoint}{self.post_1.id}/",
+            pk=self.post_1.id
+        )
+        self.assertEqual(response.data["id"], self.post_1.id)
+        
+        # Not found post
+        response = self.get_async_response(
+            views.AsyncPostViewSet, "retrieve", f"{self.endpoint}999/", pk=999
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+    def test_random_post(self):
+        """ Test the random posts """
+        
+        response = self.get_async_response(
+            views.AsyncRandomPostViewSet, "list", "/api/random-post/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["id"], self.post_1.id)
+        
+    def test_revoked_users_sync(self):
+        """ Test the token authentication when the revoked users are read
+        again from the database (in the worker thread)
+        """
+        
+        revoked_users_store["synced_at"] = None
+        response = self.get_async_response(
+            views.AsyncGroupViewSet, "list", "/api/groups/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(revoked_users_store["synced_at"])
+        
+    def test_unauthenticated_user_get(self):
+        """ Test that unauthenticated users can not access the async viewsets """
+        
+        view = views.AsyncPostViewSet.as_view({"get": "list"})
+        response = async_to_sync(view)(self.factory.get(self.endpoint))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class CacheStatsViewTestCase(BlogTestCase):
+
+    def setUp(self):
+        # Set endpoint
+        super().setUp(endpoint="/api/cache-stats/")
+        
+    def test_non_admin_user_get(self):
+        """ Test that non admin users can not access the endpoint """
+        
+        # Login as regular user
+        user = User.objects.create_user(username="user", password="user")
+        token = self.get_access_token(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        
+        # Validate response
+        response = self.client.get(self.endpoint)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_hits_and_misses(self):
+        """ Test that the cache hits and misses are counted """
+        
+        # Get initial stats
+        response = self.client.get(self.endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = response.json()["data"]["groups"]
+        
+        # Request groups twice (miss and hit)
+        self.client.get("/api/groups/")
+        self.client.get("/api/groups/")
+        
+        # Validate stats
+        response = self.client.get(self.endpoint)
+        new_stats = response.json()["data"]["groups"]
+        self.assertEqual(new_stats["hits"], stats["hits"] + 1)
+        self.assertEqual(new_stats["misses"], stats["misses"] + 1)
+        
+    def test_durations_stats(self):
+        """ Test that the durations map accesses are counted """
+        
+        self.client.get("/api/posts/?duration=5")
+        self.client.get("/api/posts/?duration=5")
+        
+        response = self.client.get(self.endpoint)
+        stats = response.json()["data"]["durations"]
+        self.assertEqual(stats["misses"], 1)
+        self.assertGreaterEqual(stats["hits"], 1)
+        
+    def test_stats_interval(self):
+        """ Test that the counts are written to the shared cache only
+        every API_CACHE_STATS_INTERVAL seconds """
+        
+        with override_settings(API_CACHE_STATS_INTERVAL=3600):
+            self.client.get("/api/groups/")
+        self.assertIsNone(get_api_cache().get("api:groups:misses"))
+        
+        # Validate counts flushed by the stats
+        response = self.client.get(self.endpoint)
+        self.assertEqual(response.json()["data"]["groups"]["misses"], 1)
+        self.assertEqual(get_api_cache().get("api:groups:misses"), 1)
+        
+    def test_culled_version(self):
+        """ Test that the old cached responses are not valid again
+        when the namespace version is removed from the cache """
+        
+        self.client.get("/api/groups/")
+        models.Group.objects.first().save()
+        get_api_cache().delete("api:groups:version")
+        self.client.get("/api/groups/")
+        
+        response = self.client.get(self.endpoint)
+        self.assertEqual(response.json()["data"]["groups"]["misses"], 2)
+        self.assertEqual(
+            response.json()["data"]["groups"]["version"],
+            get_namespace_version("groups"),
+        )
@@ -1,44 +1,158 @@
-from rest_framework import permissions, viewsets
+from hashlib import md5
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Case, Count, Max, Subquery, When
+from rest_framework import exceptions, fields, permissions, viewsets
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from blog import serializers
 from blog import models
+from blog import random_posts
+from blog import search
+from utils.async_views import AsyncReadOnlyViewSetMixin
+from utils.cache import (
+    CacheResponseMixin,
+    ConditionalGetMixin,
+    get_cache_stats,
+    get_cached_objects,
+    get_cached_value,
+)
+from utils.pagination import KeysetPagination, OptionalCountPagination
+from utils.queries import optimize_queryset
+
+# Models rendered inside the posts (their changes modify the posts data)
+POST_RELATED_MODELS = [models.Group, models.Category, models.Link, models.Duration]
+
+
+class PostFiltersMixin:
+    """ Read the post filters from the get params """
+    
+    def get_filters(self) -> dict:
+        """ Get the post filters from the get params
+        
+        Returns:
+            dict: queryset filters (lookup: value)
+        """
+        
+        filters = {}
+        
+        # Filter by group
+        group = self.get_id_param("group")
+        if group is not None:
+            filters["group_id"] = group
+            
+        # Filter by category
+        category = self.get_id_param("category")
+        if category is not None:
+            filters["category_id"] = category
+            
+        # Filter by duration (without join)
+        duration = self.request.query_params.get("duration", None)
+        if duration:
+            filters["duration_id__in"] = self.get_durations_ids(duration)
+            
+        # Filter by type (video, audio or social)
+        post_type = self.request.query_params.get("post_type", None)
+        if post_type:
+            filters["post_type"] = post_type
+            
+        return filters
+    
+    def get_id_param(self, name: str) -> int | None:
+        """ Get an id from the get params
+        
+        Args:
+            name (str): get param name
+            
+        Raises:
+            ValidationError: the value is not an integer (400 response)
+            
+        Returns:
+            int | None: id, or None without the param
+        """
+        
+        value = self.request.query_params.get(name, None)
+        if not value:
+            return None
+        try:
+            return fields.IntegerField().run_validation(value)
+        except exceptions.ValidationError as error:
+            raise exceptions.ValidationError({name: error.detail})
+    
+    def get_durations_ids(self, value: str) -> list[int]:
+        """ Get the ids of the durations with the value (minutes),
+        from the cached durations map
+        
+        Args:
+            value (str): duration value from the get params
+            
+        Returns:
+            list[int]: durations ids
+        """
+        
+        def get_durations_map():
+            durations_map = {}
+            for duration in models.Duration.objects.all():
+                durations_map.setdefault(duration.value, []).append(duration.id)
+            return durations_map
+        
+        durations_map = get_cached_value("durations", "map", get_durations_map)
+        try:
+            return durations_map.get(int(value), [])
+        except ValueError:
+            return []
 
 
-class GroupViewSet(viewsets.ReadOnlyModelViewSet):
+class RandomPostPagination(OptionalCountPagination):
+    """ Return all the random posts in a single page. There are no page
+    numbers: each request is a new random page (the 'page' param is ignored)
+    """
+    
+    page_size = 1
+    page_query_param = None
+    page_size_query_param = "amount"
+    max_page_size = settings.RANDOM_POSTS_MAX_AMOUNT
+
+
+class GroupViewSet(CacheResponseMixin, viewsets.ReadOnlyModelViewSet):
     queryset = models.Group.objects.all()
     serializer_class = serializers.GroupSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_namespace = "groups"
     
     
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(CacheResponseMixin, viewsets.ReadOnlyModelViewSet):
     queryset = models.Category.objects.all()
     serializer_class = serializers.CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_namespace = "categories"
     
     
-class PostViewSet(viewsets.ReadOnlyModelViewSet):
+class PostViewSet(
+    ConditionalGetMixin,
+    CacheResponseMixin,
+    PostFiltersMixin,
+    viewsets.ReadOnlyModelViewSet
+):
     queryset = models.Post.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    cache_namespace = "posts"
     
     def get_queryset(self):
         """ Filter in get params """
         
-        queryset = models.Post.objects.all().order_by("-created_at")
+        queryset = models.Post.objects.all().order_by("-created_at", "-id")
+        queryset = queryset.filter(**self.get_filters())
         
-        # Filter by group
-        group = self.request.query_params.get("group", None)
-        if group:
-            queryset = queryset.filter(group__id=group)
-            
-        # Filter by category
-        category = self.request.query_params.get("category", None)
-        if category:
-            queryset = queryset.filter(category__id=category)
-            
-        # Filter by duration
-        duration = self.request.query_params.get("duration", None)
-        if duration:
-            queryset = queryset.filter(duration__value=duration)
+        # Search in title and text, sorted by relevance
+        query = self.request.query_params.get("q", None)
+        if query:
+            queryset = search.search_posts(queryset, query)
+        
+        # Load the relations used by the serializer
+        queryset = optimize_queryset(queryset, self.get_serializer_class())
             
         return queryset
     
@@ -49,19 +163,168 @@ class PostViewSet(viewsets.ReadOnlyModelViewSet):
             return serializers.PostSerializerSummary
         
         return serializers.PostSerializer
+    
+    def get_list_validators(self):
+        """ Last update of the filtered posts and the models rendered
+        inside them, and number of posts
+        """
+        
+        filters = self.get_filters()
+        
+        def get_validators():
+            # Last update of each related table, in the same query
+            related_dates = {
+                model._meta.model_name: Max(Subquery(
+                    model.objects.order_by("-updated_at").values("updated_at")[:1]
+                ))
+                for model in POST_RELATED_MODELS
+            }
+            posts = models.Post.objects.filter(**filters).aggregate(
+                last_modified=Max("updated_at"),
+                count=Count("id"),
+                **related_dates,
+            )
+            dates = [posts["last_modified"]] + [posts[name] for name in related_dates]
+            last_modified = max(filter(None, dates), default=None)
+            etag = f"{last_modified}:{posts['count']}"
+            return md5(etag.encode()).hexdigest(), last_modified
+        
+        return get_cached_value(
+            self.cache_namespace,
+            f"list-validators:{sorted(filters.items())}",
+            get_validators
+        )
+    
+    def get_detail_validators(self):
+        """ Last update of the post and the models rendered inside it """
+        
+        post_id = self.kwargs["pk"]
+        
+        def get_validators():
+            try:
+                dates = models.Post.objects.filter(id=post_id).annotate(
+                    links_updated_at=Max("links__updated_at")
+                ).values_list(
+                    "updated_at",
+                    "group__updated_at",
+                    "category__updated_at",
+                    "duration__updated_at",
+                    "links_updated_at",
+                ).first()
+            except (ValueError, TypeError, ValidationError):
+                return None
+            if dates is None:
+                return None
+            updated_at = max(filter(None, dates))
+            etag = f"{post_id}:{updated_at}"
+            return md5(etag.encode()).hexdigest(), updated_at
+        
+        return get_cached_value(
+            self.cache_namespace,
+            f"detail-validators:{post_id}",
+            get_validators
+        )
+    
+    @property
+    def paginator(self):
+        """ Use keyset pagination if 'pagination=cursor' param is passed.
+        The keyset pagination sorts by date, so the search results ('q')
+        are returned newest first instead of by relevance
+        """
+        
+        if not hasattr(self, "_paginator"):
+            if self.request.query_params.get("pagination", None) == "cursor":
+                self._paginator = KeysetPagination()
+            else:
+                self._paginator = OptionalCountPagination()
+        return self._paginator
 
 
-class RandomPostViewSet(viewsets.ReadOnlyModelViewSet):
+class RandomPostViewSet(PostFiltersMixin, viewsets.ReadOnlyModelViewSet):
     queryset = models.Post.objects.all()
     serializer_class = serializers.PostSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = RandomPostPagination
+    
+    cache_namespace = "posts"
+    
+    def get_random_posts_ids(self) -> list[int]:
+        """ Sample the random posts ids from the cached ids
+        (the amount of posts is set with the 'amount' get param)
+        """
+        
+        amount = self.paginator.get_page_size(self.request)
+        return random_posts.get_random_posts_ids(self.get_filters(), amount)
     
     def get_queryset(self):
-        """ Filter in get params """
+        """ Filter in get params and get random posts """
+        
+        posts_ids = self.get_random_posts_ids()
+        if not posts_ids:
+            return models.Post.objects.none()
         
-        queryset = models.Post.objects.all()
+        # Get posts keeping the random order
+        random_order = Case(*[
+            When(id=post_id, then=position)
+            for position, post_id in enumerate(posts_ids)
+        ])
+        queryset = models.Post.objects.filter(id__in=posts_ids).order_by(random_order)
         
-        # Get random post
-        queryset = queryset.order_by("?")[:1]
+        # Load the relations used by the serializer
+        queryset = optimize_queryset(queryset, self.get_serializer_class())
         
-        return queryset
\ No newline at end of file
+        return queryset
+    
+    def list(self, request, *args, **kwargs):
+        """ Return the random posts, serializing only the posts
+        that are not cached
+        """
+        
+        posts_ids = self.paginate_queryset(self.get_random_posts_ids())
+        
+        def serialize_posts(missing_ids: list[int]) -> list[dict]:
+            queryset = models.Post.objects.filter(id__in=missing_ids)
+            queryset = optimize_queryset(queryset, self.get_serializer_class())
+            return self.get_serializer(queryset, many=True).data
+        
+        results = get_cached_objects(
+            self.cache_namespace,
+            request,
+            posts_ids,
+            serialize_posts
+        )
+        return self.get_paginated_response(results)
+
+
+class AsyncGroupViewSet(AsyncReadOnlyViewSetMixin, GroupViewSet):
+    """ Async version of GroupViewSet (ASGI deployment) """
+    
+    
+class AsyncCategoryViewSet(AsyncReadOnlyViewSetMixin, CategoryViewSet):
+    """ Async version of CategoryViewSet (ASGI deployment) """
+    
+    
+class AsyncPostViewSet(AsyncReadOnlyViewSetMixin, PostViewSet):
+    """ Async version of PostViewSet (ASGI deployment) """
+    
+    
+class AsyncRandomPostViewSet(AsyncReadOnlyViewSetMixin, RandomPostViewSet):
+    """ Async version of RandomPostViewSet (ASGI deployment) """
+
+
+class CacheStatsView(APIView):
+    """ Cache hits and misses of the api endpoints """
+    
+    permission_classes = [permissions.IsAdminUser]
+    
+    def get(self, request):
+        return Response({
+            "status": "ok",
+            "message": "cache stats",
+            "data": get_cache_stats([
+                GroupViewSet.cache_namespace,
+                CategoryViewSet.cache_namespace,
+                PostViewSet.cache_namespace,
+                "durations",
+            ]),
+        })
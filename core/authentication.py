@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+from time import monotonic, time
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from core.models import RevokedUser
+
+# Seconds to read again the revoked users from the database
+REVOKED_USERS_SYNC_INTERVAL = 5
+
+# Revoked users (user id: revocation timestamp) stored in the process memory.
+# They are shared between processes in the database (RevokedUser)
+revoked_users_store = {
+    "synced_at": None,
+    "revoked_users": {},
+}
+
+
+def get_revocation_lifetime() -> float:
+    """ Seconds to keep a revocation: after that, all the tokens
+    issued before it are expired """
+    return max(
+        api_settings.ACCESS_TOKEN_LIFETIME,
+        api_settings.REFRESH_TOKEN_LIFETIME
+    ).total_seconds()
+
+
+def get_revoked_since() -> datetime:
+    """ Date of the oldest revocation that can reject a token """
+    return datetime.now(timezone.utc) - timedelta(seconds=get_revocation_lifetime())
+
+
+def sync_revoked_users() -> dict:
+    """ Read the current revocations from the database
+
+    Returns:
+        dict: user id: revocation timestamp
+    """
+
+    revocations = RevokedUser.objects.filter(revoked_at__gt=get_revoked_since())
+    revoked_users = {
+        str(user_id): int(revoked_at.timestamp())
+        for user_id, revoked_at in revocations.values_list("user_id", "revoked_at")
+    }
+    revoked_users_store["revoked_users"] = revoked_users
+    revoked_users_store["synced_at"] = monotonic()
+    return revoked_users
+
+
+def get_revoked_users() -> dict:
+    """ Get the revoked users, read from the database at most every
+    REVOKED_USERS_SYNC_INTERVAL seconds
+
+    Returns:
+        dict: user id: revocation timestamp
+    """
+
+    synced_at = revoked_users_store["synced_at"]
+    if synced_at is None or monotonic() - synced_at > REVOKED_USERS_SYNC_INTERVAL:
+        return sync_revoked_users()
+    return revoked_users_store["revoked_users"]
+
+
+def revoke_user(user_id: int):
+    """ Reject the tokens issued to the user until now
+    (for example, after the user is deactivated or deleted)
+
+    Args:
+        user_id (int): id of the user
+    """
+
+    # Same resolution as the "iat" claim (seconds)
+    revoked_at = datetime.fromtimestamp(int(time()), timezone.utc)
+    RevokedUser.objects.update_or_create(
+        user_id=user_id,
+        defaults={"revoked_at": revoked_at},
+    )
+
+    # Remove the expired revocations
+    RevokedUser.objects.filter(revoked_at__lte=get_revoked_since()).delete()
+
+    revoked_users_store["revoked_users"][str(user_id)] = int(revoked_at.timestamp())
+
+
+def is_token_revoked(token) -> bool:
+    """ Check if the token was issued before its user was revoked
+
+    Args:
+        token (Token): validated access or refresh token
+
+    Returns:
+        bool: True if the token must be rejected
+    """
+
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    revoked_at = get_revoked_users().get(str(user_id))
+    return revoked_at is not None and token.get("iat", 0) < revoked_at
+
+
+def clear_revoked_users():
+    """ Accept again the tokens of all the revoked users """
+
+    RevokedUser.objects.all().delete()
+    revoked_users_store["revoked_users"] = {}
+    revoked_users_store["synced_at"] = monotonic()
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """ Authenticate with the claims of the signed token (user id, is_active,
+    is_staff, is_superuser, roles and is_admin) without querying the user.
+    The tokens of the revoked users are rejected: the revocations are stored
+    in the RevokedUser table, and each process reads them again every
+    REVOKED_USERS_SYNC_INTERVAL seconds (the delay to apply them) """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+
+        if not validated_token.get("is_active", True) or is_token_revoked(validated_token):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
+
@@ -0,0 +1,183 @@
+from datetime import datetime, timezone as dt_timezone
+from time import perf_counter, time
+
+from django.conf import settings
+from django.utils import timezone
+
+from core import models
+
+
+class BlacklistFullError(Exception):
+    """ The blacklist has max_entries tokens that didn't expire """
+
+
+class MemoryBlacklist:
+    """ Blacklisted tokens stored in the process memory (with TTL).
+    The entries are not shared: use it only with a single server worker.
+    When max_entries tokens didn't expire, new tokens are rejected
+    (removing a live entry would make its token valid again) """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries = {}  # jti: expiration timestamp
+        self.metrics = {
+            "lookups": 0,
+            "blacklisted": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0,
+        }
+
+    def add(self, jti: str, expires_at: int):
+        """ Blacklist a token until it expires
+
+        Args:
+            jti (str): token id ("jti" claim)
+            expires_at (int): token expiration timestamp ("exp" claim)
+
+        Raises:
+            BlacklistFullError: max_entries tokens didn't expire
+        """
+
+        if len(self.entries) >= self.max_entries:
+            # Entries are added in expiration order (same tokens lifetime)
+            if next(iter(self.entries.values())) <= time():
+                self.compact_memory()
+            if len(self.entries) >= self.max_entries:
+                raise BlacklistFullError()
+
+        self.entries[jti] = expires_at
+
+    def contains(self, jti: str) -> bool:
+        """ Check if the token is blacklisted (and not expired) """
+        return self.entries.get(jti, 0) > time()
+
+    def is_blacklisted(self, jti: str) -> bool:
+        """ Check if the token is blacklisted, measuring the lookup
+
+        Args:
+            jti (str): token id ("jti" claim)
+
+        Returns:
+            bool: True if the token must be rejected
+        """
+
+        start = perf_counter()
+        blacklisted = self.contains(jti)
+        duration = (perf_counter() - start) * 1000
+
+        self.metrics["lookups"] += 1
+        self.metrics["blacklisted"] += int(blacklisted)
+        self.metrics["total_ms"] += duration
+        self.metrics["max_ms"] = max(self.metrics["max_ms"], duration)
+
+        return blacklisted
+
+    def compact_memory(self) -> int:
+        """ Remove the expired tokens from the memory
+
+        Returns:
+            int: number of tokens removed
+        """
+
+        now = time()
+        entries = {
+            jti: expires_at for jti, expires_at in self.entries.items()
+            if expires_at > now
+        }
+        removed = len(self.entries) - len(entries)
+        self.entries = entries
+        return removed
+
+    def compact(self, batch_size: int = 1000) -> int:
+        """ Remove the expired tokens
+
+        Args:
+            batch_size (int): rows deleted in each query (database backend)
+
+        Returns:
+            int: number of tokens removed
+        """
+        return self.compact_memory()
+
+    def get_metrics(self) -> dict:
+        """ Get the lookups metrics of the process
+
+        Returns:
+            dict: lookups, blacklisted tokens found, mean and max latency (ms)
+            and entries in memory
+        """
+
+        lookups = self.metrics["lookups"]
+        return {
+            "backend": type(self).__name__,
+            "lookups": lookups,
+            "blacklisted": self.metrics["blacklisted"],
+            "mean_ms": round(self.metrics["total_ms"] / lookups, 4) if lookups else 0,
+            "max_ms": round(self.metrics["max_ms"], 4),
+            "memory_entries": len(self.entries),
+        }
+
+
+class DatabaseBlacklist(MemoryBlacklist):
+    """ Blacklisted tokens stored in the database (shared by all the processes),
+    the tokens blacklisted in the process are found without queries.
+    The tokens of other processes are not in the memory, so the other
+    lookups always query the database """
+
+    def add(self, jti: str, expires_at: int):
+        # The memory is only a local copy: when it is full, the token
+        # is found in the database
+        try:
+            super().add(jti, expires_at)
+        except BlacklistFullError:
+            pass
+        models.BlacklistedToken.objects.get_or_create(
+            jti=jti,
+            defaults={
+                "expires_at": datetime.fromtimestamp(expires_at, tz=dt_timezone.utc)
+            },
+        )
+
+    def contains(self, jti: str) -> bool:
+        if super().contains(jti):
+            return True
+
+        return models.BlacklistedToken.objects.filter(
+            jti=jti,
+            expires_at__gt=timezone.now(),
+        ).exists()
+
+    def compact(self, batch_size: int = 1000) -> int:
+        self.compact_memory()
+
+        # Delete by ids in batches, to avoid long locks
+        expired = models.BlacklistedToken.objects.filter(expires_at__lte=timezone.now())
+        removed = 0
+        while True:
+            ids = list(expired.values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            models.BlacklistedToken.objects.filter(id__in=ids).delete()
+            removed += len(ids)
+
+        return removed
+
+
+BLACKLIST_BACKENDS = {
+    "memory": MemoryBlacklist,
+    "database": DatabaseBlacklist,
+}
+
+# Blacklist of the process, created in the first use
+blacklist_store = {
+    "blacklist": None,
+}
+
+
+def get_blacklist() -> MemoryBlacklist:
+    """ Get the refresh tokens blacklist (TOKEN_BLACKLIST_BACKEND) """
+
+    if blacklist_store["blacklist"] is None:
+        backend = BLACKLIST_BACKENDS[settings.TOKEN_BLACKLIST_BACKEND]
+        blacklist_store["blacklist"] = backend(settings.TOKEN_BLACKLIST_MAX_ENTRIES)
+    return blacklist_store["blacklist"]
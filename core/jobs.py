@@ -0,0 +1,113 @@
+import traceback
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core import models
+
+# Functions that run the jobs, by job name
+handlers = {}
+
+
+def register(name: str) -> Callable:
+    """ Register the function that runs the jobs with the name
+    (it receives the job, and raises an exception to retry it)
+
+    Args:
+        name (str): job name
+
+    Returns:
+        callable: decorator
+    """
+
+    def decorator(handler: Callable) -> Callable:
+        handlers[name] = handler
+        return handler
+    return decorator
+
+
+def enqueue(name: str, max_attempts: int = None, delay: int = 0, **payload) -> models.Job:
+    """ Add a job to the queue
+
+    Args:
+        name (str): job name (registered with 'register')
+        max_attempts (int): times to try the job (default JOBS_MAX_ATTEMPTS)
+        delay (int): seconds to wait before running the job
+        **payload: job data (json serializable)
+
+    Returns:
+        models.Job: created job
+    """
+
+    return models.Job.objects.create(
+        name=name,
+        payload=payload,
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def claim_job() -> models.Job | None:
+    """ Mark the next job as running, so other workers skip it.
+    Jobs running for more than JOBS_TIMEOUT seconds (the worker stopped)
+    are claimed again
+
+    Returns:
+        models.Job | None: claimed job, or None if there are no jobs to run
+    """
+
+    now = timezone.now()
+    timeout = now - timedelta(seconds=settings.JOBS_TIMEOUT)
+    jobs = models.Job.objects.filter(
+        Q(status="pending", run_at__lte=now)
+        | Q(status="running", updated_at__lte=timeout)
+    ).order_by("run_at", "id")
+
+    for job in jobs[:10]:
+        # Only one worker updates the job
+        claimed = models.Job.objects.filter(
+            id=job.id,
+            status=job.status,
+            updated_at=job.updated_at,
+        ).update(
+            status="running",
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def run_job(job: models.Job) -> str:
+    """ Run a claimed job: delete it if it succeeds, or retry it later
+    (with exponential backoff) until max_attempts
+
+    Args:
+        job (models.Job): claimed job
+
+    Returns:
+        str: result (done, retry or failed)
+    """
+
+    try:
+        handler = handlers[job.name]
+        handler(job)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.is_last_attempt:
+            job.status = "failed"
+        else:
+            job.status = "pending"
+            delay = settings.JOBS_RETRY_DELAY * 2 ** (job.attempts - 1)
+            job.run_at = timezone.now() + timedelta(seconds=delay)
+        job.save()
+        return "retry" if job.status == "pending" else "failed"
+
+    job.delete()
+    return "done"
+
@@ -1,29 +1,145 @@
 import os
+from time import perf_counter
 
-from django.core.management.base import BaseCommand
-from django.core.management import call_command
+from django.apps import apps
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
 
-BASE_FILE = os.path.basename(__file__)
+from utils.cache import clear_api_namespaces
+from utils.changelist import clear_filter_choices
 
 
 class Command(BaseCommand):
     help = 'Load data for all apps'
-    
+
+    # Fixtures of each app (app_label/fixtures/app_label/<name>.json)
+    fixtures = {
+        "blog": [
+            "Group",
+            "Category",
+            "Link",
+            "Duration",
+        ],
+    }
+
     def handle(self, *args, **kwargs):
-        commands_data = {
-            "blog": [
-                "Group",
-                "Category",
-                "Link",
-                "Duration",
-            ],
-        }
-        
-        for command_category, commands in commands_data.items():
-            for command in commands:
-                try:
-                    full_command = f"{command_category}/{command}"
-                    call_command("loaddata", full_command)
-                except Exception as e:
-                    print(f"Error in {BASE_FILE}: {e}")
-                    continue
\ No newline at end of file
+        start = perf_counter()
+
+        # Parse all the fixtures, grouped by model
+        objects = {}
+        for app_label, names in self.fixtures.items():
+            for name in names:
+                for deserialized in self.read_fixture(app_label, name):
+                    model = type(deserialized.object)
+                    objects.setdefault(model, []).append(deserialized)
+
+        # Insert or update the objects (by primary key), in a single transaction
+        with transaction.atomic():
+            for model in self.sort_models(list(objects.keys())):
+                model_start = perf_counter()
+                self.upsert_objects(model, objects[model])
+                self.stdout.write(
+                    f"{model._meta.label}: {len(objects[model])} objects "
+                    f"in {perf_counter() - model_start:.3f} seconds"
+                )
+
+            # Update the ids sequences (postgres)
+            sequences_sql = connection.ops.sequence_reset_sql(
+                no_style(), list(objects.keys())
+            )
+            if sequences_sql:
+                with connection.cursor() as cursor:
+                    for sql in sequences_sql:
+                        cursor.execute(sql)
+
+        # Bulk create doesn't send signals: invalidate the cached api data
+        # and admin filters choices, as the models signals do
+        clear_api_namespaces()
+        clear_filter_choices()
+
+        self.stdout.write(f"Data loaded in {perf_counter() - start:.3f} seconds")
+
+    def read_fixture(self, app_label: str, name: str) -> list:
+        """ Read and deserialize a fixture file
+
+        Args:
+            app_label (str): app of the fixture
+            name (str): fixture name, without extension
+
+        Returns:
+            list[DeserializedObject]: fixture objects
+        """
+
+        app_path = apps.get_app_config(app_label).path
+        path = os.path.join(app_path, "fixtures", app_label, f"{name}.json")
+        try:
+            with open(path, encoding="utf-8") as file:
+                return list(serializers.deserialize("json", file.read()))
+        except (OSError, serializers.base.DeserializationError) as error:
+            raise CommandError(f"Error loading fixture {app_label}/{name}: {error}")
+
+    def sort_models(self, models: list) -> list:
+        """ Sort the models to create the related models first
+
+        Args:
+            models (list): models to sort
+
+        Returns:
+            list: sorted models
+        """
+
+        sorted_models = []
+        pending = list(models)
+        while pending:
+            for model in pending:
+                dependencies = [
+                    field.related_model for field in model._meta.concrete_fields
+                    if field.is_relation and field.related_model in pending
+                    and field.related_model is not model
+                ]
+                if not dependencies:
+                    break
+            else:
+                raise CommandError(
+                    f"Circular dependency between the fixtures of {pending}"
+                )
+            pending.remove(model)
+            sorted_models.append(model)
+        return sorted_models
+
+    def upsert_objects(self, model, objects: list):
+        """ Create the objects, or update them if they already exist
+
+        Args:
+            model (Model): model of the objects
+            objects (list[DeserializedObject]): objects to save
+        """
+
+        # Keep the derived fields (like the images renditions), and update
+        # the modification dates (used by the conditional responses)
+        update_fields = [
+            field.name for field in model._meta.concrete_fields
+            if not field.primary_key
+            and (field.editable or getattr(field, "auto_now", False))
+        ]
+        instances = [deserialized.object for deserialized in objects]
+        if update_fields:
+            # MySQL updates on any unique conflict, without target fields
+            unique_fields = None
+            if connection.features.supports_update_conflicts_with_target:
+                unique_fields = [model._meta.pk.name]
+            model.objects.bulk_create(
+                instances,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=update_fields,
+            )
+        else:
+            model.objects.bulk_create(instances, ignore_conflicts=True)
+
+        # Many to many relations
+        for deserialized in objects:
+            for field_name, values in (deserialized.m2m_data or {}).items():
+                getattr(deserialized.object, field_name).set(values)
@@ -0,0 +1,174 @@
+import json
+from contextlib import contextmanager
+from datetime import datetime
+from statistics import mean, quantiles
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.template.response import SimpleTemplateResponse
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from utils.benchmark import compare_results, get_commit, temporary_user
+
+
+class Command(BaseCommand):
+    help = 'Measure the response time, template render time and queries ' \
+        'of the admin pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Requests to each page',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=3,
+            help='Requests to each page before measuring',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default='',
+            help='Json file to save the results',
+        )
+        parser.add_argument(
+            '--compare',
+            type=str,
+            default='',
+            help='Json file with previous results to compare',
+        )
+
+    def handle(self, *args, **kwargs):
+
+        if kwargs['requests'] < 2:
+            raise CommandError('At least 2 requests are required')
+
+        # Temporary benchmark admin, deleted at the end
+        with temporary_user(is_staff=True, is_superuser=True) as (user, _):
+            self.run_benchmark(user, kwargs)
+
+    def run_benchmark(self, user, kwargs: dict):
+        """ Measure the admin pages with the benchmark admin
+
+        Args:
+            user (User): benchmark admin
+            kwargs (dict): command options
+        """
+
+        self.client = Client()
+        self.client.force_login(user)
+
+        # Pages to measure: name, path
+        pages = [
+            ("index", "/admin/"),
+            ("posts list", "/admin/blog/post/"),
+            ("post add", "/admin/blog/post/add/"),
+        ]
+        post = Post.objects.order_by("id").first()
+        if post:
+            pages.append(("post change", f"/admin/blog/post/{post.id}/change/"))
+
+        results = {
+            "commit": get_commit(),
+            "date": datetime.now().isoformat(),
+            "requests": kwargs['requests'],
+            "pages": {},
+        }
+        for name, path in pages:
+            for _ in range(kwargs['warmup']):
+                self.client.get(path)
+
+            results["pages"][name] = self.measure_page(path, kwargs['requests'])
+            self.write_result(name, results["pages"][name])
+
+        if kwargs['output']:
+            with open(kwargs['output'], "w") as file:
+                json.dump(results, file, indent=4)
+            self.stdout.write(f"\nResults saved in {kwargs['output']}")
+
+        if kwargs['compare']:
+            compare_results(self.stdout, kwargs['compare'], results, "pages", [
+                "p50_ms", "p95_ms", "mean_ms", "render_p50_ms", "queries_per_request"
+            ])
+
+    def measure_page(self, path: str, requests: int) -> dict:
+        """ Measure the render time and queries of an admin page
+
+        Args:
+            path (str): page path
+            requests (int): requests to send
+
+        Returns:
+            dict: page results
+        """
+
+        latencies = []
+        render_times = []
+        queries = []
+        status_codes = {}
+        for _ in range(requests):
+            with CaptureQueriesContext(connection) as context, \
+                    self.measure_render() as render_time:
+                start = perf_counter()
+                response = self.client.get(path)
+                latencies.append((perf_counter() - start) * 1000)
+            render_times.append(render_time["ms"])
+            queries.append(len(context.captured_queries))
+            status_code = str(response.status_code)
+            status_codes[status_code] = status_codes.get(status_code, 0) + 1
+
+        percentiles = quantiles(latencies, n=100)
+        return {
+            "p50_ms": round(percentiles[49], 3),
+            "p95_ms": round(percentiles[94], 3),
+            "mean_ms": round(mean(latencies), 3),
+            "render_p50_ms": round(quantiles(render_times, n=100)[49], 3),
+            "queries_per_request": round(mean(queries), 2),
+            "status_codes": status_codes,
+        }
+
+    @contextmanager
+    def measure_render(self):
+        """ Measure the time rendering the templates of the responses
+
+        Yields:
+            dict: render time in "ms" (set when the context exits)
+        """
+
+        render_time = {"ms": 0}
+        render = SimpleTemplateResponse.render
+
+        def timed_render(response):
+            start = perf_counter()
+            try:
+                return render(response)
+            finally:
+                render_time["ms"] += (perf_counter() - start) * 1000
+
+        SimpleTemplateResponse.render = timed_render
+        try:
+            yield render_time
+        finally:
+            SimpleTemplateResponse.render = render
+
+    def write_result(self, name: str, result: dict):
+        """ Show the results of a page
+
+        Args:
+            name (str): page name
+            result (dict): page results
+        """
+
+        self.stdout.write(
+            f"{name}: p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, "
+            f"mean {result['mean_ms']} ms, "
+            f"render p50 {result['render_p50_ms']} ms, "
+            f"{result['queries_per_request']} queries, "
+            f"status {result['status_codes']}"
+        )
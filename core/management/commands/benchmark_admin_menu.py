@@ -0,0 +1,159 @@
+from statistics import mean, quantiles
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from jazzmin.settings import get_settings
+from jazzmin.templatetags.jazzmin import build_side_menu
+from jazzmin.utils import get_view_permissions, make_menu, order_with_respect_to
+
+
+class Command(BaseCommand):
+    help = 'Measure the jazzmin menu functions with many apps, models ' \
+        'and custom links (large admin installations)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--apps',
+            type=int,
+            default=20,
+            help='Apps in the menu',
+        )
+        parser.add_argument(
+            '--models',
+            type=int,
+            default=20,
+            help='Models of each app',
+        )
+        parser.add_argument(
+            '--links',
+            type=int,
+            default=200,
+            help='Custom links (with permissions)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=200,
+            help='Calls to each function',
+        )
+
+    def handle(self, *args, **kwargs):
+
+        if kwargs['iterations'] < 2:
+            raise CommandError('At least 2 iterations are required')
+
+        available_apps = self.get_available_apps(kwargs['apps'], kwargs['models'])
+        models = [model for app in available_apps for model in app["models"]]
+        permissions = {
+            f"{app['app_label']}.{action}_{model['object_name'].lower()}"
+            for app in available_apps for model in app["models"]
+            for action in ["view", "change", "add"]
+        }
+        links = [
+            {
+                "name": f"Link {index}",
+                "url": f"https://example.com/{index}/",
+                "permissions": [f"app{index % kwargs['apps']}.view_model{index}"],
+            }
+            for index in range(kwargs['links'])
+        ]
+
+        # Reverse order of all the models, links and apps
+        ordering = [model["model_str"] for model in reversed(models)]
+        ordering += [link["name"] for link in reversed(links)]
+        ordering += [app["app_label"] for app in reversed(available_apps)]
+
+        self.stdout.write(
+            f"{len(available_apps)} apps, {len(models)} models, "
+            f"{len(links)} custom links, {len(permissions)} permissions"
+        )
+
+        def get_user() -> User:
+            # New user in each call, like in each request
+            user = User(id=1, username="benchmark", is_active=True, is_staff=True)
+            user._perm_cache = permissions
+            return user
+
+        jazzmin_settings = {
+            **getattr(settings, "JAZZMIN_SETTINGS", {}),
+            "order_with_respect_to": ordering,
+            "custom_links": {available_apps[0]["app_label"]: links},
+        }
+        with override_settings(JAZZMIN_SETTINGS=jazzmin_settings):
+            options = get_settings()
+            functions = [
+                (
+                    "order_with_respect_to",
+                    lambda: order_with_respect_to(
+                        models, ordering, getter=lambda x: x["model_str"]
+                    ),
+                ),
+                ("get_view_permissions", lambda: get_view_permissions(get_user())),
+                ("make_menu", lambda: make_menu(get_user(), links, options)),
+                ("build_side_menu", lambda: build_side_menu(get_user(), available_apps)),
+            ]
+            for name, function in functions:
+                result = self.measure_function(function, kwargs['iterations'])
+                self.stdout.write(
+                    f"{name}: p50 {result['p50_us']} us, "
+                    f"mean {result['mean_us']} us"
+                )
+
+    def get_available_apps(self, apps: int, models: int) -> list[dict]:
+        """ Create the apps list of the admin context (available_apps)
+
+        Args:
+            apps (int): apps to create
+            models (int): models of each app
+
+        Returns:
+            list[dict]: apps with their models
+        """
+
+        return [
+            {
+                "name": f"App {app_index}",
+                "app_label": f"app{app_index}",
+                "app_url": f"/admin/app{app_index}/",
+                "has_module_perms": True,
+                "models": [
+                    {
+                        "name": f"Models {model_index}",
+                        "object_name": f"Model{model_index}",
+                        "model_str": f"app{app_index}.model{model_index}",
+                        "perms": {"add": True, "change": True, "delete": True, "view": True},
+                        "admin_url": f"/admin/app{app_index}/model{model_index}/",
+                        "add_url": f"/admin/app{app_index}/model{model_index}/add/",
+                        "view_only": False,
+                    }
+                    for model_index in range(models)
+                ],
+            }
+            for app_index in range(apps)
+        ]
+
+    def measure_function(self, function, iterations: int) -> dict:
+        """ Call the function and measure the time of each call
+
+        Args:
+            function (callable): function without arguments
+            iterations (int): calls to the function
+
+        Returns:
+            dict: p50 and mean time (microseconds)
+        """
+
+        times = []
+        for _ in range(iterations):
+            start = perf_counter()
+            function()
+            times.append((perf_counter() - start) * 1000000)
+
+        return {
+            "p50_us": round(quantiles(times, n=100)[49], 1),
+            "mean_us": round(mean(times), 1),
+        }
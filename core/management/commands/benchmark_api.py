@@ -0,0 +1,190 @@
+import json
+import tracemalloc
+from datetime import datetime
+from statistics import mean, quantiles
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from utils.benchmark import compare_results, get_commit, temporary_user
+from utils.cache import clear_api_namespaces
+
+
+class Command(BaseCommand):
+    help = 'Measure latency, queries and memory allocations of the api endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Requests to each endpoint',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=10,
+            help='Requests to each endpoint before measuring',
+        )
+        parser.add_argument(
+            '--clear-cache',
+            action='store_true',
+            help='Invalidate the cached api data before each request',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default='',
+            help='Json file to save the results',
+        )
+        parser.add_argument(
+            '--compare',
+            type=str,
+            default='',
+            help='Json file with previous results to compare',
+        )
+
+    def handle(self, *args, **kwargs):
+
+        if kwargs['requests'] < 2:
+            raise CommandError('At least 2 requests are required')
+
+        # Temporary benchmark user with a random password, deleted at the end
+        with temporary_user() as (_, credentials):
+            self.run_benchmark(credentials, kwargs)
+
+    def run_benchmark(self, credentials: dict, kwargs: dict):
+        """ Measure the endpoints with the benchmark user
+
+        Args:
+            credentials (dict): username and password of the benchmark user
+            kwargs (dict): command options
+        """
+
+        self.client = APIClient()
+        response = self.client.post("/api/token/", credentials)
+        access_token = response.data["data"]["access"]
+
+        # Endpoints to measure: name, method, path, data
+        endpoints = [
+            ("posts", "get", "/api/posts/", None),
+            ("posts summary", "get", "/api/posts/?summary=true", None),
+            ("random post", "get", "/api/random-post/", None),
+            ("token", "post", "/api/token/", credentials),
+        ]
+
+        results = {
+            "commit": get_commit(),
+            "date": datetime.now().isoformat(),
+            "requests": kwargs['requests'],
+            "clear_cache": kwargs['clear_cache'],
+            "endpoints": {},
+        }
+        for name, method, path, data in endpoints:
+            if method == "post":
+                self.client.credentials()
+            else:
+                self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+            request = (method, path, data, kwargs['clear_cache'])
+            for _ in range(kwargs['warmup']):
+                self.send_request(*request)
+
+            results["endpoints"][name] = self.measure_endpoint(
+                request, kwargs['requests']
+            )
+            self.write_result(name, results["endpoints"][name])
+
+        if kwargs['output']:
+            with open(kwargs['output'], "w") as file:
+                json.dump(results, file, indent=4)
+            self.stdout.write(f"\nResults saved in {kwargs['output']}")
+
+        if kwargs['compare']:
+            compare_results(self.stdout, kwargs['compare'], results, "endpoints", [
+                "p50_ms", "p95_ms", "p99_ms", "queries_per_request"
+            ])
+
+    def send_request(self, method: str, path: str, data: dict, clear_cache: bool):
+        """ Send a request to the endpoint
+
+        Args:
+            method (str): http method (get or post)
+            path (str): endpoint path
+            data (dict): request data
+            clear_cache (bool): invalidate the cached api data before the request
+
+        Returns:
+            Response: endpoint response
+        """
+
+        if clear_cache:
+            clear_api_namespaces()
+        return getattr(self.client, method)(path, data)
+
+    def measure_endpoint(self, request: tuple, requests: int) -> dict:
+        """ Measure the latency, queries and allocations of an endpoint.
+        Allocations are measured apart, tracing memory slows the requests
+
+        Args:
+            request (tuple): method, path, data and clear_cache
+            requests (int): requests to send
+
+        Returns:
+            dict: endpoint results
+        """
+
+        latencies = []
+        queries = []
+        status_codes = {}
+        for _ in range(requests):
+            with CaptureQueriesContext(connection) as context:
+                start = perf_counter()
+                response = self.send_request(*request)
+                latencies.append((perf_counter() - start) * 1000)
+            queries.append(len(context.captured_queries))
+            status_code = str(response.status_code)
+            status_codes[status_code] = status_codes.get(status_code, 0) + 1
+
+        allocated = []
+        peaks = []
+        tracemalloc.start()
+        for _ in range(max(requests // 10, 1)):
+            tracemalloc.reset_peak()
+            start_size, _ = tracemalloc.get_traced_memory()
+            self.send_request(*request)
+            size, peak = tracemalloc.get_traced_memory()
+            allocated.append((size - start_size) / 1024)
+            peaks.append((peak - start_size) / 1024)
+        tracemalloc.stop()
+
+        percentiles = quantiles(latencies, n=100)
+        return {
+            "p50_ms": round(percentiles[49], 3),
+            "p95_ms": round(percentiles[94], 3),
+            "p99_ms": round(percentiles[98], 3),
+            "mean_ms": round(mean(latencies), 3),
+            "queries_per_request": round(mean(queries), 2),
+            "retained_kb_per_request": round(mean(allocated), 2),
+            "peak_kb_per_request": round(mean(peaks), 2),
+            "status_codes": status_codes,
+        }
+
+    def write_result(self, name: str, result: dict):
+        """ Show the results of an endpoint
+
+        Args:
+            name (str): endpoint name
+            result (dict): endpoint results
+        """
+
+        self.stdout.write(
+            f"{name}: p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, "
+            f"p99 {result['p99_ms']} ms, "
+            f"{result['queries_per_request']} queries, "
+            f"{result['peak_kb_per_request']} KB peak, "
+            f"status {result['status_codes']}"
+        )
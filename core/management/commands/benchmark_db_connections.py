@@ -0,0 +1,82 @@
+from statistics import mean
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = 'Measure the database connection setup time per request'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Simulated requests with each configuration',
+        )
+
+    def handle(self, *args, **kwargs):
+
+        if kwargs['requests'] < 1:
+            raise CommandError('At least 1 request is required')
+
+        conn_max_age = connection.settings_dict['CONN_MAX_AGE']
+        self.stdout.write(
+            f"Database: {connection.vendor}, "
+            f"CONN_MAX_AGE: {conn_max_age}, "
+            f"CONN_HEALTH_CHECKS: {connection.settings_dict['CONN_HEALTH_CHECKS']}"
+        )
+
+        # New connection in each request (Django default) and current settings
+        configurations = [
+            ("before (CONN_MAX_AGE=0)", 0),
+            (f"after (CONN_MAX_AGE={conn_max_age})", conn_max_age),
+        ]
+        try:
+            for name, max_age in configurations:
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+                result = self.measure_requests(kwargs['requests'])
+                self.stdout.write(
+                    f"{name}: {result['connections']} connections opened, "
+                    f"setup {result['mean_ms']:.3f} ms per request (mean), "
+                    f"{result['total_ms']:.3f} ms total"
+                )
+        finally:
+            connection.close()
+            connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+
+    def measure_requests(self, requests: int) -> dict:
+        """ Simulate requests (with the request signals, that close or reuse
+        the connections) and measure the connection setup time
+
+        Args:
+            requests (int): requests to simulate
+
+        Returns:
+            dict: connections opened, mean and total setup time (ms)
+        """
+
+        connections = 0
+        setup_times = []
+        for _ in range(requests):
+            request_started.send(sender=self.__class__)
+
+            is_new = connection.connection is None
+            start = perf_counter()
+            connection.ensure_connection()
+            setup_times.append((perf_counter() - start) * 1000)
+            connections += int(is_new)
+
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+
+            request_finished.send(sender=self.__class__)
+
+        return {
+            "connections": connections,
+            "mean_ms": mean(setup_times),
+            "total_ms": sum(setup_times),
+        }
@@ -0,0 +1,206 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from statistics import quantiles
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.serializers import CustomTokenObtainPairSerializer
+from utils.benchmark import temporary_user
+
+
+class Command(BaseCommand):
+    help = 'Compare the throughput of the sync (wsgi) and async (asgi) ' \
+        'deployments with concurrent slow clients'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clients',
+            type=int,
+            default=50,
+            help='Concurrent clients',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=4,
+            help='Requests of each client',
+        )
+        parser.add_argument(
+            '--delay',
+            type=float,
+            default=0.1,
+            help='Seconds each client waits while sending the request headers',
+        )
+        parser.add_argument(
+            '--path',
+            type=str,
+            default='/api/groups/',
+            help='Endpoint to request',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=0,
+            help='Gunicorn workers (default: calculated from the cpus)',
+        )
+        parser.add_argument(
+            '--port',
+            type=int,
+            default=8765,
+        )
+
+    def handle(self, *args, **kwargs):
+
+        # Temporary benchmark user, deleted at the end
+        with temporary_user() as (user, _):
+            token = CustomTokenObtainPairSerializer.get_token(user).access_token
+            self.compare_servers(str(token), kwargs)
+
+    def compare_servers(self, token: str, kwargs: dict):
+        """ Measure the sync and async deployments
+
+        Args:
+            token (str): access token of the benchmark user
+            kwargs (dict): command options
+        """
+
+        for mode in ["wsgi", "asgi"]:
+            server = self.start_server(mode, kwargs['port'], kwargs['workers'])
+            try:
+                result = self.measure_server(
+                    kwargs['port'],
+                    kwargs['path'],
+                    token,
+                    kwargs['clients'],
+                    kwargs['requests'],
+                    kwargs['delay'],
+                )
+            finally:
+                server.terminate()
+                server.wait()
+
+            self.stdout.write(
+                f"{mode}: {result['requests_per_second']:.1f} requests/s, "
+                f"p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms, "
+                f"errors {result['errors']}"
+            )
+
+    def start_server(self, mode: str, port: int, workers: int) -> subprocess.Popen:
+        """ Start gunicorn in the mode and wait until it accepts connections
+
+        Args:
+            mode (str): server mode (wsgi or asgi)
+            port (int): local port
+            workers (int): gunicorn workers (0 to use the config default)
+
+        Returns:
+            subprocess.Popen: server process
+        """
+
+        env = {**os.environ, "SERVER_MODE": mode}
+        command = [
+            sys.executable, "-m", "gunicorn",
+            "--config", os.path.join(settings.BASE_DIR, "project", "gunicorn.conf.py"),
+            "--bind", f"127.0.0.1:{port}",
+            "--log-level", "warning",
+        ]
+        if workers:
+            command += ["--workers", str(workers)]
+        server = subprocess.Popen(command, env=env, cwd=settings.BASE_DIR)
+
+        for _ in range(100):
+            if server.poll() is not None:
+                raise CommandError(f"The {mode} server didn't start")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return server
+            except OSError:
+                time.sleep(0.1)
+
+        server.terminate()
+        raise CommandError(f"The {mode} server didn't accept connections")
+
+    def measure_server(
+        self,
+        port: int,
+        path: str,
+        token: str,
+        clients: int,
+        requests: int,
+        delay: float,
+    ) -> dict:
+        """ Send the requests from concurrent slow clients
+
+        Args:
+            port (int): server port
+            path (str): endpoint to request
+            token (str): access token
+            clients (int): concurrent clients
+            requests (int): requests of each client
+            delay (float): seconds to wait while sending the headers
+
+        Returns:
+            dict: requests per second, latency percentiles (ms) and errors
+        """
+
+        def run_client(_):
+            latencies = []
+            for _ in range(requests):
+                latencies.append(self.send_slow_request(port, path, token, delay))
+            return latencies
+
+        start = perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            results = list(executor.map(run_client, range(clients)))
+        duration = perf_counter() - start
+
+        latencies = [latency for result in results for latency in result]
+        completed = [latency for latency in latencies if latency is not None]
+        percentiles = quantiles(completed, n=100) if len(completed) > 1 else [0] * 99
+        return {
+            "requests_per_second": len(completed) / duration,
+            "p50_ms": percentiles[49],
+            "p95_ms": percentiles[94],
+            "errors": len(latencies) - len(completed),
+        }
+
+    def send_slow_request(
+        self,
+        port: int,
+        path: str,
+        token: str,
+        delay: float
+    ) -> float | None:
+        """ Send a request in two parts (like a client in a slow network)
+        and read the whole response
+
+        Returns:
+            float | None: latency in ms, or None if the request failed
+        """
+
+        start = perf_counter()
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=60) as client:
+                client.sendall(
+                    f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n".encode()
+                )
+                time.sleep(delay)
+                client.sendall(
+                    f"Authorization: Bearer {token}\r\n"
+                    "Connection: close\r\n\r\n".encode()
+                )
+                response = b""
+                while chunk := client.recv(65536):
+                    response += chunk
+        except OSError:
+            return None
+
+        if not response.startswith(b"HTTP/1.1 200"):
+            return None
+        return (perf_counter() - start) * 1000
@@ -0,0 +1,25 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from core.blacklist import get_blacklist
+
+
+class Command(BaseCommand):
+    help = 'Delete the expired refresh tokens of the blacklist'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Tokens deleted in each query',
+        )
+
+    def handle(self, *args, **kwargs):
+        start = perf_counter()
+        removed = get_blacklist().compact(kwargs['batch_size'])
+        self.stdout.write(
+            f"Expired tokens deleted: {removed} "
+            f"in {perf_counter() - start:.2f} seconds"
+        )
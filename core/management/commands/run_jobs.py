@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core import jobs
+
+
+class Command(BaseCommand):
+    help = 'Run the background jobs (run more processes to add workers)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the pending jobs and exit',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2.0,
+            help='Seconds to wait when there are no jobs',
+        )
+
+    def handle(self, *args, **kwargs):
+        while True:
+            job = jobs.claim_job()
+            if job:
+                job_id = job.id
+                result = jobs.run_job(job)
+                self.stdout.write(f"Job {job_id} {job.name}: {result}")
+                continue
+
+            if kwargs['once']:
+                break
+
+            # Don't keep broken or expired connections while waiting
+            close_old_connections()
+            time.sleep(kwargs['sleep'])
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlacklistedToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jti', models.CharField(max_length=255, unique=True, verbose_name='ID del token')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='Fecha de expiración')),
+            ],
+            options={
+                'verbose_name': 'Token bloqueado',
+                'verbose_name_plural': 'Tokens bloqueados',
+            },
+        ),
+    ]
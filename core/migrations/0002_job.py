@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 14:53
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Nombre')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Datos')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('running', 'En proceso'), ('failed', 'Fallido')], default='pending', max_length=10, verbose_name='Estado')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Intentos')),
+                ('max_attempts', models.PositiveIntegerField(default=3, verbose_name='Máximo de intentos')),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Ejecutar desde')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='Último error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+            ],
+            options={
+                'verbose_name': 'Tarea',
+                'verbose_name_plural': 'Tareas',
+                'indexes': [models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedUser',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.IntegerField(unique=True, verbose_name='ID del usuario')),
+                ('revoked_at', models.DateTimeField(db_index=True, verbose_name='Fecha de revocación')),
+            ],
+            options={
+                'verbose_name': 'Usuario revocado',
+                'verbose_name_plural': 'Usuarios revocados',
+            },
+        ),
+    ]
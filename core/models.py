@@ -1,3 +1,112 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class BlacklistedToken(models.Model):
+    """ Refresh tokens rejected until they expire (rotated tokens) """
+    
+    jti = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name='ID del token'
+    )
+    expires_at = models.DateTimeField(
+        db_index=True,
+        verbose_name='Fecha de expiración'
+    )
+    
+    def __str__(self):
+        return self.jti
+    
+    class Meta:
+        verbose_name = 'Token bloqueado'
+        verbose_name_plural = 'Tokens bloqueados'
+
+
+class RevokedUser(models.Model):
+    """ Users whose tokens issued before 'revoked_at' are rejected
+    (deactivated, deleted or with new permissions). Shared by all the
+    processes, each one reads them again every few seconds """
+    
+    user_id = models.IntegerField(
+        unique=True,
+        verbose_name='ID del usuario'
+    )
+    revoked_at = models.DateTimeField(
+        db_index=True,
+        verbose_name='Fecha de revocación'
+    )
+    
+    def __str__(self):
+        return str(self.user_id)
+    
+    class Meta:
+        verbose_name = 'Usuario revocado'
+        verbose_name_plural = 'Usuarios revocados'
+
+
+class Job(models.Model):
+    """ Background task, run by the 'run_jobs' command.
+    Successful jobs are deleted, failed jobs are kept to review the error """
+    
+    STATUSES = (
+        ('pending', 'Pendiente'),
+        ('running', 'En proceso'),
+        ('failed', 'Fallido'),
+    )
+    
+    name = models.CharField(
+        max_length=100,
+        verbose_name='Nombre'
+    )
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Datos'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default='pending',
+        verbose_name='Estado'
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Intentos'
+    )
+    max_attempts = models.PositiveIntegerField(
+        default=3,
+        verbose_name='Máximo de intentos'
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Ejecutar desde'
+    )
+    last_error = models.TextField(
+        default='',
+        blank=True,
+        verbose_name='Último error'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Fecha de creación'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Fecha de actualización'
+    )
+    
+    def __str__(self):
+        return f"{self.name} ({self.id})"
+    
+    @property
+    def is_last_attempt(self) -> bool:
+        return self.attempts >= self.max_attempts
+    
+    class Meta:
+        verbose_name = 'Tarea'
+        verbose_name_plural = 'Tareas'
+        indexes = [
+            # Next jobs to run
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+        ]
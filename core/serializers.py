@@ -1,10 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import Throttled
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
 from rest_framework_simplejwt.serializers import (
     TokenObtainPairSerializer,
     TokenRefreshSerializer
 )
+from rest_framework_simplejwt.settings import api_settings
+
+from core.authentication import is_token_revoked
+from core.blacklist import BlacklistFullError, get_blacklist
+from utils.admin import get_user_roles, is_user_admin
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        cls.set_user_claims(token, user)
+        return token
+    
+    @classmethod
+    def set_user_claims(cls, token, user):
+        """ Set the user data read by StatelessJWTAuthentication
+        (copied to the access tokens)
+        
+        Args:
+            token (Token): refresh or access token
+            user (User): user of the token
+        """
+        
+        token["username"] = user.get_username()
+        token["is_active"] = user.is_active
+        token["is_staff"] = user.is_staff
+        token["is_superuser"] = user.is_superuser
+        token["roles"] = sorted(get_user_roles(user))
+        token["is_admin"] = is_user_admin(user)
+    
     def validate(self, attrs):
         data = super().validate(attrs)  # Call the parent method to generate tokens
 
@@ -18,7 +51,45 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
 class CustomTokenRefreshSerializer(TokenRefreshSerializer):
     def validate(self, attrs):
-        data = super().validate(attrs)  # Call the parent method to generate tokens
+        
+        refresh = self.token_class(attrs["refresh"])
+        
+        # Reject refresh tokens issued before the user was revoked
+        # (their claims can be outdated)
+        if is_token_revoked(refresh):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"],
+                "no_active_account",
+            )
+        
+        # Reject rotated refresh tokens
+        blacklist = get_blacklist()
+        if blacklist.is_blacklisted(refresh[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+        
+        # Read the user again, instead of copying the claims of the old token
+        user = get_user_model().objects.filter(**{
+            api_settings.USER_ID_FIELD: refresh.get(api_settings.USER_ID_CLAIM)
+        }).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"],
+                "no_active_account",
+            )
+        CustomTokenObtainPairSerializer.set_user_claims(refresh, user)
+        data = {"access": str(refresh.access_token)}
+        
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    blacklist.add(refresh[api_settings.JTI_CLAIM], refresh["exp"])
+                except BlacklistFullError:
+                    # Don't rotate tokens that can't be blacklisted
+                    raise Throttled(detail=_("Too many refreshed tokens, try again later"))
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
 
         # Customize the response structure
         return {
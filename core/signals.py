@@ -0,0 +1,65 @@
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from core.authentication import revoke_user
+from utils.admin import clear_user_roles
+
+
+@receiver(post_save, sender=User)
+def revoke_updated_user(sender, instance, update_fields=None, **kwargs):
+    """ Reject the tokens of the user when it changes, because their claims
+    (is_active, is_staff, is_superuser, roles) can be outdated """
+
+    # Last login is updated each time a token is generated
+    if update_fields and set(update_fields) == {"last_login"}:
+        return
+
+    if not kwargs.get("created"):
+        revoke_user(instance.id)
+        clear_user_roles()
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user(sender, instance, **kwargs):
+    """ Reject the tokens of the deleted user """
+    revoke_user(instance.id)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def update_users_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    """ Update the roles and reject the tokens of the users
+    added or removed from groups """
+
+    # Save the users of the group before removing them
+    if action == "pre_clear" and reverse:
+        instance.cleared_users_ids = list(instance.user_set.values_list("id", flat=True))
+        return
+
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+
+    if not reverse:
+        users_ids = [instance.id]
+    elif action == "post_clear":
+        users_ids = getattr(instance, "cleared_users_ids", [])
+    else:
+        users_ids = pk_set or []
+
+    clear_user_roles()
+    for user_id in users_ids:
+        revoke_user(user_id)
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def update_group_roles(sender, instance, **kwargs):
+    """ Update the roles and reject the tokens of the users of a group
+    renamed or deleted """
+
+    if kwargs.get("created"):
+        return
+
+    clear_user_roles()
+    for user_id in instance.user_set.values_list("id", flat=True):
+        revoke_user(user_id)
@@ -0,0 +1,90 @@
+class DirectUpload {
+
+  /**
+   * Upload the files of the direct upload inputs to the storage (s3)
+   * when they are selected, and send to the admin only the file key
+   */
+  constructor() {
+    this.csrfToken = document.querySelector("[name=csrfmiddlewaretoken]")?.value
+    this.pendingUploads = 0
+
+    // Direct upload inputs
+    const inputs = document.querySelectorAll("input[type=file][data-upload-url]")
+    inputs.forEach(input => {
+      input.addEventListener("change", () => this.upload(input))
+    })
+
+    // Wait for the uploads before submitting
+    inputs.forEach(input => {
+      input.form?.addEventListener("submit", event => {
+        if (this.pendingUploads) {
+          event.preventDefault()
+          alert("Espera a que terminen de subir los archivos")
+        }
+      })
+    })
+  }
+
+  /**
+   * Upload the selected file of the input
+   *
+   * @param {HTMLInputElement} input - The file input
+   */
+  async upload(input) {
+    const file = input.files[0]
+    const keyInput = input.form.querySelector(`input[name="${input.name}_key"]`)
+    keyInput.value = ""
+    if (!file) {
+      return
+    }
+
+    this.pendingUploads += 1
+    try {
+      // Get the presigned post of the file
+      const fieldName = input.name.split("-").pop()
+      const presignResponse = await fetch(input.dataset.uploadUrl, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+          "X-CSRFToken": this.csrfToken,
+        },
+        body: JSON.stringify({
+          field: fieldName,
+          filename: file.name,
+        }),
+      })
+      if (!presignResponse.ok) {
+        throw new Error(`Presign error ${presignResponse.status}`)
+      }
+      const presign = await presignResponse.json()
+
+      // Upload the file to the storage (the file must be the last field)
+      const formData = new FormData()
+      Object.entries(presign.fields).forEach(([name, value]) => {
+        formData.append(name, value)
+      })
+      formData.append("file", file)
+      const uploadResponse = await fetch(presign.url, {
+        method: "POST",
+        body: formData,
+      })
+      if (!uploadResponse.ok) {
+        throw new Error(`Upload error ${uploadResponse.status}`)
+      }
+
+      // Send only the key to the admin
+      keyInput.value = presign.token
+      input.value = ""
+      input.required = false
+    } catch (error) {
+      // The file is sent to the admin as usual
+      console.error("Direct upload failed:", error)
+    } finally {
+      this.pendingUploads -= 1
+    }
+  }
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+  new DirectUpload()
+})
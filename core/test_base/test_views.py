@@ -1,17 +1,36 @@
 import os
+import shutil
+import tempfile
 
 from django.contrib.auth.models import User
 from django.core.management import call_command
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from rest_framework.test import APITestCase
-from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework import status
 
 
 from blog import models
+from core.authentication import clear_revoked_users
+from core.serializers import CustomTokenObtainPairSerializer
+from utils.cache import cache_access_counts, get_api_cache
 
 
-class BlogTestCase(APITestCase):
+class TemporaryMediaMixin:
+    """ Save the uploaded files and the images renditions of each test
+    in a temporary MEDIA_ROOT, removed after the test """
+    
+    def setUp(self, *args, **kwargs):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        
+        super().setUp(*args, **kwargs)
+
+
+class BlogTestCase(TemporaryMediaMixin, APITestCase):
     
     @classmethod
     def setUpTestData(cls):
@@ -21,10 +40,16 @@ class BlogTestCase(APITestCase):
         call_command("apps_loaddata")
     
     def setUp(self, endpoint="/api/"):
+        super().setUp()
+        
+        # Clear cached responses, cache stats and revoked users
+        get_api_cache().clear()
+        cache_access_counts.clear()
+        clear_revoked_users()
         
         # Create admin user and login to client
         self.admin_user, self.admin_pass, self.user = self.create_admin_user()
-        self.token = str(AccessToken.for_user(self.user))
+        self.token = self.get_access_token(self.user)
         self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
         
         # Update endpoint
@@ -59,6 +84,19 @@ class BlogTestCase(APITestCase):
         
         return user.username, password, user
 
+    def get_access_token(self, user: User) -> str:
+        """ Generate an access token with the claims of the user
+
+        Args:
+            user (User): user to login
+
+        Returns:
+            str: access token
+        """
+        
+        token = CustomTokenObtainPairSerializer.get_token(user)
+        return str(token.access_token)
+
     def create_post(
         self,
         title: str,
@@ -132,6 +170,23 @@ class BlogTestCase(APITestCase):
         
         return post
     
+    def validate_query_count(self, endpoint: str, queries: int):
+        """ Validate the number of queries executed to render the endpoint
+
+        Args:
+            endpoint (str): endpoint to request with get
+            queries (int): expected number of queries
+            
+        Returns:
+            Response: response of the endpoint
+        """
+        
+        with self.assertNumQueries(queries):
+            response = self.client.get(endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        return response
+    
     def validate_invalid_method(self, method: str):
         """ Validate that the given method is not allowed on the endpoint """
         
@@ -0,0 +1,285 @@
+import json
+import os
+from datetime import timedelta
+from io import StringIO
+from tempfile import TemporaryDirectory
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from blog.models import Category, Duration, Group, Link
+from core import jobs
+from core.models import BlacklistedToken, Job
+from utils.cache import API_NAMESPACES, get_api_cache, get_namespace_version
+from utils.changelist import get_choices_version
+
+
+class BenchmarkApiTestCase(TestCase):
+    
+    def test_results_file(self):
+        """ Test that the results are saved and compared in json files """
+        
+        with TemporaryDirectory() as folder:
+            output = os.path.join(folder, "results.json")
+            call_command(
+                "benchmark_api",
+                requests=2,
+                warmup=0,
+                output=output,
+                stdout=StringIO(),
+            )
+            
+            # Validate results
+            with open(output) as file:
+                results = json.load(file)
+            self.assertEqual(
+                list(results["endpoints"].keys()),
+                ["posts", "posts summary", "random post", "token"]
+            )
+            for result in results["endpoints"].values():
+                self.assertEqual(result["status_codes"], {"200": 2})
+                for metric in ["p50_ms", "p95_ms", "p99_ms", "queries_per_request"]:
+                    self.assertIn(metric, result)
+            
+            # Validate comparison
+            stdout = StringIO()
+            call_command(
+                "benchmark_api",
+                requests=2,
+                warmup=0,
+                compare=output,
+                stdout=stdout,
+            )
+            self.assertIn("Compared with", stdout.getvalue())
+            
+            # Validate that the benchmark user is deleted
+            self.assertFalse(User.objects.filter(username__startswith="benchmark").exists())
+
+
+class CompactTokenBlacklistTestCase(TestCase):
+    
+    def test_delete_expired_tokens(self):
+        """ Test that only the expired tokens are deleted, in batches """
+        
+        now = timezone.now()
+        BlacklistedToken.objects.bulk_create([
+            BlacklistedToken(jti=f"expired-{index}", expires_at=now - timedelta(days=1))
+            for index in range(5)
+        ] + [
+            BlacklistedToken(jti="valid", expires_at=now + timedelta(days=1))
+        ])
+        
+        stdout = StringIO()
+        call_command("compact_token_blacklist", batch_size=2, stdout=stdout)
+        
+        self.assertIn("Expired tokens deleted: 5", stdout.getvalue())
+        self.assertEqual(
+            list(BlacklistedToken.objects.values_list("jti", flat=True)),
+            ["valid"]
+        )
+
+
+class AppsLoaddataTestCase(TestCase):
+    
+    def test_load_fixtures(self):
+        """ Test that all the fixtures are loaded, with timings """
+        
+        stdout = StringIO()
+        call_command("apps_loaddata", stdout=stdout)
+        
+        self.assertTrue(Group.objects.exists())
+        self.assertTrue(Category.objects.exists())
+        self.assertTrue(Link.objects.exists())
+        self.assertTrue(Duration.objects.exists())
+        self.assertIn("blog.Group:", stdout.getvalue())
+        self.assertIn("Data loaded in", stdout.getvalue())
+        
+    def test_idempotent(self):
+        """ Test that loading the fixtures again updates the objects
+        instead of duplicating them """
+        
+        call_command("apps_loaddata", stdout=StringIO())
+        groups = Group.objects.count()
+        group = Group.objects.first()
+        name = group.name
+        group.name = "Group updated"
+        group.save()
+        
+        call_command("apps_loaddata", stdout=StringIO())
+        self.assertEqual(Group.objects.count(), groups)
+        group.refresh_from_db()
+        self.assertEqual(group.name, name)
+        
+    def test_keep_renditions(self):
+        """ Test that loading the fixtures again keeps the renditions of the icons """
+        
+        call_command("apps_loaddata", stdout=StringIO())
+        renditions = {"source": "icons/icon-a.png", "webp": {}}
+        Group.objects.update(icon_renditions=renditions, icon_renditions_status="done")
+        
+        call_command("apps_loaddata", stdout=StringIO())
+        group = Group.objects.first()
+        self.assertEqual(group.icon_renditions, renditions)
+        self.assertEqual(group.icon_renditions_status, "done")
+
+        
+    def test_clear_filter_choices(self):
+        """ Test that the cached admin filters choices are invalidated """
+        
+        version = get_choices_version()
+        call_command("apps_loaddata", stdout=StringIO())
+        self.assertNotEqual(get_choices_version(), version)
+        
+    def test_clear_api_cache(self):
+        """ Test that only the api namespaces are invalidated (the other
+        data in the cache is kept) """
+        
+        versions = [get_namespace_version(namespace) for namespace in API_NAMESPACES]
+        get_api_cache().set("other", 1)
+        call_command("apps_loaddata", stdout=StringIO())
+        
+        for namespace, version in zip(API_NAMESPACES, versions):
+            self.assertNotEqual(get_namespace_version(namespace), version)
+        self.assertEqual(get_api_cache().get("other"), 1)
+
+class BenchmarkDbConnectionsTestCase(TestCase):
+    
+    def test_configurations(self):
+        """ Test that the connections are measured without and with reuse """
+        
+        stdout = StringIO()
+        call_command("benchmark_db_connections", requests=3, stdout=stdout)
+        
+        output = stdout.getvalue()
+        self.assertIn("CONN_MAX_AGE", output)
+        self.assertIn("before (CONN_MAX_AGE=0)", output)
+        self.assertIn("after (CONN_MAX_AGE=", output)
+        self.assertIn("ms per request", output)
+
+
+class RunJobsTestCase(TestCase):
+    
+    def setUp(self):
+        self.calls = []
+        
+        @jobs.register("test_job")
+        def test_job(job):
+            self.calls.append(job.payload)
+            if job.payload.get("fail"):
+                raise ValueError("Job failed")
+        
+        self.addCleanup(jobs.handlers.pop, "test_job")
+    
+    def test_done(self):
+        """ Test that the successful jobs are deleted """
+        
+        jobs.enqueue("test_job", value=1)
+        stdout = StringIO()
+        call_command("run_jobs", once=True, stdout=stdout)
+        
+        self.assertEqual(self.calls, [{"value": 1}])
+        self.assertIn("test_job: done", stdout.getvalue())
+        self.assertFalse(Job.objects.exists())
+        
+    def test_retry(self):
+        """ Test that the failed jobs are retried later, until max attempts """
+        
+        job = jobs.enqueue("test_job", max_attempts=2, fail=True)
+        stdout = StringIO()
+        call_command("run_jobs", once=True, stdout=stdout)
+        
+        # Validate retry with backoff
+        self.assertIn("test_job: retry", stdout.getvalue())
+        job.refresh_from_db()
+        self.assertEqual(job.status, "pending")
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("Job failed", job.last_error)
+        
+        # Validate that it's not run before the retry date
+        call_command("run_jobs", once=True, stdout=StringIO())
+        self.assertEqual(len(self.calls), 1)
+        
+        # Validate failed after the last attempt
+        Job.objects.filter(id=job.id).update(run_at=timezone.now())
+        stdout = StringIO()
+        call_command("run_jobs", once=True, stdout=stdout)
+        self.assertIn("test_job: failed", stdout.getvalue())
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.attempts, 2)
+        
+    def test_claim_stale_job(self):
+        """ Test that the running jobs of stopped workers are claimed again """
+        
+        job = jobs.enqueue("test_job")
+        self.assertEqual(jobs.claim_job().id, job.id)
+        self.assertIsNone(jobs.claim_job())
+        
+        Job.objects.filter(id=job.id).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+        claimed = jobs.claim_job()
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual(claimed.attempts, 2)
+
+
+class BenchmarkAdminTestCase(TestCase):
+    
+    def test_results_file(self):
+        """ Test that the admin pages are measured and compared """
+        
+        with TemporaryDirectory() as folder:
+            output = os.path.join(folder, "results.json")
+            call_command(
+                "benchmark_admin",
+                requests=2,
+                warmup=0,
+                output=output,
+                stdout=StringIO(),
+            )
+            
+            # Validate results
+            with open(output) as file:
+                results = json.load(file)
+            for result in results["pages"].values():
+                self.assertEqual(result["status_codes"], {"200": 2})
+                self.assertGreater(result["render_p50_ms"], 0)
+            
+            # Validate comparison
+            stdout = StringIO()
+            call_command(
+                "benchmark_admin",
+                requests=2,
+                warmup=0,
+                compare=output,
+                stdout=stdout,
+            )
+            self.assertIn("index: p50_ms", stdout.getvalue())
+            self.assertIn("render_p50_ms", stdout.getvalue())
+            
+            # Validate that the benchmark admin is deleted
+            self.assertFalse(User.objects.filter(username__startswith="benchmark").exists())
+
+
+class BenchmarkAdminMenuTestCase(TestCase):
+    
+    def test_functions(self):
+        """ Test that the menu functions are measured """
+        
+        stdout = StringIO()
+        call_command(
+            "benchmark_admin_menu",
+            apps=3,
+            models=4,
+            links=5,
+            iterations=2,
+            stdout=stdout,
+        )
+        
+        output = stdout.getvalue()
+        self.assertIn("3 apps, 12 models, 5 custom links", output)
+        for name in ["order_with_respect_to", "get_view_permissions", "make_menu"]:
+            self.assertIn(f"{name}: p50", output)
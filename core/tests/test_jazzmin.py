@@ -0,0 +1,322 @@
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.template import Context, engines
+from django.template.loaders.cached import Loader as CachedLoader
+from django.test import RequestFactory, TestCase, override_settings
+
+from jazzmin.cache import CACHE_PERMISSIONS_VERSION_KEY, clear_menus, get_permissions_version
+from jazzmin.finders import JazzminAppDirectoriesFinder
+from jazzmin.settings import THEMES, get_settings, get_ui_tweaks
+from jazzmin.templatetags.jazzmin import (
+    as_json, get_fragment_cache, get_jazzmin_settings, get_side_menu
+)
+from jazzmin.utils import get_positions, get_view_permissions, make_menu, order_with_respect_to
+
+
+class JazzminSettingsTestCase(TestCase):
+    
+    def test_memoized(self):
+        """ Test that the settings are computed once """
+        
+        self.assertIs(get_settings(), get_settings())
+        self.assertIs(get_ui_tweaks(), get_ui_tweaks())
+        
+    def test_immutable(self):
+        """ Test that the shared settings can not be modified """
+        
+        settings = get_settings()
+        with self.assertRaises(TypeError):
+            settings["site_title"] = "Title"
+        with self.assertRaises(TypeError):
+            settings["icons"]["auth"] = "fas fa-users"
+        self.assertIsInstance(settings["hide_apps"], tuple)
+        
+        # Validate that the template tag returns a copy with the defaults
+        jazzmin_settings = get_jazzmin_settings(None)
+        self.assertTrue(jazzmin_settings["site_header"])
+        self.assertIsNot(jazzmin_settings, settings)
+        
+        # Validate json of the raw tweaks (ui builder)
+        self.assertIn('"theme"', as_json(get_ui_tweaks()["raw"]))
+        
+    def test_setting_changed(self):
+        """ Test that the settings are computed again when they change """
+        
+        settings = get_settings()
+        with override_settings(JAZZMIN_SETTINGS={"site_title": "Other title"}):
+            self.assertEqual(get_settings()["site_title"], "Other title")
+        self.assertEqual(get_settings()["site_title"], settings["site_title"])
+        
+        with override_settings(JAZZMIN_UI_TWEAKS={"theme": "darkly"}):
+            self.assertEqual(get_ui_tweaks()["theme"]["name"], "darkly")
+        
+    def test_admin_page(self):
+        """ Test that the admin pages render with the memoized settings """
+        
+        user = User.objects.create_superuser(username="admin", password="admin")
+        self.client.force_login(user)
+        
+        for path in ["/admin/", "/admin/blog/post/", "/admin/blog/post/add/"]:
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+
+
+class JazzminSideMenuTestCase(TestCase):
+    
+    def setUp(self):
+        # Discard menus of previous tests
+        clear_menus()
+        
+        self.user = User.objects.create_user(username="staff", is_staff=True)
+        self.add_permission(self.user.user_permissions, "view_post")
+        
+    def add_permission(self, permissions, codename: str):
+        """ Add a blog permission to the user or group permissions """
+        permissions.add(
+            Permission.objects.get(content_type__app_label="blog", codename=codename)
+        )
+        
+    def get_menu(self) -> list:
+        """ Render the side menu of the user (loaded again, with its permissions) """
+        
+        request = RequestFactory().get("/admin/")
+        request.user = User.objects.get(id=self.user.id)
+        context = Context({
+            "user": request.user,
+            "request": request,
+            "available_apps": admin.site.get_app_list(request),
+        })
+        return get_side_menu(context)
+        
+    def get_models(self, menu: list) -> list:
+        """ Get the models names of the menu """
+        return [model["model_str"] for app in menu for model in app["models"]]
+        
+    def test_cached_menu(self):
+        """ Test that the menu is built once """
+        
+        menu = self.get_menu()
+        self.assertEqual(self.get_models(menu), ["blog.post"])
+        self.assertIs(self.get_menu(), menu)
+        
+        # Validate login (last login updated)
+        self.user.save(update_fields=["last_login"])
+        self.assertIs(self.get_menu(), menu)
+        
+    def test_menu_expired(self):
+        """ Test that the menu is built again after its timeout """
+        
+        with patch("jazzmin.cache.MENUS_TIMEOUT", -1):
+            expired_menu = self.get_menu()
+        menu = self.get_menu()
+        self.assertIsNot(menu, expired_menu)
+        self.assertIs(self.get_menu(), menu)
+        
+    def test_permissions_changed(self):
+        """ Test that the menu is updated when the user permissions change """
+        
+        self.get_menu()
+        self.add_permission(self.user.user_permissions, "view_group")
+        self.assertEqual(self.get_models(self.get_menu()), ["blog.group", "blog.post"])
+        
+        self.user.user_permissions.clear()
+        self.assertEqual(self.get_menu(), [])
+        
+    def test_culled_version(self):
+        """ Test that the versions of the old menus and fragments are not
+        used again when the version is removed from the cache """
+        
+        old_version = get_permissions_version()
+        clear_menus()
+        cache.delete(CACHE_PERMISSIONS_VERSION_KEY)
+        self.assertNotEqual(get_permissions_version(), old_version)
+        
+    def test_groups_changed(self):
+        """ Test that the menu is updated when the user groups or the groups
+        permissions change """
+        
+        group = Group.objects.create(name="editors")
+        self.user.groups.add(group)
+        self.assertEqual(self.get_models(self.get_menu()), ["blog.post"])
+        
+        # Validate group permissions
+        self.add_permission(group.permissions, "view_category")
+        self.assertEqual(
+            self.get_models(self.get_menu()), ["blog.category", "blog.post"]
+        )
+        
+        # Validate removed from the group
+        group.user_set.remove(self.user)
+        self.assertEqual(self.get_models(self.get_menu()), ["blog.post"])
+        
+    def test_menu_ordering(self):
+        """ Test that the apps and models are sorted with the settings ordering """
+        
+        self.add_permission(self.user.user_permissions, "view_group")
+        self.add_permission(self.user.user_permissions, "view_category")
+        jazzmin_settings = {
+            **settings.JAZZMIN_SETTINGS,
+            "order_with_respect_to": ["Blog.Post", "blog.category"],
+        }
+        with override_settings(JAZZMIN_SETTINGS=jazzmin_settings):
+            self.assertEqual(
+                self.get_models(self.get_menu()),
+                ["blog.post", "blog.category", "blog.group"],
+            )
+        
+    def test_superuser_changed(self):
+        """ Test that the menu is updated when the user becomes superuser """
+        
+        self.get_menu()
+        self.user.is_superuser = True
+        self.user.save()
+        self.assertIn("auth.user", self.get_models(self.get_menu()))
+
+
+class JazzminFragmentCacheTestCase(TestCase):
+    
+    def setUp(self):
+        # Discard fragments of previous tests
+        clear_menus()
+        
+        self.user = User.objects.create_user(username="staff", is_staff=True)
+        self.add_permission("view_post")
+        self.client.force_login(self.user)
+        
+    def add_permission(self, codename: str):
+        """ Add a blog permission to the user """
+        self.user.user_permissions.add(
+            Permission.objects.get(content_type__app_label="blog", codename=codename)
+        )
+        
+    def get_sidebar_key(self) -> str:
+        """ Get the cache key of the sidebar fragment of the user """
+        
+        request = RequestFactory().get("/admin/")
+        request.user = self.user
+        fragment_cache = get_fragment_cache(Context({"user": self.user, "request": request}))
+        return make_template_fragment_key("jazzmin_sidebar", [fragment_cache["user_key"]])
+        
+    def test_cached_sidebar(self):
+        """ Test that the sidebar is rendered once and reused in the next pages """
+        
+        response = self.client.get("/admin/")
+        self.assertContains(response, "/admin/blog/post/")
+        self.assertIn('id="jazzy-sidebar"', cache.get(self.get_sidebar_key()))
+        
+        # Validate that the stored fragment is rendered
+        cache.set(self.get_sidebar_key(), "<aside>cached sidebar</aside>")
+        response = self.client.get("/admin/blog/post/")
+        self.assertContains(response, "cached sidebar")
+        self.assertNotContains(response, 'id="jazzy-sidebar"')
+        
+    def test_permissions_changed(self):
+        """ Test that the fragments are rendered again when the permissions change """
+        
+        self.client.get("/admin/")
+        sidebar_key = self.get_sidebar_key()
+        self.add_permission("view_category")
+        self.assertNotEqual(self.get_sidebar_key(), sidebar_key)
+        
+        response = self.client.get("/admin/")
+        self.assertContains(response, "/admin/blog/category/")
+        
+    def test_settings_changed(self):
+        """ Test that the fragments are rendered again when the settings change """
+        
+        self.client.get("/admin/")
+        jazzmin_settings = {**settings.JAZZMIN_SETTINGS, "site_brand": "Other brand"}
+        with override_settings(JAZZMIN_SETTINGS=jazzmin_settings):
+            response = self.client.get("/admin/")
+            self.assertContains(response, "Other brand")
+        
+    def test_cached_loader(self):
+        """ Test that the compiled templates are cached """
+        
+        loaders = engines["django"].engine.template_loaders
+        self.assertIsInstance(loaders[0], CachedLoader)
+
+
+class JazzminFindersTestCase(TestCase):
+    
+    def get_themes(self) -> set:
+        """ Get the bootswatch themes listed for collectstatic """
+        
+        themes = set()
+        for path, _ in JazzminAppDirectoriesFinder().list([]):
+            parts = path.replace("\\", "/").split("/")
+            if parts[:2] == ["vendor", "bootswatch"]:
+                themes.add(parts[2])
+        return themes
+        
+    def test_unused_themes(self):
+        """ Test that only the themes of the ui tweaks are collected """
+        
+        with override_settings(JAZZMIN_UI_TWEAKS={"theme": "flatly"}):
+            self.assertEqual(self.get_themes(), {"flatly"})
+        
+        ui_tweaks = {"theme": "flatly", "dark_mode_theme": "darkly"}
+        with override_settings(JAZZMIN_UI_TWEAKS=ui_tweaks):
+            self.assertEqual(self.get_themes(), {"flatly", "darkly"})
+        
+    def test_ui_builder(self):
+        """ Test that all the themes are collected for the ui builder """
+        
+        jazzmin_settings = {**settings.JAZZMIN_SETTINGS, "show_ui_builder": True}
+        with override_settings(JAZZMIN_SETTINGS=jazzmin_settings):
+            self.assertEqual(self.get_themes(), set(THEMES))
+
+
+class JazzminUtilsTestCase(TestCase):
+    
+    def test_order_with_respect_to(self):
+        """ Test the order of the referenced items, and the missing items last """
+        
+        original = ["a", "b", "c", "d"]
+        reference = ["c", "x", "y", "z", "a", "c"]
+        self.assertEqual(order_with_respect_to(original, reference), ["c", "a", "b", "d"])
+        
+        # Validate precomputed positions and getter
+        positions = get_positions(reference)
+        self.assertEqual(positions, {"c": 0, "x": 1, "y": 2, "z": 3, "a": 4})
+        items = [{"name": name} for name in original]
+        self.assertEqual(
+            order_with_respect_to(items, positions, getter=lambda x: x["name"]),
+            [{"name": "c"}, {"name": "a"}, {"name": "b"}, {"name": "d"}],
+        )
+        
+    def test_view_permissions(self):
+        """ Test that the models with view permission are computed once per user """
+        
+        user = User.objects.create_user(username="staff", is_staff=True)
+        user.user_permissions.add(*Permission.objects.filter(
+            content_type__app_label="blog", codename__in=["view_post", "add_group"]
+        ))
+        
+        with self.assertNumQueries(2):
+            self.assertEqual(get_view_permissions(user), {"blog.post"})
+            self.assertIs(get_view_permissions(user), get_view_permissions(user))
+        
+    def test_make_menu_permissions(self):
+        """ Test that the links require all their permissions """
+        
+        user = User.objects.create_user(username="staff", is_staff=True)
+        user.user_permissions.add(
+            Permission.objects.get(content_type__app_label="blog", codename="view_post")
+        )
+        links = [
+            {"name": "Posts", "url": "/posts/", "permissions": ["blog.view_post"]},
+            {
+                "name": "Groups",
+                "url": "/groups/",
+                "permissions": ["blog.view_post", "blog.view_group"],
+            },
+            {"name": "Public", "url": "/public/"},
+        ]
+        menu = make_menu(user, links, get_settings())
+        self.assertEqual([link["name"] for link in menu], ["Posts", "Public"])
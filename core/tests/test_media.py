@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.core.files.storage import FileSystemStorage
+from django.test import RequestFactory, TestCase, override_settings
+
+from blog.serializers import MediaUrlField
+from utils import media
+from utils.media import clear_media_urls, get_media_url, get_storage_url
+
+
+class MediaUrlsTestCase(TestCase):
+    
+    def setUp(self):
+        # Discard urls of previous tests
+        clear_media_urls()
+        
+        self.storage = FileSystemStorage(location="/tmp/media", base_url="/media/")
+        
+    @override_settings(HOST="http://testserver", MEDIA_CDN_DOMAIN="")
+    def test_local_url(self):
+        """ Test that the local urls are joined to the host """
+        
+        self.assertEqual(
+            get_storage_url("images/a.png", self.storage),
+            "/media/images/a.png",
+        )
+        self.assertEqual(
+            get_media_url("/media/images/a.png"),
+            "http://testserver/media/images/a.png",
+        )
+        self.assertEqual(
+            get_media_url("https://bucket.s3.amazonaws.com/media/a.png"),
+            "https://bucket.s3.amazonaws.com/media/a.png",
+        )
+        
+    @override_settings(HOST="http://testserver", MEDIA_CDN_DOMAIN="cdn.example.com")
+    def test_cdn_url(self):
+        """ Test that the domain is replaced with the cdn domain """
+        
+        self.assertEqual(
+            get_storage_url("images/a.png", self.storage),
+            "https://cdn.example.com/media/images/a.png",
+        )
+        self.assertEqual(
+            get_media_url("http://bucket.s3.amazonaws.com/media/a.png"),
+            "http://cdn.example.com/media/a.png",
+        )
+        
+    @override_settings(HOST="http://host.example.com", MEDIA_CDN_DOMAIN="")
+    def test_request_url(self):
+        """ Test that the serializers join the local urls to the request
+        host, and to the HOST only without request """
+        
+        field = MediaUrlField(read_only=True)
+        value = SimpleNamespace(name="images/a.png", storage=self.storage)
+        
+        field._context = {"request": RequestFactory().get("/", HTTP_HOST="proxy.example.com")}
+        self.assertEqual(
+            field.to_representation(value), "http://proxy.example.com/media/images/a.png"
+        )
+        field._context = {}
+        self.assertEqual(
+            field.to_representation(value), "http://host.example.com/media/images/a.png"
+        )
+        
+    @patch.object(media, "MAX_STORED_URLS", 2)
+    def test_least_recently_used(self):
+        """ Test that only the least recently used url is removed """
+        
+        get_storage_url("images/a.png", self.storage)
+        get_storage_url("images/b.png", self.storage)
+        get_storage_url("images/a.png", self.storage)
+        get_storage_url("images/c.png", self.storage)
+        
+        names = [key[-1] for key in media.media_urls_store]
+        self.assertEqual(names, ["images/a.png", "images/c.png"])
+        
+    def test_memoized_url(self):
+        """ Test that the storage builds the url of each file only once """
+        
+        with patch.object(self.storage, "url", wraps=self.storage.url) as url:
+            first_url = get_storage_url("images/a.png", self.storage)
+            self.assertEqual(get_storage_url("images/a.png", self.storage), first_url)
+            get_storage_url("images/b.png", self.storage)
+        self.assertEqual(url.call_count, 2)
+        
+        # Validate other storage location
+        other_storage = FileSystemStorage(location="/tmp/other", base_url="/other/")
+        self.assertIn("/other/images/a.png", get_storage_url("images/a.png", other_storage))
+        
+    def test_signed_url(self):
+        """ Test that the signed urls (they expire) are not memoized """
+        
+        signed_url = "https://bucket.s3.amazonaws.com/private/a.png?Signature=1"
+        with patch.object(self.storage, "url", return_value=signed_url) as url:
+            get_storage_url("a.png", self.storage)
+            get_storage_url("a.png", self.storage)
+        self.assertEqual(url.call_count, 2)
+        
+    @override_settings(HOST="http://testserver", MEDIA_CDN_DOMAIN="")
+    def test_setting_changed(self):
+        """ Test that the urls are built again when the settings change """
+        
+        get_storage_url("images/a.png", self.storage)
+        with override_settings(MEDIA_CDN_DOMAIN="cdn.example.com"):
+            self.assertEqual(
+                get_storage_url("images/a.png", self.storage),
+                "https://cdn.example.com/media/images/a.png",
+            )
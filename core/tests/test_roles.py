@@ -0,0 +1,103 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework_simplejwt.models import TokenUser
+
+from core.serializers import CustomTokenObtainPairSerializer
+from utils.admin import (
+    CACHE_ROLES_VERSION_KEY,
+    clear_user_roles,
+    get_user_roles,
+    is_user_admin,
+)
+
+
+class UserRolesTestCase(TestCase):
+    
+    def setUp(self):
+        # Discard roles of previous tests
+        clear_user_roles()
+        
+        self.admins_group = Group.objects.create(name="admins")
+        self.user = User.objects.create_user(username="user", password="user")
+        
+    def test_roles(self):
+        """ Test the roles of regular, admin group and super users """
+        
+        self.assertEqual(get_user_roles(self.user), frozenset())
+        self.assertFalse(is_user_admin(self.user))
+        
+        self.user.groups.add(self.admins_group)
+        self.assertEqual(get_user_roles(self.user), {"admins"})
+        self.assertTrue(is_user_admin(self.user))
+        
+        superuser = User.objects.create_superuser(username="admin", password="admin")
+        self.assertEqual(get_user_roles(superuser), {"superuser"})
+        self.assertTrue(is_user_admin(superuser))
+        
+    def test_cached_roles(self):
+        """ Test that the roles are queried only once """
+        
+        with self.assertNumQueries(1):
+            is_user_admin(self.user)
+            is_user_admin(User(id=self.user.id))
+        
+    def test_roles_expired(self):
+        """ Test that the stored roles are read again after their timeout """
+        
+        with patch("utils.admin.ROLES_TIMEOUT", -1):
+            is_user_admin(self.user)
+        
+        # Validate stale roles (changed without invalidation) are replaced
+        self.user.groups.through.objects.bulk_create([
+            self.user.groups.through(user_id=self.user.id, group_id=self.admins_group.id)
+        ])
+        self.assertTrue(is_user_admin(self.user))
+        
+    def test_groups_changed(self):
+        """ Test that the roles are updated when the user groups change """
+        
+        self.assertFalse(is_user_admin(self.user))
+        
+        # Add user to the group
+        self.admins_group.user_set.add(self.user)
+        self.assertTrue(is_user_admin(self.user))
+        
+        # Remove all the users of the group
+        self.admins_group.user_set.clear()
+        self.assertFalse(is_user_admin(self.user))
+        
+    def test_culled_version(self):
+        """ Test that the old roles are not valid again when the version
+        is removed from the cache """
+        
+        self.user.groups.add(self.admins_group)
+        self.assertTrue(is_user_admin(self.user))
+        
+        self.user.groups.remove(self.admins_group)
+        cache.delete(CACHE_ROLES_VERSION_KEY)
+        self.assertFalse(is_user_admin(self.user))
+        
+    def test_group_renamed(self):
+        """ Test that the roles are updated when a group is renamed """
+        
+        self.user.groups.add(self.admins_group)
+        self.assertTrue(is_user_admin(self.user))
+        
+        self.admins_group.name = "editors"
+        self.admins_group.save()
+        self.assertFalse(is_user_admin(self.user))
+        
+    def test_token_roles(self):
+        """ Test that the roles of the token users are read from the claims """
+        
+        self.user.groups.add(self.admins_group)
+        token = CustomTokenObtainPairSerializer.get_token(self.user)
+        self.assertEqual(token["roles"], ["admins"])
+        self.assertTrue(token["is_admin"])
+        
+        token_user = TokenUser(token.access_token)
+        with self.assertNumQueries(0):
+            self.assertTrue(is_user_admin(token_user))
@@ -0,0 +1,273 @@
+import json
+from datetime import timedelta
+from io import BytesIO, StringIO
+
+from botocore.stub import Stubber
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.exceptions import ValidationError
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from blog import models
+from core.models import Job
+from core.test_base.test_views import TemporaryMediaMixin
+from project.storage_backends import PublicMediaStorage
+from utils.uploads import (
+    DirectUploadFormField,
+    create_presigned_post,
+    get_uploaded_file_info,
+)
+
+
+def get_image_content(image_format: str = "PNG") -> bytes:
+    """ Create a small image file """
+    
+    content = BytesIO()
+    Image.new("RGB", (10, 10)).save(content, image_format)
+    return content.getvalue()
+
+
+class DirectUploadTestCase(TemporaryMediaMixin, TestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.admin_user = User.objects.create_superuser(username="admin", password="admin")
+        self.client.force_login(self.admin_user)
+        self.endpoint = reverse("admin:blog_post_direct_upload")
+        
+    def get_form_field(self, model=models.Post, field_name="image") -> DirectUploadFormField:
+        """ Create the form field of the direct uploads of a model field """
+        return DirectUploadFormField(model_field=model._meta.get_field(field_name))
+        
+    def presign_group_icon(self) -> dict:
+        """ Request the presigned post of a group icon """
+        
+        self.endpoint = reverse("admin:blog_group_direct_upload")
+        return self.presign(field="icon")
+        
+    def presign(self, **data) -> dict:
+        """ Request the presigned post of a post image """
+        
+        data = {
+            "field": "image",
+            "filename": "test.png",
+            **data,
+        }
+        return self.client.post(
+            self.endpoint, json.dumps(data), content_type="application/json"
+        )
+        
+    def upload(self, presign: dict, content: bytes = None) -> int:
+        """ Upload a file to the local stand-in, and return the status code """
+        
+        if content is None:
+            content = get_image_content()
+        response = self.client.post(presign["url"], {
+            **presign["fields"],
+            "file": SimpleUploadedFile("test.png", content, "image/png"),
+        })
+        return response.status_code
+        
+    def test_direct_upload(self):
+        """ Test that the file is uploaded to the storage, and the form
+        receives only its name """
+        
+        response = self.presign()
+        self.assertEqual(response.status_code, 200)
+        presign = response.json()
+        key = presign["fields"]["key"]
+        self.assertTrue(key.startswith("images/test_"))
+        self.assertEqual(presign["fields"]["Content-Type"], "image/png")
+        
+        # Validate upload
+        self.assertEqual(self.upload(presign), 204)
+        self.assertTrue(default_storage.exists(key))
+        
+        # Validate form field
+        form_field = self.get_form_field()
+        self.assertEqual(form_field.clean(presign["token"]), key)
+        
+    def test_invalid_presign(self):
+        """ Test that only the direct upload fields and images are presigned """
+        
+        self.assertEqual(self.presign(field="title").status_code, 400)
+        self.assertEqual(self.presign(filename="test.exe").status_code, 400)
+        self.assertEqual(self.presign(filename="test.svg").status_code, 400)
+        
+        # Validate content type from the extension (not from the client)
+        presign = self.presign(content_type="image/svg+xml").json()
+        self.assertEqual(presign["fields"]["Content-Type"], "image/png")
+        
+        # Validate permissions
+        self.client.force_login(User.objects.create_user(username="user", is_staff=True))
+        self.assertEqual(self.presign().status_code, 403)
+        
+    def test_invalid_upload(self):
+        """ Test that the local uploads must match the signed policy """
+        
+        presign = self.presign().json()
+        
+        # Validate other key
+        presign["fields"]["key"] = "images/other.png"
+        self.assertEqual(self.upload(presign), 403)
+        self.assertFalse(default_storage.exists("images/other.png"))
+        
+        # Validate empty file
+        presign = self.presign().json()
+        self.assertEqual(self.upload(presign, b""), 400)
+        
+    def test_other_field_token(self):
+        """ Test that the form rejects the keys signed for other fields """
+        
+        presign = self.presign().json()
+        self.upload(presign)
+        with self.assertRaises(ValidationError):
+            self.get_form_field(models.Group, "icon").clean(presign["token"])
+        self.assertEqual(self.get_form_field().clean(presign["token"]), presign["fields"]["key"])
+        
+    def test_invalid_token(self):
+        """ Test that the form rejects unsigned and not uploaded files """
+        
+        form_field = self.get_form_field()
+        with self.assertRaises(ValidationError):
+            form_field.clean("images/test.png")
+        
+        # Validate not uploaded file
+        presign = self.presign().json()
+        with self.assertRaises(ValidationError):
+            form_field.clean(presign["token"])
+        
+    def test_invalid_image(self):
+        """ Test that the form accepts the uploaded files without downloading
+        them, and the renditions job removes the files that aren't images
+        of the extension format """
+        
+        for content in [b"<svg onload='alert(1)'></svg>", get_image_content("GIF")]:
+            presign = self.presign_group_icon().json()
+            self.upload(presign)
+            
+            # Replace the uploaded file (the form only reads its size and type)
+            key = presign["fields"]["key"]
+            default_storage.delete(key)
+            default_storage.save(key, SimpleUploadedFile("test.png", content))
+            group = self.save_admin_form(presign["token"])
+            self.assertEqual(group.icon_renditions_status, "pending")
+            
+            # Validate rejected file removed
+            call_command("run_jobs", once=True, stdout=StringIO())
+            group.refresh_from_db()
+            self.assertFalse(default_storage.exists(key))
+            self.assertEqual(group.icon.name, "")
+            self.assertEqual(group.icon_renditions_status, "failed")
+            
+    @override_settings(MEDIA_UPLOAD_MAX_SIZE=10)
+    def test_large_upload(self):
+        """ Test that the form rejects the files larger than the policy """
+        
+        presign = self.presign().json()
+        default_storage.save(
+            presign["fields"]["key"],
+            SimpleUploadedFile("test.png", get_image_content()),
+        )
+        with self.assertRaises(ValidationError):
+            self.get_form_field().clean(presign["token"])
+        self.assertFalse(default_storage.exists(presign["fields"]["key"]))
+        
+    def test_anonymous_upload(self):
+        """ Test that the local uploads require a staff session """
+        
+        presign = self.presign().json()
+        self.client.logout()
+        self.assertEqual(self.upload(presign), 403)
+        self.assertFalse(default_storage.exists(presign["fields"]["key"]))
+        
+    def test_unused_upload(self):
+        """ Test that the uploaded files are deleted if their form is not saved """
+        
+        unused_presign = self.presign_group_icon().json()
+        self.upload(unused_presign)
+        saved_presign = self.presign_group_icon().json()
+        self.upload(saved_presign)
+        self.save_admin_form(saved_presign["token"])
+        
+        # Run the cleanup jobs after the keys expire
+        Job.objects.filter(name="delete_unused_upload").update(
+            run_at=timezone.now() - timedelta(seconds=1)
+        )
+        call_command("run_jobs", once=True, stdout=StringIO())
+        self.assertFalse(default_storage.exists(unused_presign["fields"]["key"]))
+        self.assertTrue(default_storage.exists(saved_presign["fields"]["key"]))
+        
+    def save_admin_form(self, token: str) -> models.Group:
+        """ Save a group with an uploaded icon in the admin """
+        
+        request = RequestFactory().post("/")
+        request.user = self.admin_user
+        group_admin = admin.site._registry[models.Group]
+        form_class = group_admin.get_form(request, fields=["name", "icon"])
+        form = form_class(data={"name": "Group", "icon_key": token})
+        self.assertTrue(form.is_valid(), form.errors)
+        group = form.save(commit=False)
+        group_admin.save_model(request, group, form, False)
+        return group
+        
+    def test_admin_form(self):
+        """ Test that the admin form saves the uploaded file name """
+        
+        presign = self.presign_group_icon().json()
+        self.upload(presign)
+        
+        request = RequestFactory().get("/")
+        request.user = self.admin_user
+        group_admin = admin.site._registry[models.Group]
+        form_class = group_admin.get_form(request, fields=["name", "icon"])
+        form = form_class(data={"name": "Group", "icon_key": presign["token"]})
+        self.assertTrue(form.is_valid(), form.errors)
+        group = form.save()
+        self.assertEqual(group.icon.name, presign["fields"]["key"])
+        self.assertIn('name="icon_key"', str(form["icon"]))
+        
+    def test_s3_presigned_post(self):
+        """ Test the s3 presigned post (signed locally, without requests) """
+        
+        storage = PublicMediaStorage(
+            access_key="access",
+            secret_key="secret",
+            bucket_name="bucket",
+            region_name="us-east-1",
+        )
+        presign = create_presigned_post(storage, "images/test.png", "image/png")
+        
+        self.assertIn("bucket", presign["url"])
+        self.assertEqual(presign["fields"]["key"], "media/images/test.png")
+        self.assertEqual(presign["fields"]["acl"], "public-read")
+        self.assertIn("policy", presign["fields"])
+        
+    def test_s3_uploaded_file_info(self):
+        """ Test that the s3 uploads are validated with a HEAD request """
+        
+        storage = PublicMediaStorage(
+            access_key="access",
+            secret_key="secret",
+            bucket_name="bucket",
+            region_name="us-east-1",
+        )
+        client = storage.connection.meta.client
+        with Stubber(client) as stubber:
+            stubber.add_response(
+                "head_object",
+                {"ContentLength": 100, "ContentType": "image/png"},
+                {"Bucket": "bucket", "Key": "media/images/test.png"},
+            )
+            stubber.add_client_error("head_object", "404", http_status_code=404)
+            
+            self.assertEqual(
+                get_uploaded_file_info(storage, "images/test.png"), (100, "image/png")
+            )
+            self.assertIsNone(get_uploaded_file_info(storage, "images/other.png"))
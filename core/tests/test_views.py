@@ -1,6 +1,19 @@
-from rest_framework.test import APITestCase
+from datetime import timedelta
+from time import time
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIRequestFactory, APITestCase
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+from blog.views import AsyncGroupViewSet
+from core.authentication import clear_revoked_users, revoked_users_store
+from core.blacklist import BlacklistFullError, DatabaseBlacklist, MemoryBlacklist
+from core.models import BlacklistedToken, RevokedUser
+from core.serializers import CustomTokenObtainPairSerializer
 
 
 class CustomJWTViewTests(APITestCase):
@@ -93,4 +106,221 @@ class CustomJWTViewTests(APITestCase):
         self.assertEqual(response.data["status"], "error")
         self.assertEqual(response.data["message"], "El token es inválido o ha expirado")
         self.assertNotIn("access", response.data["data"])
-        self.assertNotIn("refresh", response.data["data"])
\ No newline at end of file
+        self.assertNotIn("refresh", response.data["data"])
+
+
+class StatelessJWTAuthenticationTests(APITestCase):
+    
+    def setUp(self):
+        # Clear revoked users
+        clear_revoked_users()
+        
+        # Create user and login
+        self.username = "testuser"
+        self.password = "testpassword"
+        self.user = User.objects.create_user(
+            username=self.username,
+            password=self.password
+        )
+        
+        # Tokens issued one second ago ("iat" resolution is seconds)
+        issued_at = timezone.now() - timedelta(seconds=1)
+        refresh = CustomTokenObtainPairSerializer.get_token(self.user)
+        refresh.set_iat(at_time=issued_at)
+        access = refresh.access_token
+        access.set_iat(at_time=issued_at)
+        self.access_token = str(access)
+        self.refresh_token = str(refresh)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        
+        self.endpoint = "/api/groups/"
+        
+    def test_token_claims(self):
+        """ Test that the user data is embedded in the token """
+        
+        response = self.client.post("/api/token/", {
+            "username": self.username,
+            "password": self.password
+        })
+        token = AccessToken(response.data["data"]["access"])
+        self.assertEqual(token["user_id"], self.user.id)
+        self.assertEqual(token["username"], self.username)
+        self.assertTrue(token["is_active"])
+        self.assertFalse(token["is_staff"])
+        self.assertFalse(token["is_superuser"])
+        self.assertFalse(token["is_admin"])
+        
+    def test_no_user_query(self):
+        """ Test that the user is not queried (cached response) """
+        
+        self.client.get(self.endpoint)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+    def test_inactive_user(self):
+        """ Test that the tokens are rejected after deactivating the user """
+        
+        self.user.is_active = False
+        self.user.save()
+        
+        response = self.client.get(self.endpoint)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+    def test_deleted_user(self):
+        """ Test that the tokens are rejected after deleting the user """
+        
+        self.user.delete()
+        
+        response = self.client.get(self.endpoint)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+    def test_refresh_updated_user(self):
+        """ Test that the refresh tokens with outdated claims are rejected """
+        
+        self.user.is_staff = True
+        self.user.save()
+        
+        response = self.client.post("/api/token/refresh/", {
+            "refresh": self.refresh_token
+        })
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+    def test_refresh_user_claims(self):
+        """ Test that the refreshed tokens read the claims from the user """
+        
+        # Token with outdated claims (not revoked)
+        refresh = CustomTokenObtainPairSerializer.get_token(self.user)
+        refresh["is_staff"] = True
+        refresh["is_admin"] = True
+        
+        response = self.client.post("/api/token/refresh/", {
+            "refresh": str(refresh)
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for token in ["access", "refresh"]:
+            claims = AccessToken(response.data["data"][token], verify=False)
+            self.assertFalse(claims["is_staff"])
+            self.assertFalse(claims["is_admin"])
+        
+    def test_revoked_in_other_process(self):
+        """ Test that the revocations are shared with the other processes """
+        
+        self.user.is_active = False
+        self.user.save()
+        self.assertTrue(RevokedUser.objects.filter(user_id=self.user.id).exists())
+        
+        # Process without the revocation in memory
+        revoked_users_store["synced_at"] = None
+        revoked_users_store["revoked_users"] = {}
+        response = self.client.get(self.endpoint)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+    def test_revoked_in_other_process_async(self):
+        """ Test that the async viewsets read the revocations of the other
+        processes from the database
+        """
+        
+        view = AsyncGroupViewSet.as_view({"get": "list"})
+        request_factory = APIRequestFactory()
+        
+        RevokedUser.objects.create(user_id=self.user.id, revoked_at=timezone.now())
+        revoked_users_store["synced_at"] = None
+        revoked_users_store["revoked_users"] = {}
+        request = request_factory.get(
+            self.endpoint, HTTP_AUTHORIZATION=f"Bearer {self.access_token}"
+        )
+        response = async_to_sync(view)(request)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        # Validate the next requests (already synchronized)
+        response = async_to_sync(view)(request_factory.get(
+            self.endpoint, HTTP_AUTHORIZATION=f"Bearer {self.access_token}"
+        ))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+    def test_refresh_rotated_token(self):
+        """ Test that the refresh tokens can't be used after the rotation """
+        
+        response = self.client.post("/api/token/refresh/", {
+            "refresh": self.refresh_token
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        new_refresh_token = response.data["data"]["refresh"]
+        
+        # Use the rotated token again
+        response = self.client.post("/api/token/refresh/", {
+            "refresh": self.refresh_token
+        })
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        jti = RefreshToken(self.refresh_token)["jti"]
+        self.assertTrue(BlacklistedToken.objects.filter(jti=jti).exists())
+        
+        # Use the new refresh token
+        response = self.client.post("/api/token/refresh/", {
+            "refresh": new_refresh_token
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+    def test_blacklist_stats(self):
+        """ Test the lookups metrics of the blacklist (admin users only) """
+        
+        response = self.client.get("/api/token/blacklist-stats/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        
+        # Login as admin
+        self.user.is_staff = True
+        self.user.save()
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        
+        response = self.client.get("/api/token/blacklist-stats/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()["data"]
+        for metric in ["lookups", "blacklisted", "mean_ms", "max_ms"]:
+            self.assertIn(metric, data)
+
+
+class TokenBlacklistTests(APITestCase):
+    
+    def test_memory_full(self):
+        """ Test that the memory blacklist never discards live tokens """
+        
+        blacklist = MemoryBlacklist(max_entries=2)
+        blacklist.add("expired", int(time()) - 1)
+        blacklist.add("first", int(time()) + 60)
+        
+        # Validate expired token removed
+        blacklist.add("second", int(time()) + 60)
+        self.assertEqual(set(blacklist.entries), {"first", "second"})
+        
+        # Validate live tokens kept
+        with self.assertRaises(BlacklistFullError):
+            blacklist.add("third", int(time()) + 60)
+        self.assertTrue(blacklist.contains("first"))
+        self.assertFalse(blacklist.contains("third"))
+        
+    def test_database_full(self):
+        """ Test that the database blacklist stores the tokens when its
+        memory is full """
+        
+        blacklist = DatabaseBlacklist(max_entries=1)
+        blacklist.add("first", int(time()) + 60)
+        blacklist.add("second", int(time()) + 60)
+        self.assertEqual(list(blacklist.entries), ["first"])
+        self.assertTrue(blacklist.contains("second"))
+        
+    def test_refresh_memory_full(self):
+        """ Test that the refresh tokens are not rotated when they can't
+        be blacklisted """
+        
+        user = User.objects.create_user(username="testuser", password="testpassword")
+        refresh_token = str(CustomTokenObtainPairSerializer.get_token(user))
+        
+        blacklist = MemoryBlacklist(max_entries=1)
+        blacklist.add("other", int(time()) + 60)
+        with patch("core.serializers.get_blacklist", return_value=blacklist):
+            response = self.client.post("/api/token/refresh/", {
+                "refresh": refresh_token
+            })
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
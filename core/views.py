@@ -1,11 +1,22 @@
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.http import HttpResponse, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView
 )
+from core.blacklist import get_blacklist
 from core.serializers import (
     CustomTokenObtainPairSerializer,
     CustomTokenRefreshSerializer
 )
+from utils.uploads import read_upload_policy
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
@@ -13,4 +24,42 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     
     
 class CustomTokenRefreshView(TokenRefreshView):
-    serializer_class = CustomTokenRefreshSerializer
\ No newline at end of file
+    serializer_class = CustomTokenRefreshSerializer
+
+
+class TokenBlacklistStatsView(APIView):
+    """ Lookups metrics of the refresh tokens blacklist (current process) """
+    
+    permission_classes = [permissions.IsAdminUser]
+    
+    def get(self, request):
+        return Response({
+            "status": "ok",
+            "message": "token blacklist stats",
+            "data": get_blacklist().get_metrics(),
+        })
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class DirectUploadView(View):
+    """ Local stand-in of the s3 presigned post uploads (local storage
+    and tests): receives the same form fields, signed by the admin.
+    Only the staff users can upload (the csrf token is not required,
+    like in s3: the signed policy can't be forged)
+    """
+    
+    def post(self, request):
+        if not request.user.is_active or not request.user.is_staff:
+            return JsonResponse({"error": "Staff session required"}, status=403)
+        
+        try:
+            policy = read_upload_policy(request.POST)
+        except ValidationError as error:
+            return JsonResponse({"error": error.messages}, status=403)
+        
+        file = request.FILES.get("file")
+        if not file or not 0 < file.size <= policy["max_size"]:
+            return JsonResponse({"error": "Invalid file size"}, status=400)
+        
+        default_storage.save(policy["key"], file)
+        return HttpResponse(status=204)
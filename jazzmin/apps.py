@@ -9,3 +9,7 @@ class JazzminConfig(AppConfig):
     name = "jazzmin"
     label = "jazzmin"
     verbose_name = "Jazzmin"
+
+    def ready(self) -> None:
+        # Discard the cached menus when the permissions change
+        from . import signals  # noqa: F401
@@ -0,0 +1,67 @@
+import uuid
+from time import monotonic
+from typing import Any, Callable, Hashable, List
+
+from django.core.cache import cache
+
+CACHE_PERMISSIONS_VERSION_KEY = "jazzmin:permissions:version"
+
+# Max menus stored in the process, and seconds to keep each menu
+MAX_STORED_MENUS = 1000
+MENUS_TIMEOUT = 600
+
+# Menus of the users stored in the process memory.
+# The version is kept in the default cache (shared by the workers with the
+# file or redis CACHE_BACKEND), to invalidate all the processes
+menus_store = {
+    "version": None,
+    "menus": {},
+}
+
+
+def new_version() -> str:
+    """
+    Create a permissions version that is never repeated: if the version key is culled
+    from the cache, the menus (and fragments) of the old versions are not valid again
+    """
+    return uuid.uuid4().hex
+
+
+def get_permissions_version() -> str:
+    """
+    Get the current version of the users permissions
+    """
+    return cache.get_or_set(CACHE_PERMISSIONS_VERSION_KEY, new_version, None)
+
+
+def get_cached_menu(key: Hashable, build: Callable[[], List[Any]]) -> List[Any]:
+    """
+    Get a menu stored in the process, or build and store it.
+    The key must include the user, the menu is discarded when the permissions change
+    or after MENUS_TIMEOUT seconds
+    """
+    version = get_permissions_version()
+    if menus_store["version"] != version:
+        menus_store["version"] = version
+        menus_store["menus"] = {}
+    stored_menus = menus_store["menus"]
+
+    expiration, menu = stored_menus.get(key, (0, None))
+    if menu is None or expiration < monotonic():
+        menu = build()
+        stored_menus.pop(key, None)
+        if len(stored_menus) >= MAX_STORED_MENUS:
+            # Discard the oldest menu
+            del stored_menus[next(iter(stored_menus))]
+        stored_menus[key] = (monotonic() + MENUS_TIMEOUT, menu)
+    return menu
+
+
+def clear_menus() -> None:
+    """
+    Invalidate the menus stored in all the processes
+    """
+    cache.set(CACHE_PERMISSIONS_VERSION_KEY, new_version(), None)
+
+    # Menus of the current process (the cache can be local)
+    menus_store["menus"] = {}
@@ -0,0 +1,20 @@
+from typing import Iterator, List, Optional, Tuple
+
+from django.contrib.staticfiles.finders import AppDirectoriesFinder
+from django.core.files.storage import Storage
+
+from .settings import THEMES, get_unused_themes
+
+
+class JazzminAppDirectoriesFinder(AppDirectoriesFinder):
+    """
+    App directories finder that leaves the unused bootswatch themes out of collectstatic,
+    so they are not fingerprinted, compressed and deployed
+    """
+
+    def list(self, ignore_patterns: Optional[List[str]]) -> Iterator[Tuple[str, Storage]]:
+        ignore_patterns = list(ignore_patterns or [])
+        for theme in get_unused_themes():
+            theme_folder = THEMES[theme].rsplit("/", 1)[0]
+            ignore_patterns.append("{}/*".format(theme_folder))
+        return super().list(ignore_patterns)
@@ -1,11 +1,18 @@
 import copy
+import hashlib
 import logging
-from typing import Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.templatetags.static import static
+from django.utils.translation import get_language
 
-from .utils import get_admin_url, get_model_meta
+from .cache import menus_store
+from .utils import get_admin_url, get_model_meta, get_positions
 
 logger = logging.getLogger(__name__)
 
@@ -96,6 +103,8 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
     "changeform_format_overrides": {},
     # Add a language dropdown into the admin
     "language_chooser": False,
+    # Seconds to cache the rendered navbar, sidebar and footer of each user (0 to disable)
+    "fragment_cache_timeout": 600,
 }
 
 #######################################
@@ -206,7 +215,30 @@ def get_search_model_string(search_model: str) -> str:
     return "{app}.{model_name}".format(app=app, model_name=model_name.lower())
 
 
-def get_settings() -> Dict:
+def freeze(value: Any) -> Any:
+    """
+    Return an immutable view of the value (dicts as mappings proxies and lists as tuples)
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({x: freeze(y) for x, y in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(x) for x in value)
+    return value
+
+
+def get_settings() -> Mapping:
+    """
+    Get the Jazzmin settings, computed once per process (and language, for the model names)
+    """
+    return _get_settings(get_language())
+
+
+@lru_cache(maxsize=None)
+def _get_settings(language: str) -> Mapping:
+    return freeze(build_settings())
+
+
+def build_settings() -> Dict:
     jazzmin_settings = copy.deepcopy(DEFAULT_SETTINGS)
     user_settings = {x: y for x, y in getattr(settings, "JAZZMIN_SETTINGS", {}).items() if y is not None}
     jazzmin_settings.update(user_settings)
@@ -237,6 +269,12 @@ def get_settings() -> Dict:
         jazzmin_settings["hide_models"] = [jazzmin_settings["hide_models"]]
     jazzmin_settings["hide_models"] = [x.lower() for x in jazzmin_settings["hide_models"]]
 
+    # Lower case the menu ordering, and precompute the positions of the models/links and the apps
+    ordering = [x.lower() for x in jazzmin_settings["order_with_respect_to"]]
+    jazzmin_settings["order_with_respect_to"] = ordering
+    jazzmin_settings["order_positions"] = get_positions(ordering)
+    jazzmin_settings["apps_order_positions"] = get_positions([x for x in ordering if "." not in x])
+
     # Ensure icon model names and classes are lower case
     jazzmin_settings["icons"] = {x.lower(): y.lower() for x, y in jazzmin_settings.get("icons", {}).items()}
 
@@ -257,7 +295,15 @@ def get_settings() -> Dict:
     return jazzmin_settings
 
 
-def get_ui_tweaks() -> Dict:
+@lru_cache(maxsize=None)
+def get_ui_tweaks() -> Mapping:
+    """
+    Get the Jazzmin UI tweaks, computed once per process
+    """
+    return freeze(build_ui_tweaks())
+
+
+def build_ui_tweaks() -> Dict:
     raw_tweaks = copy.deepcopy(DEFAULT_UI_TWEAKS)
     raw_tweaks.update(getattr(settings, "JAZZMIN_UI_TWEAKS", {}))
     tweaks = {x: y for x, y in raw_tweaks.items() if y not in (None, "", False)}
@@ -293,15 +339,7 @@ def get_ui_tweaks() -> Dict:
     def classes(*args: str) -> str:
         return " ".join([tweaks.get(arg, "") for arg in args]).strip()
 
-    theme = tweaks["theme"]
-    if theme not in THEMES:
-        logger.warning("{} not found in {}, using default".format(theme, THEMES.keys()))
-        theme = "default"
-
-    dark_mode_theme = tweaks.get("dark_mode_theme", None)
-    if dark_mode_theme and dark_mode_theme not in DARK_THEMES:
-        logger.warning("{} is not a dark theme, using darkly".format(dark_mode_theme))
-        dark_mode_theme = "darkly"
+    theme, dark_mode_theme = get_theme_names(tweaks)
 
     theme_body_classes = " theme-{}".format(theme)
     if theme in DARK_THEMES:
@@ -332,4 +370,71 @@ def get_ui_tweaks() -> Dict:
     if dark_mode_theme:
         ret["dark_mode_theme"] = {"name": dark_mode_theme, "src": static(THEMES[dark_mode_theme])}
 
-    return ret
\ No newline at end of file
+    return ret
+
+
+def get_theme_names(tweaks: Mapping) -> Tuple[str, Optional[str]]:
+    """
+    Get the theme and dark mode theme of the UI tweaks, with the defaults for unknown themes
+    """
+    theme = tweaks.get("theme") or "default"
+    if theme not in THEMES:
+        logger.warning("{} not found in {}, using default".format(theme, THEMES.keys()))
+        theme = "default"
+
+    dark_mode_theme = tweaks.get("dark_mode_theme", None)
+    if dark_mode_theme and dark_mode_theme not in DARK_THEMES:
+        logger.warning("{} is not a dark theme, using darkly".format(dark_mode_theme))
+        dark_mode_theme = "darkly"
+
+    return theme, dark_mode_theme
+
+
+def get_unused_themes() -> List[str]:
+    """
+    Get the bootswatch themes not used by the UI tweaks, to leave them out of the collected static files.
+    The UI builder can switch to any theme
+    """
+    if get_settings()["show_ui_builder"]:
+        return []
+
+    tweaks = {**DEFAULT_UI_TWEAKS, **getattr(settings, "JAZZMIN_UI_TWEAKS", {})}
+    used_themes = get_theme_names(tweaks)
+    return [theme for theme in THEMES if theme not in used_themes]
+
+
+@lru_cache(maxsize=None)
+def get_settings_version() -> str:
+    """
+    Get a hash of the settings and UI tweaks, to key the cached fragments of the templates
+    """
+    from . import version
+
+    values = (
+        version,
+        settings.STATIC_URL,
+        getattr(settings, "JAZZMIN_SETTINGS", {}),
+        getattr(settings, "JAZZMIN_UI_TWEAKS", {}),
+    )
+    return hashlib.md5(repr(values).encode()).hexdigest()[:12]
+
+
+def clear_settings_cache() -> None:
+    """
+    Discard the computed settings and UI tweaks
+    """
+    _get_settings.cache_clear()
+    get_ui_tweaks.cache_clear()
+    get_settings_version.cache_clear()
+
+    # The menus are built with the settings
+    menus_store["menus"] = {}
+
+
+@receiver(setting_changed)
+def clear_settings_cache_on_setting_changed(setting: str, **kwargs: Any) -> None:
+    """
+    Compute the settings again when they change (tests)
+    """
+    if setting.startswith("JAZZMIN") or setting in ("STATIC_URL", "STORAGES", "ROOT_URLCONF"):
+        clear_settings_cache()
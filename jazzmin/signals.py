@@ -0,0 +1,50 @@
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .cache import clear_menus
+
+User = get_user_model()
+
+
+def clear_menus_on_user_saved(sender: Any, update_fields: Any = None, **kwargs: Any) -> None:
+    """
+    Discard the menus when a user changes (is_superuser, is_staff, is_active), except on login
+    """
+    if update_fields and set(update_fields) == {"last_login"}:
+        return
+    if kwargs.get("created"):
+        return
+    clear_menus()
+
+
+def clear_menus_on_permissions_changed(sender: Any, action: str, **kwargs: Any) -> None:
+    """
+    Discard the menus when the groups or permissions of the users change
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        clear_menus()
+
+
+def clear_menus_on_deleted(sender: Any, **kwargs: Any) -> None:
+    """
+    Discard the menus when a user, group or permission is deleted
+    """
+    clear_menus()
+
+
+post_save.connect(clear_menus_on_user_saved, sender=User, dispatch_uid="jazzmin_menus_user_saved")
+for through in (User.groups.through, User.user_permissions.through, Group.permissions.through):
+    m2m_changed.connect(
+        clear_menus_on_permissions_changed,
+        sender=through,
+        dispatch_uid="jazzmin_menus_{}".format(through._meta.label_lower),
+    )
+for model in (User, Group, Permission):
+    post_delete.connect(
+        clear_menus_on_deleted,
+        sender=model,
+        dispatch_uid="jazzmin_menus_{}_deleted".format(model._meta.label_lower),
+    )
@@ -1,4 +1,3 @@
-import copy
 import itertools
 import json
 import logging
@@ -24,10 +23,11 @@ from django.templatetags.static import static
 from django.utils.html import escape, format_html
 from django.utils.safestring import SafeText, mark_safe
 from django.utils.text import get_text_list, slugify
-from django.utils.translation import gettext
+from django.utils.translation import get_language, gettext
 
 from .. import version
-from ..settings import CHANGEFORM_TEMPLATES, get_settings, get_ui_tweaks
+from ..cache import get_cached_menu, get_permissions_version
+from ..settings import CHANGEFORM_TEMPLATES, get_settings, get_settings_version, get_ui_tweaks
 from ..utils import get_admin_url, get_filter_id, has_fieldsets_check, make_menu, order_with_respect_to
 
 User = get_user_model()
@@ -46,12 +46,32 @@ def get_side_menu(context: Context, using: str = "available_apps") -> List[Dict]
     if not user:
         return []
 
+    available_apps = context.get(using, [])
+    if not user.is_authenticated:
+        return build_side_menu(user, available_apps)
+
+    # Menu of the user (and language, admin site and apps of the page), until the permissions change
+    request = context.get("request")
+    key = (
+        user.pk,
+        using,
+        get_language(),
+        getattr(request, "current_app", None),
+        tuple(app["app_label"] for app in available_apps),
+    )
+    return get_cached_menu(key, lambda: build_side_menu(user, available_apps))
+
+
+def build_side_menu(user: AbstractUser, available_apps: List[Dict]) -> List[Dict]:
+    """
+    Build the side menu of the user from the available apps
+    """
     options = get_settings()
-    ordering = options.get("order_with_respect_to", [])
-    ordering = [x.lower() for x in ordering]
+    order_positions = options["order_positions"]
+    hide_apps = set(options["hide_apps"])
+    hide_models = set(options.get("hide_models", []))
 
     menu = []
-    available_apps = copy.deepcopy(context.get(using, []))
 
     custom_links = {
         app_name: make_menu(user, links, options, allow_appmenus=False)
@@ -60,45 +80,40 @@ def get_side_menu(context: Context, using: str = "available_apps") -> List[Dict]
 
     for app in available_apps:
         app_label = app["app_label"].lower()
-        app_custom_links = custom_links.get(app_label, [])
-        app["icon"] = options["icons"].get(app_label, options["default_icon_parents"])
-        if app_label in options["hide_apps"]:
+        if app_label in hide_apps:
             continue
 
+        # Copy the apps and models updated (the available apps are shared by the page)
+        app = dict(app)
+        app["icon"] = options["icons"].get(app_label, options["default_icon_parents"])
+
         menu_items = []
         for model in app.get("models", []):
             model_str = "{app_label}.{model}".format(app_label=app_label, model=model["object_name"]).lower()
-            if model_str in options.get("hide_models", []):
+            if model_str in hide_models:
                 continue
 
+            model = dict(model)
             model["url"] = model["admin_url"]
             model["model_str"] = model_str
             model["icon"] = options["icons"].get(model_str, options["default_icon_children"])
             menu_items.append(model)
 
-        menu_items.extend(app_custom_links)
-
-        custom_link_names = [x.get("name", "").lower() for x in app_custom_links]
-        model_ordering = list(
-            filter(
-                lambda x: x.lower().startswith("{}.".format(app_label)) or x.lower() in custom_link_names,
-                ordering,
-            )
-        )
+        menu_items.extend(custom_links.get(app_label, []))
 
         if len(menu_items):
-            if model_ordering:
+            # The positions in the whole ordering keep the order of the models and custom links of the app
+            if order_positions:
                 menu_items = order_with_respect_to(
                     menu_items,
-                    model_ordering,
+                    order_positions,
                     getter=lambda x: x.get("model_str", x.get("name", "").lower()),
                 )
             app["models"] = menu_items
             menu.append(app)
 
-    if ordering:
-        apps_order = list(filter(lambda x: "." not in x, ordering))
-        menu = order_with_respect_to(menu, apps_order, getter=lambda x: x["app_label"].lower())
+    if order_positions:
+        menu = order_with_respect_to(menu, options["apps_order_positions"], getter=lambda x: x["app_label"].lower())
 
     return menu
 
@@ -126,7 +141,7 @@ def get_jazzmin_settings(request: WSGIRequest) -> Dict:
     """
     Get Jazzmin settings, update any defaults from the request, and return
     """
-    settings = get_settings()
+    settings = dict(get_settings())
 
     admin_site = {x.name: x for x in all_sites}.get("admin", {})
     if not settings["site_title"]:
@@ -141,6 +156,30 @@ def get_jazzmin_settings(request: WSGIRequest) -> Dict:
     return settings
 
 
+@register.simple_tag(takes_context=True)
+def get_fragment_cache(context: Context) -> Dict:
+    """
+    Get the timeout and keys of the cached fragments of the admin pages: the settings version for the shared
+    fragments (theme links), and also the user, its permissions version and the admin site for the menus.
+    The fragments and the permissions version are stored in the default cache, shared by the workers with the
+    file or redis CACHE_BACKEND (a locmem cache would keep the menus of the other workers until the timeout)
+    """
+    user = context.get("user")
+    request = context.get("request")
+    settings_key = "{version}:{language}".format(version=get_settings_version(), language=get_language())
+    user_key = "{settings_key}:{user}:{permissions}:{admin_site}".format(
+        settings_key=settings_key,
+        user=getattr(user, "pk", None),
+        permissions=get_permissions_version(),
+        admin_site=getattr(request, "current_app", None) or "admin",
+    )
+    return {
+        "timeout": get_settings()["fragment_cache_timeout"],
+        "settings_key": settings_key,
+        "user_key": user_key,
+    }
+
+
 @register.simple_tag
 def get_jazzmin_ui_tweaks() -> Dict:
     """
@@ -367,7 +406,7 @@ def as_json(value: Union[List, Dict]) -> str:
     """
     Take the given item and dump it out as JSON
     """
-    return json.dumps(value)
+    return json.dumps(value, default=dict)
 
 
 @register.simple_tag
@@ -1,5 +1,5 @@
 import logging
-from typing import List, Union, Dict, Set, Callable, Any
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Set, Union
 from urllib.parse import urlencode
 
 from django.apps import apps
@@ -15,22 +15,29 @@ from jazzmin.compat import NoReverseMatch, reverse
 logger = logging.getLogger(__name__)
 
 
-def order_with_respect_to(original: List, reference: List, getter: Callable = lambda x: x) -> List:
+def get_positions(reference: Iterable) -> Dict[Any, int]:
     """
-    Order a list based on the location of items in the reference list, optionally, use a getter to pull values out of
-    the first list
+    Get the position of each item in the reference list (the first one if it is repeated), a lookup table to order
+    other lists with order_with_respect_to
     """
-    ranking = []
-    max_num = len(original)
-    for item in original:
-        try:
-            pos = reference.index(getter(item))
-        except ValueError:
-            pos = max_num
+    positions: Dict[Any, int] = {}
+    for index, item in enumerate(reference):
+        positions.setdefault(item, index)
+    return positions
 
-        ranking.append(pos)
 
-    return [y for x, y in sorted(zip(ranking, original), key=lambda x: x[0])]
+def order_with_respect_to(
+    original: List, reference: Union[List, Mapping[Any, int]], getter: Callable = lambda x: x
+) -> List:
+    """
+    Order a list based on the location of items in the reference list, optionally, use a getter to pull values out of
+    the first list. The items missing in the reference go last, in their original order.
+
+    The reference can also be the precomputed positions of its items (see get_positions)
+    """
+    positions = reference if isinstance(reference, Mapping) else get_positions(reference)
+    max_num = len(positions)
+    return sorted(original, key=lambda item: positions.get(getter(item), max_num))
 
 
 def get_admin_url(instance: Any, admin_site: str = "admin", from_app: bool = False, **kwargs: str) -> str:
@@ -141,15 +148,25 @@ def get_app_admin_urls(app: str, admin_site: str = "admin") -> List[Dict]:
 
 def get_view_permissions(user: AbstractUser) -> Set[str]:
     """
-    Get model names based on a users view/change permissions
+    Get model names based on a users view/change permissions (computed once for each user object, like the
+    permissions cache of django)
     """
-    perms = user.get_all_permissions()
-    # the perm codenames should always be lower case
-    lower_perms = []
-    for perm in perms:
-        app, perm_codename = perm.split(".")
-        lower_perms.append("{app}.{perm_codename}".format(app=app, perm_codename=perm_codename.lower()))
-    return {x.replace("view_", "") for x in lower_perms if "view" in x or "change" in x}
+    try:
+        return user._jazzmin_view_permissions
+    except AttributeError:
+        pass
+
+    model_permissions = set()
+    for perm in user.get_all_permissions():
+        # the perm codenames should always be lower case (they usually are already)
+        app, _, perm_codename = perm.partition(".")
+        if not perm_codename.islower():
+            perm = "{app}.{perm_codename}".format(app=app, perm_codename=perm_codename.lower())
+        if "view" in perm or "change" in perm:
+            model_permissions.add(perm.replace("view_", ""))
+
+    user._jazzmin_view_permissions = frozenset(model_permissions)
+    return user._jazzmin_view_permissions
 
 
 def make_menu(
@@ -163,14 +180,14 @@ def make_menu(
 
     model_permissions = get_view_permissions(user)
 
+    # Check each permission of the links once
+    links_permissions = {perm for link in links for perm in link.get("permissions", [])}
+    granted_permissions = {perm for perm in links_permissions if user.has_perm(perm)}
+
     menu = []
     for link in links:
 
-        perm_matches = []
-        for perm in link.get("permissions", []):
-            perm_matches.append(user.has_perm(perm))
-
-        if not all(perm_matches):
+        if not granted_permissions.issuperset(link.get("permissions", [])):
             continue
 
         # Url links
@@ -0,0 +1,78 @@
+"""
+Gunicorn config, used by the Dockerfile.
+
+SERVER_MODE selects the sync (wsgi) or the async (asgi, uvicorn workers)
+deployment, and the number of workers is calculated from the cpus
+(overwrite it with GUNICORN_WORKERS).
+
+In asgi mode the event loop only receives and sends the requests: the
+async viewsets (utils/async_views.py) run the authentication, permissions,
+queries and serialization of each request in one worker thread
+(sync_to_async). They don't use the async ORM methods: in Django 4.2
+each of them is also a sync_to_async call, so every query would add a
+thread switch. The gain is in the slow clients, not in the queries.
+
+In asgi mode the database connections are closed after each request
+(CONN_MAX_AGE 0, see project/settings.py): the queries of each request
+run in a new thread, so a persistent connection would never be reused.
+Reusing them requires a connection pool (Django 5.1+ with psycopg 3).
+
+The background jobs (image renditions, see core/jobs.py) are run by
+"python manage.py run_jobs", started next to the server by the hooks
+below. Set JOBS_WORKER=False to run it in another container instead.
+"""
+
+import multiprocessing
+import os
+import subprocess
+import sys
+
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi")
+CPUS = multiprocessing.cpu_count()
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:80")
+
+if SERVER_MODE == "asgi":
+    # An event loop per cpu handles the concurrent (and slow) clients
+    wsgi_app = "project.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+    default_workers = CPUS
+else:
+    # Sync workers block while they send the response
+    wsgi_app = "project.wsgi:application"
+    worker_class = "sync"
+    default_workers = CPUS * 2 + 1
+
+workers = int(os.getenv("GUNICORN_WORKERS", default_workers))
+
+# The memory blacklist is not shared by the workers: a rotated refresh
+# token would still be accepted by the other workers
+if os.getenv("TOKEN_BLACKLIST_BACKEND") == "memory" and workers > 1:
+    raise RuntimeError(
+        "TOKEN_BLACKLIST_BACKEND=memory requires GUNICORN_WORKERS=1 "
+        "(use the database backend with more workers)"
+    )
+
+# Background jobs worker process
+JOBS_WORKER = os.getenv("JOBS_WORKER", "True") == "True"
+JOBS_COMMAND = [
+    sys.executable,
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "manage.py"),
+    "run_jobs",
+]
+jobs_worker = None
+
+
+def when_ready(server):
+    """ Start the jobs worker process with the server """
+    global jobs_worker
+
+    if JOBS_WORKER:
+        jobs_worker = subprocess.Popen(JOBS_COMMAND)
+        server.log.info("Jobs worker started (pid: %s)", jobs_worker.pid)
+
+
+def on_exit(server):
+    if jobs_worker is not None and jobs_worker.poll() is None:
+        jobs_worker.terminate()
+        jobs_worker.wait(timeout=30)
@@ -23,6 +23,37 @@ STORAGE_AWS = os.environ.get("STORAGE_AWS") == "True"
 HOST = os.getenv('HOST')
 TEST_HEADLESS = os.getenv('TEST_HEADLESS', 'False') == 'True'
 PAGE_SIZE = int(os.getenv('PAGE_SIZE', 2))
+RANDOM_POSTS_IDS_TIMEOUT = int(os.getenv('RANDOM_POSTS_IDS_TIMEOUT', 300))
+RANDOM_POSTS_MAX_AMOUNT = int(os.getenv('RANDOM_POSTS_MAX_AMOUNT', 10))
+SEARCH_CONFIG = os.getenv('SEARCH_CONFIG', 'spanish')
+SEARCH_MAX_RESULTS = int(os.getenv('SEARCH_MAX_RESULTS', 1000))
+RANDOM_POSTS_MAX_STORED_IDS = int(os.getenv('RANDOM_POSTS_MAX_STORED_IDS', 1000000))
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'file')
+CACHE_LOCATION = os.getenv('CACHE_LOCATION', '')
+API_CACHE_BACKEND = os.getenv('API_CACHE_BACKEND', 'file')
+API_CACHE_LOCATION = os.getenv('API_CACHE_LOCATION', '')
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 600))
+API_CACHE_MAX_ENTRIES = int(os.getenv('API_CACHE_MAX_ENTRIES', 1000))
+API_CACHE_STATS_INTERVAL = int(os.getenv('API_CACHE_STATS_INTERVAL', 10))
+TOKEN_BLACKLIST_BACKEND = os.getenv('TOKEN_BLACKLIST_BACKEND', 'database')
+TOKEN_BLACKLIST_MAX_ENTRIES = int(os.getenv('TOKEN_BLACKLIST_MAX_ENTRIES', 100000))
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 60))
+DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi')
+ASYNC_VIEWS = SERVER_MODE == 'asgi'
+IMAGE_RENDITION_WIDTHS = [
+    int(width) for width in os.getenv('IMAGE_RENDITION_WIDTHS', '320,640,1280').split(',')
+]
+IMAGE_RENDITION_FORMATS = os.getenv('IMAGE_RENDITION_FORMATS', 'webp,avif').split(',')
+IMAGE_RENDITION_QUALITY = int(os.getenv('IMAGE_RENDITION_QUALITY', 80))
+MEDIA_CDN_DOMAIN = os.getenv('MEDIA_CDN_DOMAIN', '')
+MEDIA_UPLOAD_MAX_SIZE = int(os.getenv('MEDIA_UPLOAD_MAX_SIZE', 20 * 1024 * 1024))
+MEDIA_UPLOAD_EXPIRES = int(os.getenv('MEDIA_UPLOAD_EXPIRES', 600))
+JOBS_MAX_ATTEMPTS = int(os.getenv('JOBS_MAX_ATTEMPTS', 3))
+JOBS_RETRY_DELAY = int(os.getenv('JOBS_RETRY_DELAY', 30))
+JOBS_TIMEOUT = int(os.getenv('JOBS_TIMEOUT', 600))
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.getenv('ADMIN_ESTIMATED_COUNT_THRESHOLD', 100000))
+ADMIN_FILTER_CHOICES_TIMEOUT = int(os.getenv('ADMIN_FILTER_CHOICES_TIMEOUT', 600))
 
 print(f"DEBUG: {DEBUG}")
 print(f"STORAGE_AWS: {STORAGE_AWS}")
@@ -76,7 +107,6 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -84,6 +114,13 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Compile each template once per process (admin shell included)
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -111,6 +148,14 @@ else:
             'charset': 'utf8mb4',
         }
 
+    # The connections are reused with CONN_MAX_AGE and CONN_HEALTH_CHECKS
+    # (the psycopg 3 connection pool requires Django 5.1+).
+    # In ASGI the queries of each request run in a new thread, so the
+    # persistent connections are never reused and pile up until the
+    # database max_connections: DB_CONN_MAX_AGE is ignored (always 0)
+    if ASYNC_VIEWS:
+        DB_CONN_MAX_AGE = 0
+
     DATABASES = {
         'default': {
             'ENGINE': os.environ.get("DB_ENGINE"),
@@ -120,10 +165,63 @@ else:
             'HOST': os.environ.get("DB_HOST"),
             'PORT': os.environ.get("DB_PORT"),
             'OPTIONS': options,
+            # Reuse the connections between requests
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
         }
     }
 
 
+# Cache
+# Cache backends: file (shared by the workers of the server), redis (shared
+# by all the servers) or locmem (single process only: the invalidations of
+# the other workers are not received)
+def get_cache_backend(backend: str, location: str, name: str) -> dict:
+    """ Settings of a cache backend (location is optional) """
+    return {
+        'locmem': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': name,
+        },
+        'file': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': location or os.path.join(BASE_DIR, '.cache', name),
+        },
+        # Requires the "redis" package
+        'redis': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': location or 'redis://127.0.0.1:6379',
+            'KEY_PREFIX': name,
+        },
+    }[backend]
+
+
+# Default cache: versions of the data stored in the processes memory
+# (random posts, admin menus, roles and filters) and admin fragments.
+# The tests use new (locmem) caches in each run
+API_CACHE_ALIAS = 'api'
+CACHES = {
+    'default': {
+        **get_cache_backend(
+            'locmem' if IS_TESTING else CACHE_BACKEND, CACHE_LOCATION, 'default'
+        ),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # Api responses
+    API_CACHE_ALIAS: {
+        **get_cache_backend(
+            'locmem' if IS_TESTING else API_CACHE_BACKEND, API_CACHE_LOCATION, 'api'
+        ),
+        'TIMEOUT': API_CACHE_TIMEOUT,
+        'OPTIONS': {
+            'MAX_ENTRIES': API_CACHE_MAX_ENTRIES,
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -161,6 +259,12 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Leave the unused jazzmin themes out of collectstatic
+STATICFILES_FINDERS = [
+    'django.contrib.staticfiles.finders.FileSystemFinder',
+    'jazzmin.finders.JazzminAppDirectoriesFinder',
+]
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -343,7 +447,11 @@ if STORAGE_AWS:
     AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY')
     AWS_STORAGE_BUCKET_NAME = os.getenv('AWS_STORAGE_BUCKET_NAME')
     AWS_DEFAULT_ACL = None
-    AWS_S3_CUSTOM_DOMAIN = f'{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com'
+    AWS_S3_CUSTOM_DOMAIN = os.getenv(
+        'AWS_S3_CUSTOM_DOMAIN', f'{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com'
+    )
+    # S3 compatible storage (for example minio)
+    AWS_S3_ENDPOINT_URL = os.getenv('AWS_S3_ENDPOINT_URL')
     AWS_S3_OBJECT_PARAMETERS = {'CacheControl': 'max-age=86400'}
 
     # s3 static settings
@@ -372,6 +480,12 @@ else:
     # Static files (CSS, JavaScript, Images)
     STATIC_URL = '/static/'
     MEDIA_URL = '/media/'
+
+    # Fingerprinted and pre-compressed (gzip and brotli) static files,
+    # served by WhiteNoise with far-future cache headers (the tests don't
+    # run collectstatic)
+    if not IS_TESTING:
+        STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
     
 
 # Setup drf
@@ -379,11 +493,12 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'utils.pagination.OptionalCountPagination',
     # DEBUG
     'PAGE_SIZE': PAGE_SIZE,
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Trust the token claims, without querying the user
+        'core.authentication.StatelessJWTAuthentication',
     ),
     'EXCEPTION_HANDLER': 'utils.handlers.custom_exception_handler'
 }
@@ -8,15 +8,27 @@ from rest_framework import routers
 from core.views import (
     CustomTokenObtainPairView,
     CustomTokenRefreshView,
+    DirectUploadView,
+    TokenBlacklistStatsView,
 )
 from blog import views as blog_views
 
 # Setup drf router
 router = routers.DefaultRouter()
-router.register(r"groups", blog_views.GroupViewSet)
-router.register(r"categories", blog_views.CategoryViewSet)
-router.register(r"posts", blog_views.PostViewSet)
-router.register(r"random-post", blog_views.RandomPostViewSet, basename="random-post")
+if settings.ASYNC_VIEWS:
+    # Async viewsets for the ASGI deployment (each request runs in a
+    # worker thread, see utils/async_views.py)
+    router.register(r"groups", blog_views.AsyncGroupViewSet)
+    router.register(r"categories", blog_views.AsyncCategoryViewSet)
+    router.register(r"posts", blog_views.AsyncPostViewSet)
+    router.register(
+        r"random-post", blog_views.AsyncRandomPostViewSet, basename="random-post"
+    )
+else:
+    router.register(r"groups", blog_views.GroupViewSet)
+    router.register(r"categories", blog_views.CategoryViewSet)
+    router.register(r"posts", blog_views.PostViewSet)
+    router.register(r"random-post", blog_views.RandomPostViewSet, basename="random-post")
 
 
 urlpatterns = [
@@ -32,8 +44,19 @@ urlpatterns = [
     # Drf
     path("api/token/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", CustomTokenRefreshView.as_view(), name="token_refresh"),
+    path(
+        "api/token/blacklist-stats/",
+        TokenBlacklistStatsView.as_view(),
+        name="token_blacklist_stats",
+    ),
+    path("api/cache-stats/", blog_views.CacheStatsView.as_view(), name="cache_stats"),
     path("api/", include(router.urls)),
 ]
 
 if not settings.STORAGE_AWS:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    
+    # Local stand-in of the s3 direct uploads
+    urlpatterns += [
+        path("media-upload/", DirectUploadView.as_view(), name="direct_upload"),
+    ]
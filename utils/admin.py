@@ -1,11 +1,91 @@
+from time import monotonic
+
 from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from utils.cache import new_version
+
+# Groups with access to the admin, and role of the superusers
+ADMIN_GROUPS = frozenset(["admins", "supports"])
+SUPERUSER_ROLE = "superuser"
+ADMIN_ROLES = ADMIN_GROUPS | {SUPERUSER_ROLE}
+
+CACHE_ROLES_VERSION_KEY = "utils:user_roles:version"
+
+# Max users stored in the process, and seconds to keep their roles
+MAX_STORED_USERS = 1000
+ROLES_TIMEOUT = 300
+
+# Roles of the users stored in the process memory.
+# The version is kept in the default cache (shared by the workers with the
+# file or redis CACHE_BACKEND), to invalidate all the processes
+user_roles_store = {
+    "version": None,
+    "user_roles": {},
+}
+
+
+def get_roles_version() -> str:
+    """ Get the current version of the cached roles """
+    return cache.get_or_set(CACHE_ROLES_VERSION_KEY, new_version, None)
+
+
+def get_user_roles(user: User) -> frozenset:
+    """ Get the roles of the user (admin groups and superuser).
+    Users authenticated with a token read the roles from its claims,
+    other users from the process memory, the shared cache or the database
+
+    Args:
+        user (User): user or token user
+
+    Returns:
+        frozenset: names of the roles
+    """
+
+    # Roles embedded in the token (TokenUser returns None if missing)
+    token_roles = getattr(user, "roles", None)
+    if token_roles is not None:
+        return frozenset(token_roles)
+
+    # Discard the roles stored before they changed
+    version = get_roles_version()
+    if user_roles_store["version"] != version:
+        user_roles_store["version"] = version
+        user_roles_store["user_roles"] = {}
+    stored_user_roles = user_roles_store["user_roles"]
+
+    expiration, roles = stored_user_roles.get(user.id, (0, None))
+    if roles is None or expiration < monotonic():
+        key = f"utils:user_roles:{version}:{user.id}"
+        roles = cache.get(key)
+        if roles is None:
+            groups = user.groups.filter(name__in=ADMIN_GROUPS)
+            roles = frozenset(groups.values_list("name", flat=True))
+            if user.is_superuser:
+                roles |= {SUPERUSER_ROLE}
+            cache.set(key, roles, ROLES_TIMEOUT)
+
+        stored_user_roles.pop(user.id, None)
+        if len(stored_user_roles) >= MAX_STORED_USERS:
+            # Discard the oldest user
+            del stored_user_roles[next(iter(stored_user_roles))]
+        stored_user_roles[user.id] = (monotonic() + ROLES_TIMEOUT, roles)
+
+    return roles
+
+
+def clear_user_roles():
+    """ Invalidate the roles stored in all the processes """
+    cache.set(CACHE_ROLES_VERSION_KEY, new_version(), None)
+
+
+def is_user_admin(user: User) -> bool:
+    """ Check if the user is in an admin group or is a superuser
 
+    Args:
+        user (User): user or token user
 
-def is_user_admin(user: User):
-    user_grups = user.groups.all()
-    user_in_admin_group = False
-    for group in user_grups:
-        if group.name in ["admins", "supports"]:
-            user_in_admin_group = True
-            break
-    return user_in_admin_group or user.is_superuser
\ No newline at end of file
+    Returns:
+        bool: True if the user has an admin role
+    """
+    return not get_user_roles(user).isdisjoint(ADMIN_ROLES)
@@ -0,0 +1,62 @@
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.utils.decorators import classonlymethod
+
+
+class AsyncReadOnlyViewSetMixin:
+    """ Serve a read only viewset as an async view (ASGI deployment).
+    Only the request parsing and the response run in the event loop.
+    Authentication, permissions, throttling, queries and serialization of
+    each request run in a single worker thread (authentication can read the
+    revoked users from the database), with the sync ORM: in Django 4.2 every
+    async ORM call (aget, acount, async for) is also a thread switch, so it
+    is the cheapest way to keep the filters, pagination, caches and
+    conditional responses of the viewset
+    """
+
+    @classonlymethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+
+        # Let Django await the view (dispatch is a coroutine)
+        markcoroutinefunction(view)
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        """ Async version of APIView.dispatch """
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            response = await sync_to_async(self.handle_request)(
+                request, *args, **kwargs
+            )
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    def handle_request(self, request, *args, **kwargs):
+        """ Check the request and run its (sync) handler, in the worker thread
+
+        Args:
+            request (Request): current request
+
+        Returns:
+            Response: handler response
+        """
+
+        self.initial(request, *args, **kwargs)
+
+        if request.method.lower() in self.http_method_names:
+            handler = getattr(
+                self, request.method.lower(), self.http_method_not_allowed
+            )
+        else:
+            handler = self.http_method_not_allowed
+
+        return handler(request, *args, **kwargs)
@@ -0,0 +1,78 @@
+import json
+import secrets
+import subprocess
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+
+BENCHMARK_USER_PREFIX = "benchmark-"
+
+
+@contextmanager
+def temporary_user(**fields):
+    """ Create a user with a random name and password for a benchmark,
+    and delete it at the end (no known credentials stay in the database)
+
+    Args:
+        **fields: other user fields (for example is_superuser)
+
+    Yields:
+        tuple: user and credentials (username and password)
+    """
+
+    credentials = {
+        "username": f"{BENCHMARK_USER_PREFIX}{secrets.token_hex(8)}",
+        "password": secrets.token_urlsafe(32),
+    }
+    user = User.objects.create_user(**credentials, **fields)
+    try:
+        yield user, credentials
+    finally:
+        user.delete()
+
+
+def get_commit() -> str | None:
+    """ Get the current git commit, to compare results across commits """
+
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(
+    stdout, path: str, results: dict, section: str, metrics: list[str]
+):
+    """ Show the changes from previous results
+
+    Args:
+        stdout (OutputWrapper): command output
+        path (str): json file with previous results
+        results (dict): current results
+        section (str): results key with the measured items (for example "pages")
+        metrics (list[str]): metrics to compare
+    """
+
+    with open(path) as file:
+        previous = json.load(file)
+
+    stdout.write(f"\nCompared with {previous.get('commit')}:")
+    for name, result in results[section].items():
+        previous_result = previous[section].get(name)
+        if not previous_result:
+            continue
+
+        changes = []
+        for metric in metrics:
+            # Results of previous versions of the commands
+            if metric not in previous_result:
+                continue
+            before = previous_result[metric]
+            after = result[metric]
+            change = (after - before) / before * 100 if before else 0
+            changes.append(f"{metric} {before} -> {after} ({change:+.1f}%)")
+        stdout.write(f"{name}: {', '.join(changes)}")
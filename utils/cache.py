@@ -0,0 +1,346 @@
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from hashlib import md5
+from typing import Callable
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+# Namespaces of the cached api data
+API_NAMESPACES = ("groups", "categories", "durations", "posts")
+
+# Cache hits and misses of the current process (by counter key), added to
+# the shared counters every API_CACHE_STATS_INTERVAL seconds
+cache_access_counts = Counter()
+cache_access_store = {
+    "flushed_at": time.monotonic(),
+    "lock": threading.Lock(),
+}
+
+
+def get_api_cache():
+    """ Get the cache backend of the api responses (API_CACHE_BACKEND) """
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def new_version() -> str:
+    """ Create a cache version that is never repeated: if the version key
+    is culled from the cache, the old entries are not valid again
+
+    Returns:
+        str: random version
+    """
+    return uuid.uuid4().hex
+
+
+def get_namespace_version(namespace: str) -> str:
+    """ Get the current version of the cached data of a namespace
+
+    Args:
+        namespace (str): cache namespace (for example 'posts')
+
+    Returns:
+        str: namespace version
+    """
+    return get_api_cache().get_or_set(f"api:{namespace}:version", new_version, None)
+
+
+def clear_namespace(namespace: str):
+    """ Invalidate all the cached data of a namespace, by updating its version
+
+    Args:
+        namespace (str): cache namespace (for example 'posts')
+    """
+    get_api_cache().set(f"api:{namespace}:version", new_version(), None)
+
+
+def clear_api_namespaces():
+    """ Invalidate the cached data of all the api namespaces. The cache is
+    not cleared: in redis it would flush the database of the other caches
+    """
+
+    for namespace in API_NAMESPACES:
+        clear_namespace(namespace)
+
+
+def record_cache_access(namespace: str, hit: bool):
+    """ Count the cache hits and misses of a namespace in the current
+    process (without writing to the shared cache in each request)
+
+    Args:
+        namespace (str): cache namespace (for example 'posts')
+        hit (bool): True if the data was found in the cache
+    """
+
+    with cache_access_store["lock"]:
+        cache_access_counts[f"api:{namespace}:{'hits' if hit else 'misses'}"] += 1
+    elapsed = time.monotonic() - cache_access_store["flushed_at"]
+    if elapsed >= settings.API_CACHE_STATS_INTERVAL:
+        flush_cache_access()
+
+
+def flush_cache_access():
+    """ Add the cache hits and misses of the current process to the
+    shared counters (a single write by counter)
+    """
+
+    with cache_access_store["lock"]:
+        counts = dict(cache_access_counts)
+        cache_access_counts.clear()
+        cache_access_store["flushed_at"] = time.monotonic()
+
+    cache = get_api_cache()
+    for key, count in counts.items():
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            # Counter culled after adding it
+            cache.set(key, count, None)
+
+
+def get_cache_stats(namespaces: list[str]) -> dict:
+    """ Get the cache hits and misses of the namespaces. The counts of
+    the other processes are added every API_CACHE_STATS_INTERVAL seconds
+
+    Args:
+        namespaces (list[str]): cache namespaces
+
+    Returns:
+        dict: hits and misses by namespace
+    """
+
+    flush_cache_access()
+    cache = get_api_cache()
+    stats = {}
+    for namespace in namespaces:
+        hits = cache.get(f"api:{namespace}:hits", 0)
+        misses = cache.get(f"api:{namespace}:misses", 0)
+        stats[namespace] = {
+            "hits": hits,
+            "misses": misses,
+            "version": get_namespace_version(namespace),
+        }
+    return stats
+
+
+def get_request_params(request) -> str:
+    """ Get the get params of a request, sorted (normalized)
+
+    Args:
+        request (Request): current request
+
+    Returns:
+        str: encoded params
+    """
+    return urlencode(sorted(request.query_params.lists()), doseq=True)
+
+
+def get_response_cache_key(namespace: str, request) -> str:
+    """ Get the cache key of a response by host, path and get params
+
+    Args:
+        namespace (str): cache namespace (for example 'posts')
+        request (Request): current request
+
+    Returns:
+        str: cache key
+    """
+
+    version = get_namespace_version(namespace)
+    url = f"{request.get_host()}{request.path}?{get_request_params(request)}"
+    return f"api:{namespace}:{version}:response:{md5(url.encode()).hexdigest()}"
+
+
+def get_cached_value(namespace: str, name: str, get_value: Callable):
+    """ Get a value from the cache, or calculate and cache it
+
+    Args:
+        namespace (str): cache namespace (for example 'posts')
+        name (str): value name, unique in the namespace
+        get_value (callable): function to calculate the value
+
+    Returns:
+        any: cached or calculated value
+    """
+
+    cache = get_api_cache()
+    version = get_namespace_version(namespace)
+    cache_key = f"api:{namespace}:{version}:value:{md5(name.encode()).hexdigest()}"
+    value = cache.get(cache_key)
+    record_cache_access(namespace, value is not None)
+    if value is None:
+        value = get_value()
+        cache.set(cache_key, value, settings.API_CACHE_TIMEOUT)
+
+    return value
+
+
+def get_cached_objects(
+    namespace: str,
+    request,
+    ids: list[int],
+    serialize_objects: Callable[[list[int]], list[dict]]
+) -> list[dict]:
+    """ Get serialized objects from the cache, serializing only the missing ones
+
+    Args:
+        namespace (str): cache namespace (for example 'posts')
+        request (Request): current request (objects urls depend on the host)
+        ids (list[int]): objects ids
+        serialize_objects (callable): function that receives the missing ids
+            and returns the serialized objects (with 'id' key)
+
+    Returns:
+        list[dict]: serialized objects, in the same order as the ids
+    """
+
+    cache = get_api_cache()
+    version = get_namespace_version(namespace)
+    host = request.get_host()
+    keys = {
+        object_id: f"api:{namespace}:{version}:object:{host}:{object_id}"
+        for object_id in ids
+    }
+    cached_objects = cache.get_many(keys.values())
+
+    # Serialize and cache missing objects
+    missing_ids = [
+        object_id for object_id, key in keys.items()
+        if key not in cached_objects
+    ]
+    if missing_ids:
+        serialized_objects = serialize_objects(missing_ids)
+        new_objects = {
+            keys[serialized["id"]]: serialized
+            for serialized in serialized_objects
+        }
+        cache.set_many(new_objects, settings.API_CACHE_TIMEOUT)
+        cached_objects.update(new_objects)
+    record_cache_access(namespace, not missing_ids)
+
+    return [
+        cached_objects[key] for key in keys.values()
+        if key in cached_objects
+    ]
+
+
+class CacheResponseMixin:
+    """ Cache the responses of read only viewsets by endpoint and get params.
+    The cache is invalidated with 'clear_namespace(cache_namespace)'
+    """
+
+    cache_namespace = None
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_cached_response(self, view, request, *args, **kwargs) -> Response:
+        """ Get the response data from the cache, or render and cache it
+
+        Args:
+            view (callable): view to render the response
+            request (Request): current request
+
+        Returns:
+            Response: cached or rendered response
+        """
+
+        cache = get_api_cache()
+        cache_key = get_response_cache_key(self.cache_namespace, request)
+        data = cache.get(cache_key)
+        record_cache_access(self.cache_namespace, data is not None)
+        if data is not None:
+            return Response(data)
+
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(cache_key, response.data, settings.API_CACHE_TIMEOUT)
+        return response
+
+
+class ConditionalGetMixin:
+    """ Answer conditional requests (If-None-Match / If-Modified-Since)
+    with 304 responses, without rendering the data.
+    The validators are returned by 'get_list_validators' and
+    'get_detail_validators'
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            self.get_list_validators(),
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            self.get_detail_validators(),
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_list_validators(self) -> tuple[str, datetime] | None:
+        """ Get the etag and last modification date of the list
+
+        Returns:
+            tuple | None: None to skip the conditional response, or:
+                str: etag (not quoted)
+                datetime: last modification date
+        """
+        return None
+
+    def get_detail_validators(self) -> tuple[str, datetime] | None:
+        """ Get the etag and last modification date of the object
+
+        Returns:
+            tuple | None: None to skip the conditional response, or:
+                str: etag (not quoted)
+                datetime: last modification date
+        """
+        return None
+
+    def get_conditional_response(
+        self, validators, view, request, *args, **kwargs
+    ) -> Response:
+        """ Return a 304 response if the client data is up to date,
+        or render the response with the validators headers
+
+        Args:
+            validators (tuple | None): etag and last modification date
+            view (callable): view to render the response
+            request (Request): current request
+
+        Returns:
+            Response: not modified or rendered response
+        """
+
+        if validators is None:
+            return view(request, *args, **kwargs)
+
+        # The data also depends on the get params (page, summary, search...)
+        etag, last_modified = validators
+        etag = quote_etag(
+            md5(f"{etag}:{get_request_params(request)}".encode()).hexdigest()
+        )
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = view(request, *args, **kwargs)
+
+        if response.status_code in [200, 304]:
+            response["ETag"] = etag
+            if timestamp:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
@@ -0,0 +1,133 @@
+from django.conf import settings
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Paginator
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+from utils.cache import new_version
+
+CACHE_CHOICES_VERSION_KEY = "utils:changelist:choices:version"
+
+# Queries of the estimated rows of a table, by database vendor
+ESTIMATED_COUNT_QUERIES = {
+    "postgresql": "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+    "mysql": (
+        "SELECT table_rows FROM information_schema.tables "
+        "WHERE table_schema = DATABASE() AND table_name = %s"
+    ),
+    # Statistics of the indexes (ANALYZE), the first value is the rows
+    "sqlite": "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1",
+}
+
+
+def get_estimated_count(queryset: QuerySet) -> int | None:
+    """ Get the rows of the table of a queryset from the database
+    statistics, without counting them
+
+    Args:
+        queryset (QuerySet): queryset of the model
+
+    Returns:
+        int | None: estimated rows, or None without statistics
+    """
+
+    connection = connections[queryset.db]
+    query = ESTIMATED_COUNT_QUERIES.get(connection.vendor)
+    if not query:
+        return None
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(query, [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        # Statistics table not created yet (sqlite)
+        return None
+
+    if not row or row[0] is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+
+    # Table never analyzed (postgres returns -1)
+    if estimate < 0:
+        return None
+    return estimate
+
+
+class EstimatedCountPaginator(Paginator):
+    """ Admin paginator that uses the estimated rows of large tables
+    (ADMIN_ESTIMATED_COUNT_THRESHOLD) when the changelist is not filtered,
+    instead of counting all the rows.
+    The rows are counted in the last estimated page and beyond it, so all
+    the pages can be reached when the estimate is lower than the rows
+    """
+
+    is_estimated = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.where:
+            estimate = get_estimated_count(queryset)
+            if estimate is not None \
+                    and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                self.is_estimated = True
+                return estimate
+        return super().count
+
+    def use_exact_count(self):
+        """ Replace the estimated rows by the exact count """
+
+        self.is_estimated = False
+        self.__dict__["count"] = Paginator.count.func(self)
+        self.__dict__.pop("num_pages", None)
+
+    def validate_number(self, number):
+        try:
+            number = super().validate_number(number)
+        except EmptyPage:
+            if not self.is_estimated:
+                raise
+            self.use_exact_count()
+            return super().validate_number(number)
+
+        if self.is_estimated and number == self.num_pages:
+            self.use_exact_count()
+            number = super().validate_number(number)
+        return number
+
+
+def get_choices_version() -> str:
+    """ Get the current version of the cached filter choices """
+    return cache.get_or_set(CACHE_CHOICES_VERSION_KEY, new_version, None)
+
+
+def clear_filter_choices():
+    """ Invalidate the cached filter choices of all the processes """
+    cache.set(CACHE_CHOICES_VERSION_KEY, new_version(), None)
+
+
+class CachedRelatedFieldListFilter(admin.RelatedFieldListFilter):
+    """ Foreign key filter that stores its choices in the cache, instead of
+    querying the related table in each changelist page. The choices are
+    cleared with clear_filter_choices when the related rows change (the
+    default cache is shared by the workers with the file or redis
+    CACHE_BACKEND)
+    """
+
+    def field_choices(self, field, request, model_admin):
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        key = ":".join([
+            "utils:changelist:choices",
+            get_choices_version(),
+            field.model._meta.label_lower,
+            field.name,
+            ",".join(map(str, ordering)),
+        ])
+        choices = cache.get(key)
+        if choices is None:
+            choices = super().field_choices(field, request, model_admin)
+            cache.set(key, choices, settings.ADMIN_FILTER_CHOICES_TIMEOUT)
+        return choices
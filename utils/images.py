@@ -0,0 +1,342 @@
+import mimetypes
+import os
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, UnidentifiedImageError
+
+from core import jobs
+
+# Status of the renditions of an image field
+RENDITIONS_STATUSES = (
+    ('', 'Sin imagen'),
+    ('pending', 'Pendiente'),
+    ('done', 'Listo'),
+    ('failed', 'Fallido'),
+)
+
+
+def get_rendition_formats() -> list[str]:
+    """ Get the configured renditions formats that Pillow can encode
+    (for example, avif requires Pillow 11.3+ or the avif plugin)
+
+    Returns:
+        list[str]: formats (lowercase)
+    """
+
+    Image.init()
+    return [
+        image_format for image_format in settings.IMAGE_RENDITION_FORMATS
+        if image_format.upper() in Image.SAVE
+    ]
+
+
+def is_valid_image(image) -> bool:
+    """ Decode an image with Pillow (like the uploads to Django), and
+    check that its format matches its extension
+
+    Args:
+        image (FieldFile): image of a model field
+
+    Returns:
+        bool: True if the file is an image of its extension format
+    """
+
+    try:
+        with image.open("rb"), Image.open(image) as original:
+            original.verify()
+            content_type = Image.MIME.get(original.format)
+    except Exception:
+        # Pillow raises many exceptions types for invalid images
+        return False
+
+    return content_type is not None \
+        and content_type == mimetypes.guess_type(image.name)[0]
+
+
+def create_renditions(image) -> dict:
+    """ Resize the image to the configured widths and formats, and save
+    the renditions next to it (in the same storage, local or s3).
+    Widths larger than the image and animated images are skipped
+
+    Args:
+        image (FieldFile): image of a model field
+
+    Returns:
+        dict: image name ('source') and renditions names by format and width,
+        for example {"source": "images/a.png", "webp": {"320": "images/a_320w.webp"}}
+    """
+
+    renditions = {"source": image.name}
+
+    # Files that are not images (svg) or don't exist keep only the original
+    try:
+        with image.open("rb"), Image.open(image) as original:
+            is_animated = getattr(original, "is_animated", False)
+            original.load()
+    except (OSError, ValueError, UnidentifiedImageError):
+        return renditions
+
+    if is_animated:
+        return renditions
+
+    if original.mode not in ["RGB", "RGBA"]:
+        original = original.convert("RGBA")
+
+    base_name = os.path.splitext(image.name)[0]
+    widths = [width for width in settings.IMAGE_RENDITION_WIDTHS if width < original.width]
+    for image_format in get_rendition_formats():
+        renditions[image_format] = {}
+        for width in widths:
+            height = round(original.height * width / original.width)
+            resized = original.resize((width, height), Image.LANCZOS)
+
+            content = BytesIO()
+            resized.save(
+                content,
+                format=image_format.upper(),
+                quality=settings.IMAGE_RENDITION_QUALITY,
+            )
+            # Replace the file of a previous (failed or forced) attempt
+            name = f"{base_name}_{width}w.{image_format}"
+            if image.storage.exists(name):
+                image.storage.delete(name)
+            name = image.storage.save(name, ContentFile(content.getvalue()))
+            renditions[image_format][str(width)] = name
+
+    return renditions
+
+
+def get_rendition_names(renditions: dict) -> list[str]:
+    """ Get the file names of the renditions (without the source image)
+
+    Args:
+        renditions (dict): renditions of an image (see create_renditions)
+
+    Returns:
+        list[str]: file names
+    """
+
+    return [
+        name
+        for image_format, names in renditions.items()
+        if image_format != "source"
+        for name in names.values()
+    ]
+
+
+def get_srcset(renditions: dict, get_url) -> dict:
+    """ Get the srcset of each format of the renditions
+
+    Args:
+        renditions (dict): renditions of an image (see create_renditions)
+        get_url (callable): function that returns the url of a file name
+
+    Returns:
+        dict: srcset by format, for example {"webp": "https://.../a_320w.webp 320w"}
+    """
+
+    return {
+        image_format: ", ".join(
+            f"{get_url(name)} {width}w" for width, name in names.items()
+        )
+        for image_format, names in renditions.items()
+        if image_format != "source" and names
+    }
+
+
+class ImageRenditionsMixin:
+    """ Create the renditions of the image fields of a model in the background
+    (jobs worker) when they change.
+    'renditions_fields' maps each image field to the json field that stores
+    its renditions, and '<renditions field>_status' stores their status
+    """
+
+    renditions_fields = {}
+
+    # Image fields uploaded directly to the storage, not decoded by Django
+    # (see utils.uploads): the renditions job verifies them
+    unverified_images = frozenset()
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        # The image names are final after the save. Update the status without
+        # saving again (a single post_save signal)
+        update_fields = kwargs.get("update_fields")
+        image_fields = [
+            image_field for image_field in self.renditions_fields
+            if update_fields is None or image_field in update_fields
+        ]
+        updated_fields, queued_fields, old_names = self.reset_renditions(image_fields)
+        if updated_fields:
+            type(self).objects.filter(pk=self.pk).update(**{
+                field: getattr(self, field) for field in updated_fields
+            })
+        for image_field, names in old_names.items():
+            self.delete_renditions(image_field, names)
+        self.enqueue_renditions(queued_fields)
+
+    def queue_renditions(self, force: bool = False) -> int:
+        """ Queue the creation of the renditions of the images that changed
+
+        Args:
+            force (bool): create the renditions of all the images
+
+        Returns:
+            int: number of queued images
+        """
+
+        updated_fields, queued_fields, old_names = self.reset_renditions(
+            list(self.renditions_fields), force
+        )
+        if not updated_fields:
+            return 0
+
+        # Save the status before queuing the jobs
+        self.save_renditions(updated_fields)
+        for image_field, names in old_names.items():
+            self.delete_renditions(image_field, names)
+        self.enqueue_renditions(queued_fields)
+        return len(queued_fields)
+
+    def reset_renditions(self, image_fields: list[str], force: bool = False) -> tuple:
+        """ Set the pending status of the images that changed (without saving)
+
+        Args:
+            image_fields (list[str]): image fields to check
+            force (bool): reset the renditions of all the images
+
+        Returns:
+            tuple: updated fields, image fields to queue, and names of the
+            old renditions files by image field
+        """
+
+        updated_fields = []
+        queued_fields = []
+        old_names = {}
+        for image_field in image_fields:
+            renditions_field = self.renditions_fields[image_field]
+            image = getattr(self, image_field)
+            renditions = getattr(self, renditions_field) or {}
+            if not force and renditions.get("source", "") == (image.name or ""):
+                continue
+
+            old_names[image_field] = get_rendition_names(renditions)
+            status_field = f"{renditions_field}_status"
+            if image:
+                setattr(self, renditions_field, {"source": image.name})
+                setattr(self, status_field, "pending")
+                queued_fields.append(image_field)
+            else:
+                setattr(self, renditions_field, {})
+                setattr(self, status_field, "")
+            updated_fields += [renditions_field, status_field]
+
+        return updated_fields, queued_fields, old_names
+
+    def enqueue_renditions(self, image_fields: list[str]):
+        """ Queue a job for each image field (after saving its status) """
+
+        for image_field in image_fields:
+            jobs.enqueue(
+                "create_renditions",
+                model=self._meta.label,
+                pk=self.pk,
+                field=image_field,
+                source=getattr(self, image_field).name,
+                verify=image_field in self.unverified_images,
+            )
+
+    def delete_renditions(self, image_field: str, names: list[str]):
+        """ Delete the files of the replaced renditions of an image
+
+        Args:
+            image_field (str): name of the image field
+            names (list[str]): renditions file names
+        """
+
+        storage = self._meta.get_field(image_field).storage
+        for name in names:
+            storage.delete(name)
+
+    def verify_image(self, image_field: str) -> bool:
+        """ Verify an image uploaded directly to the storage, and remove
+        it from the storage and the field if it isn't valid
+
+        Args:
+            image_field (str): name of the image field
+
+        Returns:
+            bool: True if the image is valid
+        """
+
+        image = getattr(self, image_field)
+        if is_valid_image(image):
+            return True
+
+        image.storage.delete(image.name)
+        renditions_field = self.renditions_fields[image_field]
+        setattr(self, image_field, "")
+        setattr(self, renditions_field, {})
+        setattr(self, f"{renditions_field}_status", "failed")
+        self.save_renditions(
+            [image_field, renditions_field, f"{renditions_field}_status"]
+        )
+        return False
+
+    def update_renditions(self, image_field: str):
+        """ Create the renditions of an image (run by the jobs worker)
+
+        Args:
+            image_field (str): name of the image field
+        """
+
+        renditions_field = self.renditions_fields[image_field]
+        old_names = get_rendition_names(getattr(self, renditions_field) or {})
+        renditions = create_renditions(getattr(self, image_field))
+
+        setattr(self, renditions_field, renditions)
+        setattr(self, f"{renditions_field}_status", "done")
+        self.save_renditions([renditions_field, f"{renditions_field}_status"])
+        self.delete_renditions(
+            image_field, set(old_names) - set(get_rendition_names(renditions))
+        )
+
+    def save_renditions(self, fields: list[str]):
+        """ Save the renditions fields, and the modification date
+        (used by the conditional responses)
+
+        Args:
+            fields (list[str]): renditions and status fields
+        """
+
+        self.save(update_fields=fields + [
+            field.name for field in self._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+        ])
+
+
+@jobs.register("create_renditions")
+def create_renditions_job(job):
+    """ Create the renditions of an image, unless it changed again """
+
+    model = apps.get_model(job.payload["model"])
+    instance = model.objects.filter(pk=job.payload["pk"]).first()
+    image_field = job.payload["field"]
+    if not instance or getattr(instance, image_field).name != job.payload["source"]:
+        return
+
+    if job.payload.get("verify") and not instance.verify_image(image_field):
+        return
+
+    try:
+        instance.update_renditions(image_field)
+    except Exception:
+        if job.is_last_attempt:
+            renditions_field = instance.renditions_fields[image_field]
+            setattr(instance, f"{renditions_field}_status", "failed")
+            instance.save_renditions([f"{renditions_field}_status"])
+        raise
@@ -1,23 +1,139 @@
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
 from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+# Max urls stored in the process
+MAX_STORED_URLS = 10000
+
+# Urls of the media files stored in the process memory, by storage and name
+# (the names of the uploaded files don't change, so the urls don't expire).
+# The least recently used urls are removed when MAX_STORED_URLS is reached
+media_urls_store = OrderedDict()
+media_urls_lock = threading.Lock()
+
+
+def get_storage_key(storage) -> tuple:
+    """ Get the key that identifies a storage (class and location)
+
+    Args:
+        storage (Storage): files storage
+
+    Returns:
+        tuple: storage class path and location
+    """
+
+    storage_class = type(storage)
+    return (
+        f"{storage_class.__module__}.{storage_class.__qualname__}",
+        getattr(storage, "location", ""),
+    )
+
+
+def rewrite_media_url(url: str) -> str:
+    """ Replace the domain of a media url with MEDIA_CDN_DOMAIN if it is set.
+    Without cdn, the relative urls (local storage) are kept
+
+    Args:
+        url (str): url of the file in the storage
+
+    Returns:
+        str: cdn or storage url
+    """
+
+    parts = urlsplit(url)
+    if settings.MEDIA_CDN_DOMAIN:
+        return parts._replace(
+            scheme=parts.scheme or "https",
+            netloc=settings.MEDIA_CDN_DOMAIN,
+        ).geturl()
+    return url
+
+
+def get_absolute_media_url(url: str, request=None) -> str:
+    """ Join a relative media url (local storage) to the request host,
+    or to the HOST setting if there is no request
+
+    Args:
+        url (str): media url
+        request (Request): current request
+
+    Returns:
+        str: absolute url
+    """
+
+    if urlsplit(url).netloc:
+        return url
+    if request:
+        return request.build_absolute_uri(url)
+    if settings.HOST:
+        return f"{settings.HOST}{url}"
+    return url
+
+
+def get_storage_url(name: str, storage=None) -> str:
+    """ Return the url of a media file, memoized by storage and name
+    (without building it again in the storage, like boto3 does).
+    The local storage urls are relative (see get_absolute_media_url)
+
+    Args:
+        name (str): file name in the storage
+        storage (Storage): files storage (default storage if not set)
+
+    Returns:
+        str: url of the file
+    """
+
+    storage = storage or default_storage
+    key = (*get_storage_key(storage), name)
+    with media_urls_lock:
+        url = media_urls_store.get(key)
+        if url is not None:
+            media_urls_store.move_to_end(key)
+            return url
+
+    url = rewrite_media_url(storage.url(name))
+
+    # Signed urls (private storage) expire
+    if "?" in url:
+        return url
+
+    with media_urls_lock:
+        media_urls_store[key] = url
+        if len(media_urls_store) > MAX_STORED_URLS:
+            media_urls_store.popitem(last=False)
+    return url
 
 
 def get_media_url(object_or_url: object) -> str:
     """ Return the media url for the image (local or s3).
-    
+
     Args:
         url (object): image object or url string
-        
+
     Returns:
         str: url of the image
     """
-        
-    # Get the url string
-    url_str = ""
+
     if type(object_or_url) is str:
-        url_str = object_or_url
+        url = rewrite_media_url(object_or_url)
     else:
-        url_str = object_or_url.url
-    
-    if "s3.amazonaws.com" not in url_str:
-        return f"{settings.HOST}{url_str}"
-    return url_str
\ No newline at end of file
+        url = get_storage_url(object_or_url.name, object_or_url.storage)
+    return get_absolute_media_url(url)
+
+
+def clear_media_urls():
+    """ Remove the urls stored in the process """
+    media_urls_store.clear()
+
+
+@receiver(setting_changed)
+def clear_media_urls_on_setting_changed(setting, **kwargs):
+    """ Discard the urls built with the previous settings (tests) """
+
+    if setting in ["HOST", "MEDIA_URL", "MEDIA_CDN_DOMAIN", "STORAGES"]:
+        clear_media_urls()
@@ -0,0 +1,222 @@
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class OptionalCountPagination(pagination.PageNumberPagination):
+    """ Page number pagination that skips the count query
+    when the 'count' get param is 'false'
+    """
+
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_enabled = request.query_params.get(
+            self.count_query_param
+        ) != "false"
+        if self.count_enabled:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        page_number = request.query_params.get(self.page_query_param) or 1
+        try:
+            self.page_number = int(page_number)
+            if self.page_number < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=_("Invalid page.")
+            )
+            raise NotFound(msg)
+
+        # Get an extra row to know if there is a next page
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        self.has_next = len(rows) > page_size
+
+        return rows[:page_size]
+
+    def get_paginated_response(self, data):
+        if self.count_enabled:
+            return super().get_paginated_response(data)
+
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_next_link(self):
+        if self.count_enabled:
+            return super().get_next_link()
+
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.count_enabled:
+            return super().get_previous_link()
+
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+
+class KeysetPagination(pagination.BasePagination):
+    """ Cursor pagination filtering by the values of the last row
+    (keyset), so each page costs the same regardless of its depth.
+    The ordering fields are sorted in descending order and their values
+    must be unique together. There is no count of the results.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    ordering = ("created_at", "id")
+    invalid_cursor_message = _("Invalid cursor")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        cursor = self.decode_cursor(request, queryset.model)
+
+        if cursor:
+            values, self.reverse = cursor
+            lookup = "gt" if self.reverse else "lt"
+            queryset = queryset.filter(self.get_keyset_filter(values, lookup))
+        else:
+            self.reverse = False
+
+        # Load the ordering fields used by the cursor links, when the
+        # serializer loads only some columns (for example, the summary)
+        field_names, defer = queryset.query.deferred_loading
+        if field_names and not defer:
+            queryset = queryset.only(*field_names, *self.ordering)
+
+        # Read backwards to get the previous page
+        if self.reverse:
+            queryset = queryset.order_by(*self.ordering)
+        else:
+            queryset = queryset.order_by(*[f"-{field}" for field in self.ordering])
+
+        # Get an extra row to know if there are more pages
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_keyset_filter(self, values: list, lookup: str) -> Q:
+        """ Get the filter of the rows after the cursor values
+
+        Args:
+            values (list): cursor values of the ordering fields
+            lookup (str): 'lt' to read forward or 'gt' to read backwards
+
+        Returns:
+            Q: keyset filter
+        """
+
+        keyset_filter = Q()
+        for index, field in enumerate(self.ordering):
+            condition = Q(**{f"{field}__{lookup}": values[index]})
+            for previous_field, value in zip(self.ordering[:index], values):
+                condition &= Q(**{previous_field: value})
+            keyset_filter |= condition
+
+        return keyset_filter
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, row, reverse: bool) -> str:
+        """ Get the url of the page after (or before) the row
+
+        Args:
+            row (Model): last (or first) row of the current page
+            reverse (bool): True to get the page before the row
+
+        Returns:
+            str: page url
+        """
+
+        values = []
+        for field in self.ordering:
+            value = getattr(row, field)
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            values.append(value)
+
+        cursor = json.dumps({"values": values, "reverse": reverse})
+        cursor = b64encode(cursor.encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model) -> tuple[list, bool] | None:
+        """ Get the values and direction of the cursor in the get params
+
+        Args:
+            request (Request): current request
+            model (Model): paginated model, used to validate the values
+
+        Returns:
+            tuple | None: None in the first page, or:
+                list: values of the ordering fields
+                bool: True to get the page before the values
+        """
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            cursor = json.loads(b64decode(encoded.encode(), validate=True))
+            values = [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, cursor["values"], strict=True)
+            ]
+            reverse = bool(cursor["reverse"])
+        except (
+            BinasciiError, ValidationError, TypeError, ValueError, KeyError
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        return values, reverse
@@ -0,0 +1,87 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from rest_framework.serializers import BaseSerializer
+
+
+def get_query_plan(serializer_class: type[BaseSerializer], model) -> dict:
+    """ Collect the relations and columns a serializer reads from a model.
+
+    Args:
+        serializer_class (type[BaseSerializer]): serializer used to render the model
+        model (Model): model class the serializer renders
+
+    Returns:
+        dict: query plan with the keys:
+            select_related (list): forward relations (fk / one to one)
+            prefetch_related (list): many relations (m2m / reverse fk)
+            only (list): model fields to load, or None to load all of them
+    """
+
+    plan = {
+        "select_related": [],
+        "prefetch_related": [],
+        "only": [],
+    }
+
+    for field in serializer_class().fields.values():
+
+        # Method fields and write only fields don't read from a column
+        if field.write_only or field.source == "*":
+            continue
+
+        # Get the model field from the first part of the source
+        # (for example "duration" in "duration.value")
+        name = field.source.split(".")[0]
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+
+        plan["only"].append(name)
+        if model_field.many_to_many or model_field.one_to_many:
+            plan["prefetch_related"].append(name)
+        elif model_field.is_relation:
+            plan["select_related"].append(name)
+
+    # Only defer columns when the serializer declares its fields explicitly
+    meta = getattr(serializer_class, "Meta", None)
+    if getattr(meta, "fields", None) == "__all__":
+        plan["only"] = None
+    else:
+        # Extra fields read by method fields
+        plan["only"] += list(getattr(meta, "query_fields", []))
+
+        # Many relations are loaded by prefetch, not as columns
+        plan["only"] = [
+            name for name in plan["only"]
+            if name not in plan["prefetch_related"]
+        ]
+
+    return plan
+
+
+def optimize_queryset(
+    queryset: QuerySet,
+    serializer_class: type[BaseSerializer]
+) -> QuerySet:
+    """ Join and prefetch the relations used by the serializer, in order to
+    render a page with a constant number of queries.
+
+    Args:
+        queryset (QuerySet): base queryset
+        serializer_class (type[BaseSerializer]): serializer used to render the queryset
+
+    Returns:
+        QuerySet: optimized queryset
+    """
+
+    plan = get_query_plan(serializer_class, queryset.model)
+
+    if plan["select_related"]:
+        queryset = queryset.select_related(*plan["select_related"])
+    if plan["prefetch_related"]:
+        queryset = queryset.prefetch_related(*plan["prefetch_related"])
+    if plan["only"]:
+        queryset = queryset.only(*plan["only"])
+
+    return queryset
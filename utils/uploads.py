@@ -0,0 +1,392 @@
+import json
+import mimetypes
+import os
+
+from botocore.exceptions import ClientError
+from django import forms
+from django.apps import apps
+from django.conf import settings
+from django.contrib.admin.widgets import AdminFileWidget
+from django.core import signing
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.files import File
+from django.db import models
+from django.http import HttpResponseNotAllowed, JsonResponse
+from django.urls import path, reverse
+from django.utils.html import format_html
+from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name
+
+from core import jobs
+
+# Salts of the signed policies (local uploads) and uploaded keys
+POLICY_SALT = "utils.uploads.policy"
+KEY_SALT = "utils.uploads.key"
+
+# Seconds to submit the form after uploading the file
+KEY_MAX_AGE = 24 * 60 * 60
+
+# Seconds to delete the uploaded files that are not saved in the form
+# (after the key expires, with a margin for the forms being saved)
+CLEANUP_DELAY = KEY_MAX_AGE + 60 * 60
+
+# Images that can be uploaded directly (not svg: it can run scripts)
+IMAGE_EXTENSIONS = ("jpg", "jpeg", "png", "gif", "webp")
+
+
+def get_image_content_type(filename: str) -> str:
+    """ Get the content type of an image from its extension
+
+    Args:
+        filename (str): file name
+
+    Returns:
+        str: content type, for example "image/png"
+
+    Raises:
+        ValidationError: extension not allowed
+    """
+
+    extension = os.path.splitext(filename)[1][1:].lower()
+    content_type = mimetypes.guess_type(f"image.{extension}")[0]
+    if extension not in IMAGE_EXTENSIONS or not content_type:
+        raise ValidationError(
+            f"File extension '{extension}' is not allowed. "
+            f"Allowed extensions are: {', '.join(IMAGE_EXTENSIONS)}."
+        )
+    return content_type
+
+
+def get_upload_key(field: models.FileField, filename: str) -> str:
+    """ Get a new (unique) file name in the storage of a model field
+
+    Args:
+        field (models.FileField): model file field
+        filename (str): name of the file in the browser
+
+    Returns:
+        str: file name, for example "images/a_Ab12CdE.png"
+    """
+
+    name = field.generate_filename(None, os.path.basename(filename))
+    return field.storage.get_alternative_name(*os.path.splitext(name))
+
+
+def get_upload_target(field: models.FileField) -> dict:
+    """ Get the model and field that a signed upload key belongs to
+
+    Args:
+        field (models.FileField): model file field
+
+    Returns:
+        dict: model label and field name
+    """
+    return {"model": field.model._meta.label, "field": field.name}
+
+
+def create_presigned_post(storage, key: str, content_type: str) -> dict:
+    """ Create the url and form fields to upload a file from the browser
+    directly to the storage: a presigned post in s3 (or compatible, like
+    minio), or the signed local upload view (DirectUploadView) in other
+    storages
+
+    Args:
+        storage (Storage): files storage
+        key (str): file name in the storage
+        content_type (str): file mime type
+
+    Returns:
+        dict: url and fields of the upload form (the file is the last field)
+    """
+
+    fields = {"Content-Type": content_type}
+    if isinstance(storage, S3Boto3Storage):
+        conditions = [
+            {"Content-Type": content_type},
+            ["content-length-range", 1, settings.MEDIA_UPLOAD_MAX_SIZE],
+        ]
+        if storage.default_acl:
+            fields["acl"] = storage.default_acl
+            conditions.append({"acl": storage.default_acl})
+
+        return storage.connection.meta.client.generate_presigned_post(
+            storage.bucket_name,
+            storage._normalize_name(clean_name(key)),
+            Fields=fields,
+            Conditions=conditions,
+            ExpiresIn=settings.MEDIA_UPLOAD_EXPIRES,
+        )
+
+    policy = {
+        "key": key,
+        "content_type": content_type,
+        "max_size": settings.MEDIA_UPLOAD_MAX_SIZE,
+    }
+    return {
+        "url": reverse("direct_upload"),
+        "fields": {
+            "key": key,
+            **fields,
+            "policy": signing.dumps(policy, salt=POLICY_SALT),
+        },
+    }
+
+
+def get_uploaded_file_info(storage, key: str) -> tuple[int, str] | None:
+    """ Get the size and content type of an uploaded file, without
+    downloading it (a HEAD request in s3). Other storages don't save
+    the content type: it is guessed from the file extension (the local
+    uploads validate it with the signed policy)
+
+    Args:
+        storage (Storage): files storage
+        key (str): file name in the storage
+
+    Returns:
+        tuple[int, str] | None: size and content type, or None if the
+        file doesn't exist
+    """
+
+    if isinstance(storage, S3Boto3Storage):
+        try:
+            response = storage.connection.meta.client.head_object(
+                Bucket=storage.bucket_name,
+                Key=storage._normalize_name(clean_name(key)),
+            )
+        except ClientError as error:
+            if error.response["Error"]["Code"] in ["404", "NoSuchKey"]:
+                return None
+            raise
+        return response["ContentLength"], response.get("ContentType", "")
+
+    if not storage.exists(key):
+        return None
+    return storage.size(key), mimetypes.guess_type(key)[0] or ""
+
+
+def read_upload_policy(data: dict) -> dict:
+    """ Validate the signed policy of a local upload (see create_presigned_post)
+
+    Args:
+        data (dict): upload form fields
+
+    Returns:
+        dict: policy (key, content type and max size)
+
+    Raises:
+        ValidationError: expired or invalid policy, or different fields
+    """
+
+    try:
+        policy = signing.loads(
+            data.get("policy", ""),
+            salt=POLICY_SALT,
+            max_age=settings.MEDIA_UPLOAD_EXPIRES,
+        )
+    except signing.BadSignature:
+        raise ValidationError("Invalid or expired policy")
+
+    if data.get("key") != policy["key"] \
+            or data.get("Content-Type") != policy["content_type"]:
+        raise ValidationError("The fields don't match the policy")
+    return policy
+
+
+class DirectUploadWidget(AdminFileWidget):
+    """ File input that uploads the file directly to the storage (see
+    direct_upload.js), and sends to the admin only the signed file name
+    in the '<name>_key' hidden input. Without javascript, or if the
+    upload fails, the file is sent to the admin as usual
+    """
+
+    def __init__(self, upload_url: str, attrs: dict = None):
+        super().__init__({**(attrs or {}), "data-upload-url": upload_url})
+
+    class Media:
+        js = ["core/js/direct_upload.js"]
+
+    def value_from_datadict(self, data, files, name):
+        upload = super().value_from_datadict(data, files, name)
+        if upload is None:
+            return data.get(f"{name}_key") or None
+        return upload
+
+    def render(self, name, value, attrs=None, renderer=None):
+        # Keep the uploaded file when the form has errors
+        token = value if isinstance(value, str) else ""
+        return super().render(name, value, attrs, renderer) + format_html(
+            '<input type="hidden" name="{}_key" value="{}">', name, token
+        )
+
+
+class DirectUploadFormField(forms.ImageField):
+    """ Image field that also receives the signed name of a file uploaded
+    directly to the storage (see DirectUploadWidget). Only the names
+    signed for its model field ('model_field') are accepted
+    """
+
+    default_error_messages = {
+        "too_large": "The file is larger than %(max_size)s bytes.",
+    }
+
+    def __init__(self, *, model_field: models.FileField, **kwargs):
+        self.model_field = model_field
+        self.storage = model_field.storage
+        super().__init__(**kwargs)
+
+    def clean(self, data, initial=None):
+        if isinstance(data, str):
+            return self.clean_uploaded_key(data)
+        return super().clean(data, initial)
+
+    def clean_uploaded_key(self, token: str) -> str:
+        """ Validate the signed name of an uploaded file
+
+        Args:
+            token (str): signed file name
+
+        Returns:
+            str: file name in the storage
+        """
+
+        try:
+            payload = signing.loads(token, salt=KEY_SALT, max_age=KEY_MAX_AGE)
+        except signing.BadSignature:
+            raise ValidationError(self.error_messages["invalid"], code="invalid")
+
+        # Keys signed for other fields (other upload_to or validators)
+        key = payload.pop("key")
+        if payload != get_upload_target(self.model_field):
+            raise ValidationError(self.error_messages["invalid"], code="invalid")
+
+        file_info = get_uploaded_file_info(self.storage, key)
+        if not file_info:
+            raise ValidationError(self.error_messages["missing"], code="missing")
+
+        try:
+            self.run_validators(File(None, name=key))
+            self.validate_uploaded_file(key, *file_info)
+        except ValidationError:
+            # Remove the rejected file
+            self.storage.delete(key)
+            raise
+        return key
+
+    def validate_uploaded_file(self, key: str, size: int, content_type: str):
+        """ Validate the size and content type of the uploaded file.
+        The file is not downloaded: the image is decoded by the
+        renditions job (see ImageRenditionsMixin.verify_image)
+
+        Args:
+            key (str): file name in the storage
+            size (int): file size in bytes
+            content_type (str): file content type
+        """
+
+        if not size:
+            raise ValidationError(self.error_messages["empty"], code="empty")
+        if size > settings.MEDIA_UPLOAD_MAX_SIZE:
+            raise ValidationError(
+                self.error_messages["too_large"],
+                code="too_large",
+                params={"max_size": settings.MEDIA_UPLOAD_MAX_SIZE},
+            )
+
+        if content_type != get_image_content_type(key):
+            raise ValidationError(
+                self.error_messages["invalid_image"], code="invalid_image"
+            )
+
+
+class DirectUploadAdminMixin:
+    """ Upload the images of the 'direct_upload_fields' from the browser
+    directly to the storage (s3), without sending them through Django
+    """
+
+    direct_upload_fields = ()
+
+    def get_urls(self):
+        info = self.opts.app_label, self.opts.model_name
+        return [
+            path(
+                "direct-upload/",
+                self.admin_site.admin_view(self.direct_upload_view),
+                name="%s_%s_direct_upload" % info,
+            ),
+        ] + super().get_urls()
+
+    def formfield_for_dbfield(self, db_field, request, **kwargs):
+        if db_field.name in self.direct_upload_fields:
+            info = self.opts.app_label, self.opts.model_name
+            upload_url = reverse(
+                "admin:%s_%s_direct_upload" % info,
+                current_app=self.admin_site.name,
+            )
+            kwargs["form_class"] = DirectUploadFormField
+            kwargs["model_field"] = db_field
+            kwargs["widget"] = DirectUploadWidget(upload_url)
+        return super().formfield_for_dbfield(db_field, request, **kwargs)
+
+    def save_model(self, request, obj, form, change):
+        # The directly uploaded images are decoded by the renditions job
+        obj.unverified_images = {
+            field_name for field_name in self.direct_upload_fields
+            if isinstance(form.cleaned_data.get(field_name), str)
+        }
+        super().save_model(request, obj, form, change)
+
+    def direct_upload_view(self, request):
+        """ Create the presigned post of a new file of a field
+        (json with the field name and file name). The content type
+        is set from the file extension
+        """
+
+        if request.method != "POST":
+            return HttpResponseNotAllowed(["POST"])
+        if not self.has_add_permission(request) \
+                and not self.has_change_permission(request):
+            raise PermissionDenied
+
+        try:
+            data = json.loads(request.body)
+            field_name = data["field"]
+            filename = str(data["filename"])
+        except (ValueError, KeyError, TypeError):
+            return JsonResponse({"error": "Invalid data"}, status=400)
+
+        if field_name not in self.direct_upload_fields:
+            return JsonResponse({"error": "Invalid field"}, status=400)
+
+        field = self.opts.get_field(field_name)
+        try:
+            content_type = get_image_content_type(filename)
+            for validator in field.formfield().validators:
+                validator(File(None, name=filename))
+        except ValidationError as error:
+            return JsonResponse({"error": error.messages}, status=400)
+
+        key = get_upload_key(field, filename)
+        jobs.enqueue(
+            "delete_unused_upload",
+            delay=CLEANUP_DELAY,
+            model=self.opts.label,
+            field=field_name,
+            key=key,
+        )
+        return JsonResponse({
+            **create_presigned_post(field.storage, key, content_type),
+            "token": signing.dumps(
+                {"key": key, **get_upload_target(field)}, salt=KEY_SALT
+            ),
+        })
+
+
+@jobs.register("delete_unused_upload")
+def delete_unused_upload_job(job):
+    """ Delete a directly uploaded file if its form was never saved """
+
+    model = apps.get_model(job.payload["model"])
+    field = model._meta.get_field(job.payload["field"])
+    key = job.payload["key"]
+    if not model.objects.filter(**{field.name: key}).exists():
+        field.storage.delete(key)